@@ -0,0 +1,114 @@
+"""
+Benchmark suite for the bullpen hot paths (pytest-benchmark).
+
+Benchmarks are skipped in the regular test run. To run them and store a baseline:
+
+    $ BULLPEN_BENCHMARK=1 pytest benchmarks/ -p no:cacheprovider --no-cov --benchmark-autosave
+
+and to compare a later run against the stored baseline(s):
+
+    $ BULLPEN_BENCHMARK=1 pytest benchmarks/ --no-cov --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Baselines are written to ``.benchmarks/`` (pytest-benchmark's default storage).
+Every benchmark runs at 1x, 10x and 100x the size of the shipped data
+(override with e.g. ``BULLPEN_BENCHMARK_SCALES=1,10``) and records the peak
+traced memory of one call in ``extra_info['peak_mb']``.
+"""
+
+import os
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bullpen.data_utils import DATA_DIR
+
+SCALES = [int(s) for s in os.environ.get('BULLPEN_BENCHMARK_SCALES', '1,10,100').split(',')]
+
+if not os.environ.get('BULLPEN_BENCHMARK'):
+    collect_ignore_glob = ['test_bench_*.py']
+
+
+def scale_frame(data, factor, id_columns=('PlayerId', 'MLBAMID'), name_column='Name'):
+    """
+    Tile ``data`` ``factor`` times, shifting ids and suffixing names so every copy
+    is a distinct set of players.
+    """
+    copies = []
+    for i in range(factor):
+        copy = data.copy()
+        for col in id_columns:
+            if col in copy.columns:
+                copy[col] = copy[col] + i * 10_000_000
+        if i and name_column in copy.columns:
+            copy[name_column] = copy[name_column] + f' {i}'
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def make_html_table(supplemental_data):
+    """
+    Render supplemental stats back into a baseball-reference style pitches table.
+    """
+    data = supplemental_data.drop(columns='Season').copy()
+    perc_columns = ['Str%', 'L/Str', 'S/Str', 'F/Str', 'I/Str', 'AS/Str', 'I/Bll', 'AS/Pit']
+    perc_columns += ['Con', '1st%', '30%', '02%', 'L/SO%']
+    for col in perc_columns:
+        data[col] = (data[col] * 100).round(1).astype(str) + '%'
+
+    header = ''.join(f'<th>{col}</th>' for col in data.columns)
+    body = '\n'.join(
+        '<tr>' + ''.join(f'<td>{value}</td>' for value in row) + '</tr>'
+        for row in data.astype(str).itertuples(index=False)
+    )
+    return (
+        '<html><body><table><tr><td>team table</td></tr></table>'
+        f'<table><thead><tr>{header}</tr></thead><tbody>\n{body}\n</tbody></table>'
+        '</body></html>'
+    )
+
+
+@pytest.fixture(params=SCALES, ids=lambda s: f'{s}x')
+def scale(request):
+    return request.param
+
+
+@pytest.fixture(scope='session')
+def provided_data():
+    return pd.read_csv(DATA_DIR.joinpath('k.csv'))
+
+
+@pytest.fixture(scope='session')
+def supplemental_data():
+    return pd.read_csv(DATA_DIR.joinpath('supplemental-stats.csv'))
+
+
+@pytest.fixture(scope='session')
+def train_data():
+    return pd.read_csv(DATA_DIR.joinpath('train.csv'))
+
+
+@pytest.fixture
+def run(benchmark):
+    """
+    ``run(fn, *args, **kwargs)``: record the peak traced memory of one call,
+    then benchmark ``fn``.
+    """
+
+    def _run(fn, *args, **kwargs):
+        tracemalloc.start()
+        try:
+            fn(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info['peak_mb'] = peak / 1e6
+        return benchmark(fn, *args, **kwargs)
+
+    return _run
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
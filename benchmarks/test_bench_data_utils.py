@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+from conftest import make_html_table, scale_frame
+
+from bullpen import synth_utils
+from bullpen.data_utils import (
+    PROVIDED_NAME_FIXES,
+    SUPPLEMENTAL_NAME_FIXES,
+    PlayerLookup,
+    Scraper,
+    load_data,
+    partition_players,
+)
+from bullpen.schema_utils import MERGED_SCHEMA
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+@pytest.fixture
+def html_response(supplemental_data, scale):
+    return FakeResponse(make_html_table(scale_frame(supplemental_data, scale)))
+
+
+def test_parse_player_stats_table(run, html_response):
+    run(Scraper.parse_player_stats_table, html_response)
+
+
+def test_make_dataframe(run, html_response):
+    scraper = Scraper(2023)
+    table = scraper.parse_player_stats_table(html_response)
+    headers = scraper.parse_table_headers(table)
+    run(scraper.make_dataframe, table, headers)
+
+
+def test_format_data(run, html_response):
+    scraper = Scraper(2023)
+    table = scraper.parse_player_stats_table(html_response)
+    data = scraper.make_dataframe(table, scraper.parse_table_headers(table))
+    run(lambda: scraper.format_data(data.copy()))
+
+
+def test_load_data(run, tmp_path, provided_data, supplemental_data, scale):
+    provided_path = tmp_path.joinpath('k.csv')
+    supplemental_path = tmp_path.joinpath('supplemental-stats.csv')
+    # Fix names before tiling: the renames in merge_data only match unsuffixed names
+    provided = provided_data.assign(Name=provided_data.Name.replace(PROVIDED_NAME_FIXES))
+    supplemental = supplemental_data.assign(
+        Name=supplemental_data.Name.replace(SUPPLEMENTAL_NAME_FIXES)
+    )
+    scale_frame(provided, scale).to_csv(provided_path, index=False)
+    scale_frame(supplemental, scale, id_columns=()).to_csv(supplemental_path, index=False)
+    merged = run(load_data, provided_path, supplemental_path)
+    assert len(merged) == len(provided) * scale
+    assert MERGED_SCHEMA.validate(merged).empty
+
+
+def test_load_data_synthetic(run, tmp_path, scale):
+    # ~1.2k players per scale unit, the size of the shipped data
+    paths = synth_utils.write_data(tmp_path, n_players=1_200 * scale, seed=0)
+    merged = run(load_data, paths['k.csv'], paths['supplemental-stats.csv'])
+    assert MERGED_SCHEMA.validate(merged).empty
+
+
+@pytest.mark.parametrize('stratify', [False, True], ids=['plain', 'stratified'])
+def test_partition_players(run, provided_data, scale, stratify):
+    data = scale_frame(provided_data, scale)
+    run(partition_players, data, seed=0, stratify=stratify)
+
+
+@pytest.fixture
+def lookup(scale):
+    lookup = PlayerLookup()
+    lookup.mapping = scale_frame(PlayerLookup().mapping, scale)
+    return lookup
+
+
+def test_get_name_from_id(run, lookup):
+    player_id = lookup.mapping.MLBAMID.iloc[len(lookup.mapping) // 2]
+    run(lookup.get_name_from_id, player_id)
+
+
+def test_get_names_from_ids(run, lookup):
+    player_ids = pd.Series(lookup.mapping.MLBAMID).sample(frac=1.0, random_state=0).to_numpy()
+    run(lookup.get_names_from_ids, player_ids)
@@ -0,0 +1,36 @@
+import pytest
+import xgboost as xgb
+from conftest import scale_frame
+from sklearn.linear_model import LinearRegression
+
+from bullpen.cv_utils import cross_validate_model, make_timeseries_splits, pred_X_y
+from bullpen.model_utils import make_processing_pipeline, train_model
+
+LASSO_FEATURES = ['Pit/PA', 'Str%', 'F/Str', 'I/Str', 'Con', '30%', 'L/SO']
+
+
+@pytest.fixture
+def scaled_train(train_data, scale):
+    return scale_frame(train_data, scale)
+
+
+@pytest.mark.parametrize('model', [LinearRegression, xgb.XGBRegressor], ids=lambda m: m.__name__)
+def test_train_model(run, scaled_train, model):
+    X_df, y_df = pred_X_y(scaled_train)
+    processor = make_processing_pipeline(
+        categorical_features=['Team'],
+        numeric_features=[f for f in X_df.columns if f != 'Team'],
+    )
+    run(train_model, processor, model(), X_df, y_df, results={}, name='model')
+
+
+def test_cross_validate_model(run, scaled_train):
+    splits = make_timeseries_splits(scaled_train.Season.unique().tolist(), scaled_train)
+    processor = make_processing_pipeline(numeric_features=LASSO_FEATURES)
+    run(
+        cross_validate_model,
+        LinearRegression,
+        {'fit_intercept': [True, False]},
+        splits,
+        processor,
+    )
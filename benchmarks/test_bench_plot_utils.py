@@ -0,0 +1,47 @@
+import matplotlib
+import matplotlib.pyplot as plt
+import pytest
+from conftest import scale_frame
+
+from bullpen import plot_utils
+from bullpen.cv_utils import pred_X_y
+
+
+@pytest.fixture
+def predictions(train_data, scale, rng):
+    X_df, y_df = pred_X_y(scale_frame(train_data, scale))
+    preds = y_df.to_numpy() + rng.normal(0, 0.02, len(y_df))
+    return X_df, y_df, preds
+
+
+@pytest.fixture(autouse=True)
+def headless():
+    matplotlib.use('Agg')
+    yield
+    plt.close('all')
+
+
+@pytest.mark.parametrize('mode', ['static', 'interactive', 'scalable'])
+def test_plot_pred_vs_target(run, predictions, mode, tmp_path):
+    X_df, y_df, preds = predictions
+    savepath = tmp_path.joinpath('plot.png' if mode == 'static' else 'plot.html')
+
+    def plot():
+        plot_utils.plot_pred_vs_target(
+            X_df, y_df, preds, 'bench', mode=mode, savepath=savepath, show=False
+        )
+        plt.close('all')
+
+    run(plot)
+
+
+def test_plot_player(run, predictions, train_data, tmp_path):
+    X_df, y_df, preds = predictions
+    player_name = train_data.Name.iloc[0]
+    savepath = tmp_path.joinpath('player.png')
+
+    def plot():
+        plot_utils.plot_player(player_name, X_df, y_df, preds, savepath=savepath)
+        plt.close('all')
+
+    run(plot)
@@ -1,8 +1,12 @@
+from concurrent.futures import ProcessPoolExecutor
 from itertools import product
 
 import numpy as np
+import pandas as pd
 
-from bullpen.model_utils import train_model
+from bullpen.model_utils import train_model, train_xgboost_grid
+from bullpen.shared_utils import SharedArrays
+from bullpen.trace_utils import in_worker, merge_worker
 
 
 def make_timeseries_splits(year_list, train_df):
@@ -26,9 +30,12 @@ def pred_X_y(split, target='K%', drop_cols=None):
     return X_df, y_df
 
 
-def cross_validate_model(model, param_grid, splits, processor, metric_key='mean_mse', K=2):
+def cross_validate_model(
+    model, param_grid, splits, processor, metric_key='mean_mse', K=2, features=None
+):
     """
-    Manual cross-validation based on custom timeseries data
+    Manual cross-validation based on custom timeseries data.
+    ``features`` is an optional built ``feature_utils.FeatureStore`` passed to ``train_model``.
     """
     results = []
     param_names = list(param_grid.keys())
@@ -47,7 +54,13 @@ def cross_validate_model(model, param_grid, splits, processor, metric_key='mean_
 
             # Initialize and train the model
             preds, metrics = train_model(
-                processor, model(**param_dict), X_df, y_df, results={}, name='model'
+                processor,
+                model(**param_dict),
+                X_df,
+                y_df,
+                results={},
+                name='model',
+                features=features,
             )
 
             # Collect the desired metric (e.g., MSE) which is the second, or last appended
@@ -63,3 +76,114 @@ def cross_validate_model(model, param_grid, splits, processor, metric_key='mean_
     # Find the best hyperparameters based on the lowest metric
     best_result = min(results, key=lambda x: x[metric_key])
     return results, best_result
+
+
+def cross_validate_xgboost(param_grid, splits, processor, metric_key='mean_mse', K=2, nthread=None):
+    """
+    ``cross_validate_model`` for ``xgboost.XGBRegressor`` (with ``tree_method='hist'``).
+    Each split's DMatrix is built once and reused for every parameter combination
+    (see ``model_utils.train_xgboost_grid``).
+    """
+    split_results = []
+    for split_idx in range(K):
+        X_df, y_df = pred_X_y(splits['train'][split_idx])
+        X_val_df, _ = pred_X_y(splits['val'][split_idx])
+        print(f'TRAIN: {X_df.Season.unique()} VAL: {X_val_df.Season.unique()}')
+        split_results.append(train_xgboost_grid(processor, param_grid, X_df, y_df, nthread))
+
+    results = []
+    for combination_results in zip(*split_results):
+        param_dict = {k: v for k, v in combination_results[0].items() if k not in ('score', 'mse')}
+        mean_metric = np.mean([r['mse'] for r in combination_results])
+        results.append({**param_dict, metric_key: mean_metric})
+        print(f'{param_dict} Mean {metric_key}: {mean_metric:.4f}')
+
+    best_result = min(results, key=lambda x: x[metric_key])
+    return results, best_result
+
+
+def share_splits(splits, target='K%', drop_cols=None):
+    """
+    Place the numeric feature matrix and target of every split into shared memory once.
+
+    Non-numeric features (e.g. Team) are left out, so any processor used with the
+    shared splits must only reference numeric columns.
+
+    Parameters
+    ----------
+    splits : dict
+        Output of ``make_timeseries_splits``.
+    target : str, default='K%'
+        The name of the target column.
+    drop_cols : Optional list of str, default=None
+        Passed through to ``pred_X_y``.
+
+    Returns
+    -------
+    bullpen.shared_utils.SharedArrays keyed by '{kind}-{idx}-X' and '{kind}-{idx}-y'
+    (e.g. 'train-0-X'), with the feature names of each X in ``.columns``.
+    """
+    arrays = {}
+    columns = {}
+    for kind, frames in splits.items():
+        for idx, split in enumerate(frames):
+            X_df, y_df = pred_X_y(split, target=target, drop_cols=drop_cols)
+            X_df = X_df.select_dtypes('number')
+            arrays[f'{kind}-{idx}-X'] = X_df.to_numpy(dtype=np.float64)
+            arrays[f'{kind}-{idx}-y'] = y_df.to_numpy(dtype=np.float64)
+            columns[f'{kind}-{idx}-X'] = list(X_df.columns)
+    return SharedArrays(arrays, columns=columns)
+
+
+def attach_split(shared, kind, idx, target='K%'):
+    """
+    Zero-copy X_df, y_df views of one split placed in shared memory by ``share_splits``.
+    """
+    X_key = f'{kind}-{idx}-X'
+    X_df = pd.DataFrame(shared[X_key], columns=shared.columns[X_key], copy=False)
+    y_df = pd.Series(shared[f'{kind}-{idx}-y'], name=target, copy=False)
+    return X_df, y_df
+
+
+def _score_shared_split(model, param_dict, shared, processor, split_idx):
+    X_df, y_df = attach_split(shared, 'train', split_idx)
+    _, metrics = train_model(processor, model(**param_dict), X_df, y_df, results={}, name='model')
+    return metrics['model'][-1]
+
+
+def cross_validate_model_shared(
+    model, param_grid, shared, processor, metric_key='mean_mse', K=2, n_jobs=None
+):
+    """
+    Same as ``cross_validate_model`` but fits every (parameters, split) pair in a
+    process pool. Workers attach to the splits in ``shared`` (see ``share_splits``)
+    by name instead of receiving a pickled copy of the data.
+    """
+    param_names = list(param_grid.keys())
+    param_combinations = list(product(*param_grid.values()))
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        futures = [
+            [
+                pool.submit(
+                    in_worker(_score_shared_split),
+                    model,
+                    dict(zip(param_names, params)),
+                    shared,
+                    processor,
+                    split_idx,
+                )
+                for split_idx in range(K)
+            ]
+            for params in param_combinations
+        ]
+
+        results = []
+        for params, split_futures in zip(param_combinations, futures):
+            param_dict = dict(zip(param_names, params))
+            mean_metric = np.mean([merge_worker(future.result()) for future in split_futures])
+            results.append({**param_dict, metric_key: mean_metric})
+            print(f'{param_dict} Mean {metric_key}: {mean_metric:.4f}')
+
+    best_result = min(results, key=lambda x: x[metric_key])
+    return results, best_result
@@ -1,5 +1,7 @@
+import hashlib
 import html
 import json
+import math
 from functools import cached_property
 from pathlib import Path
 
@@ -9,6 +11,9 @@ import requests
 from bs4 import BeautifulSoup
 from ftfy import fix_text
 
+from bullpen.schema_utils import MERGED_SCHEMA
+from bullpen.trace_utils import span
+
 HERE = Path(__file__)
 DATA_DIR = HERE.parents[2].joinpath('data')
 
@@ -33,7 +38,8 @@ class Scraper:
     @staticmethod
     def get_response(url):
         print(f'scraping {url}...')
-        response = requests.get(url)
+        with span('fetch', url=url):
+            response = requests.get(url)
 
         if not response.ok:
             raise Exception(f'Failed to fetch {url}. Status code: {response.status_code}')
@@ -54,11 +60,12 @@ class Scraper:
             - add both back manually
         """
         try:
-            player_stats = response.text.split('<table')[-1]
-            player_stats = player_stats[: player_stats.index('</table>')]
-            player_stats = f'<table {player_stats} </table>'
+            with span('parse'):
+                player_stats = response.text.split('<table')[-1]
+                player_stats = player_stats[: player_stats.index('</table>')]
+                player_stats = f'<table {player_stats} </table>'
 
-            table = BeautifulSoup(player_stats, 'lxml')
+                table = BeautifulSoup(player_stats, 'lxml')
 
         except ValueError as e:
             raise Exception(
@@ -104,25 +111,30 @@ class Scraper:
         # TODO: only one for now (if multiple need to refactor)
         spanish_column = 'Name'
 
-        dataframe[perc_columns] = dataframe[perc_columns].apply(
-            lambda col: self.convert_perc_to_float(col)
-        )
+        with span('format', rows=len(dataframe)):
+            dataframe[perc_columns] = dataframe[perc_columns].apply(
+                lambda col: self.convert_perc_to_float(col)
+            )
 
-        dataframe[spanish_column] = dataframe[spanish_column].apply(self.convert_spanish_letters)
+            dataframe[spanish_column] = dataframe[spanish_column].apply(
+                self.convert_spanish_letters
+            )
 
         return dataframe
 
     def make_dataframe(self, table, headers):
-        rows = table.find('tbody').find_all('tr', class_=lambda x: x != 'thead')
-
-        data = []
-        for row in rows:
-            cols = row.find_all(['th', 'td'])
-            cols_text = [col.text.strip().replace('\xa0', ' ').replace('*', '') for col in cols]
-            data.append(cols_text)
-
-        df = pd.DataFrame(data, columns=headers)
-        df = df.assign(Season=self.year)
+        with span('parse') as parse_span:
+            rows = table.find('tbody').find_all('tr', class_=lambda x: x != 'thead')
+
+            data = []
+            for row in rows:
+                cols = row.find_all(['th', 'td'])
+                cols_text = [col.text.strip().replace('\xa0', ' ').replace('*', '') for col in cols]
+                data.append(cols_text)
+
+            df = pd.DataFrame(data, columns=headers)
+            df = df.assign(Season=self.year)
+            parse_span.rows = len(df)
         return df
 
     def scrape(self):
@@ -225,62 +237,451 @@ def batch_scrape(years):
 #     return aggregated[final_cols]
 
 
+# Spellings of the same player that differ between the two sources
+SUPPLEMENTAL_NAME_FIXES = {
+    'Manny Banuelos': 'Manny Bañuelos',
+    'Ralph Garza': 'Ralph Garza Jr.',
+    'Luis Ortiz': 'Luis L. Ortiz',
+    'Jose Hernandez': 'Jose E. Hernandez',
+    'Hyeon-jong Yang': 'Hyeon-Jong Yang',
+    'Adrián Martinez': 'Adrián Martínez',
+}
+PROVIDED_NAME_FIXES = {
+    'Eduardo Rodriguez': 'Eduardo Rodríguez',
+    'Jose Alvarez': 'José Álvarez',
+    'Sandy Alcantara': 'Sandy Alcántara',
+    'Carlos Martinez': 'Carlos Martínez',
+    'Phillips Valdez': 'Phillips Valdéz',
+    'Jovani Moran': 'Jovani Morán',
+    'Jose Cuas': 'José Cuas',
+    'Jorge Alcala': 'Jorge Alcalá',
+    'Jhoan Duran': 'Jhoan Durán',
+    'Jesus Tinoco': 'Jesús Tinoco',
+    'Brent Honeywell': 'Brent Honeywell Jr.',
+    'Adrian Morejon': 'Adrián Morejón',
+}
+
+
+def merge_data(provided_data, supplemental_data):
+    """
+    Merge provided (k.csv) and supplemental (baseball-reference) rows, one row per
+    provided row. Both frames are modified in place (player name normalization).
+    """
+    supplemental_data.Name = supplemental_data.Name.replace(SUPPLEMENTAL_NAME_FIXES)
+    provided_data.Name = provided_data.Name.replace(PROVIDED_NAME_FIXES)
+
+    # Let merging cause granular team data to fall out when a player has multi-team year
+    # (it won't be in the provided data)
+    supplemental_data.Tm = supplemental_data.Tm.replace('TOT', '- - -')
+    with span('merge', rows=len(provided_data)):
+        merged = (
+            provided_data.merge(
+                supplemental_data,
+                left_on=['Name', 'Season', 'Age', 'Team'],
+                right_on=['Name', 'Season', 'Age', 'Tm'],
+                how='left',
+            )
+            # Ensure top TOT is taken from supplemental data
+            .groupby(['PlayerId', 'Team', 'Season'])
+            .first()
+            .reset_index()
+            .drop('Tm', axis=1)
+            .reset_index(drop=True)
+            .sort_values(['Name', 'Season', 'Team'])
+        )
+    if len(provided_data) != len(merged):
+        raise Exception(f'{len(provided_data)=} and {len(merged)=} do not match post merge!')
+    return merged
+
+
 def load_data(
     provided_path=str(DATA_DIR.joinpath('k.csv').resolve()),
     supplemental_path=str(DATA_DIR.joinpath('supplemental-stats.csv').resolve()),
     return_intermediaries=False,
+    validate=True,
 ):
-    provided_data = pd.read_csv(provided_path)
-    supplemental_data = pd.read_csv(supplemental_path)
-    supplemental_data.Name = supplemental_data.Name.replace(
-        {
-            'Manny Banuelos': 'Manny Bañuelos',
-            'Ralph Garza': 'Ralph Garza Jr.',
-            'Luis Ortiz': 'Luis L. Ortiz',
-            'Jose Hernandez': 'Jose E. Hernandez',
-            'Hyeon-jong Yang': 'Hyeon-Jong Yang',
-            'Adrián Martinez': 'Adrián Martínez',
-        }
+    """
+    Load and merge the provided (k.csv) and supplemental data.
+
+    With ``validate`` the merged data is checked against ``schema_utils.MERGED_SCHEMA``
+    (dtypes, rate ranges, nulls, unique keys, multi-team consistency) and a
+    ``schema_utils.SchemaError`` listing the failures is raised.
+    """
+    with span('load') as load_span:
+        provided_data = pd.read_csv(provided_path)
+        supplemental_data = pd.read_csv(supplemental_path)
+        load_span.rows = len(provided_data) + len(supplemental_data)
+    merged = merge_data(provided_data, supplemental_data)
+    if validate:
+        with span('validate', rows=len(merged)):
+            MERGED_SCHEMA.check(merged)
+    return (provided_data, supplemental_data, merged) if return_intermediaries else merged
+
+
+def partition_players(
+    data, train_frac=0.7, seed=None, key='PlayerId', season='Season', stratify=False
+):
+    """
+    Seeded group-aware train/test partition: every row of a player lands in the same fold.
+
+    Players are taken in order of first appearance and a vectorized ``rng.choice``
+    picks the training players (with ``key='Name'`` and ``seed=53`` this is the split
+    of notebooks/02-data-partitioning.ipynb). With ``stratify`` players are grouped by
+    the number of seasons played and ``ceil(train_frac * size)`` players of each group
+    (by a random ordering) go to training, so both folds get the same mix of careers.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+    train_frac : float, default=0.7
+    seed : Optional int, default=None
+    key : str, default='PlayerId'
+    season : str, default='Season'
+    stratify : bool, default=False
+
+    Returns
+    -------
+    pandas.Series named 'fold' ('train' or 'test') indexed by ``key``.
+    """
+    codes, ids = pd.factorize(data[key])
+    rng = np.random.default_rng(seed)
+    is_train = np.zeros(len(ids), dtype=bool)
+    if not stratify:
+        is_train[rng.choice(len(ids), size=math.ceil(len(ids) * train_frac), replace=False)] = True
+    else:
+        pairs = pd.DataFrame({'code': codes, season: data[season].to_numpy()}).drop_duplicates()
+        strata = np.bincount(pairs.code.to_numpy(), minlength=len(ids))
+        order = np.lexsort((rng.random(len(ids)), strata))
+        ranked = strata[order]
+        new_stratum = np.concatenate([[True], ranked[1:] != ranked[:-1]]) if len(ids) else []
+        starts = np.flatnonzero(new_stratum)
+        sizes = np.diff(np.append(starts, len(ids)))
+        rank = np.arange(len(ids)) - np.repeat(starts, sizes)
+        is_train[order] = rank < np.repeat(np.ceil(sizes * train_frac), sizes)
+    return pd.Series(
+        np.where(is_train, 'train', 'test'), index=pd.Index(ids, name=key), name='fold'
     )
 
-    provided_data.Name = provided_data.Name.replace(
-        {
-            'Eduardo Rodriguez': 'Eduardo Rodríguez',
-            'Jose Alvarez': 'José Álvarez',
-            'Sandy Alcantara': 'Sandy Alcántara',
-            'Carlos Martinez': 'Carlos Martínez',
-            'Phillips Valdez': 'Phillips Valdéz',
-            'Jovani Moran': 'Jovani Morán',
-            'Jose Cuas': 'José Cuas',
-            'Jorge Alcala': 'Jorge Alcalá',
-            'Jhoan Duran': 'Jhoan Durán',
-            'Jesus Tinoco': 'Jesús Tinoco',
-            'Brent Honeywell': 'Brent Honeywell Jr.',
-            'Adrian Morejon': 'Adrián Morejón',
-        }
+
+def save_partition(folds, path):
+    """
+    Write a ``partition_players`` id-to-fold index (CSV).
+    """
+    folds.to_csv(path)
+
+
+def read_partition(path):
+    """
+    Read an id-to-fold index written by ``save_partition``.
+    """
+    return pd.read_csv(path, index_col=0).fold
+
+
+def select_fold(data, folds, fold):
+    """
+    Rows of ``data`` whose player (``folds.index.name`` column) is in ``fold``.
+    """
+    return data[data[folds.index.name].isin(folds.index[folds.to_numpy() == fold])]
+
+
+# Statcast pitch descriptions by outcome
+CALLED_STRIKES = ('called_strike',)
+SWINGING_STRIKES = (
+    'swinging_strike',
+    'swinging_strike_blocked',
+    'missed_bunt',
+    'foul_tip',
+    'bunt_foul_tip',
+)
+FOULS = ('foul', 'foul_bunt', 'foul_pitchout')
+IN_PLAY = ('hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score')
+BALLS = ('ball', 'blocked_ball', 'intent_ball', 'pitchout', 'hit_by_pitch')
+INTENTIONAL_BALLS = ('intent_ball',)
+HITS = ('single', 'double', 'triple', 'home_run')
+WALKS = ('walk',)
+STRIKEOUTS = ('strikeout', 'strikeout_double_play')
+OUTS = {
+    'strikeout': 1,
+    'strikeout_double_play': 2,
+    'field_out': 1,
+    'force_out': 1,
+    'fielders_choice_out': 1,
+    'other_out': 1,
+    'sac_fly': 1,
+    'sac_bunt': 1,
+    'double_play': 2,
+    'grounded_into_double_play': 2,
+    'sac_fly_double_play': 2,
+    'sac_bunt_double_play': 2,
+    'triple_play': 3,
+}
+
+# Pitch-level (Statcast-style) columns used by ``aggregate_pitches``
+PITCH_COLUMNS = [
+    'pitcher',
+    'player_name',
+    'game_year',
+    'game_pk',
+    'at_bat_number',
+    'pitch_number',
+    'balls',
+    'strikes',
+    'description',
+    'events',
+    'home_team',
+    'away_team',
+    'inning_topbot',
+]
+PA_KEY = ['game_pk', 'at_bat_number']
+# Statcast team codes that differ from the FanGraphs/baseball-reference ones
+# (both use ATH for the Athletics from 2025)
+STATCAST_TEAMS = {
+    'AZ': 'ARI',
+    'CWS': 'CHW',
+    'KC': 'KCR',
+    'SD': 'SDP',
+    'SF': 'SFG',
+    'TB': 'TBR',
+    'WSH': 'WSN',
+}
+PITCH_GROUPER = ['pitcher', 'game_year', 'Tm']
+
+
+def read_pitch_chunks(path, chunksize=1_000_000, columns=None):
+    """
+    Stream a pitch-level CSV or Parquet file as DataFrames of at most ``chunksize`` rows.
+
+    The rows of one plate appearance must be contiguous in the file (as in Statcast
+    dumps). Reading Parquet requires the optional ``pyarrow`` dependency.
+    """
+    path = Path(path)
+    if path.suffix == '.parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError('Reading parquet pitch data requires pyarrow.') from e
+
+        available = pq.ParquetFile(path).schema_arrow.names
+        usecols = None if columns is None else [c for c in columns if c in available]
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=usecols):
+            yield batch.to_pandas()
+    else:
+        usecols = None if columns is None else lambda c: c in columns
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=usecols)
+
+
+def _pitch_counts(pitches):
+    """
+    Per (pitcher, season, team) count sums of a chunk of whole plate appearances.
+
+    Pitches are put in ascending ``pitch_number`` order within each plate appearance
+    first: Statcast exports are usually newest first, and the final pitch decides
+    looking vs swinging strikeouts.
+    """
+    pitches = pitches.sort_values([*PA_KEY, 'pitch_number'], kind='stable')
+    description = pitches.description
+    strike = description.isin(CALLED_STRIKES + SWINGING_STRIKES + FOULS + IN_PLAY)
+    pitches = pitches.assign(
+        Tm=pd.Series(
+            np.where(pitches.inning_topbot == 'Top', pitches.home_team, pitches.away_team),
+            index=pitches.index,
+        ).replace(STATCAST_TEAMS),
+        Pit=1,
+        Str=strike,
+        called=description.isin(CALLED_STRIKES),
+        swinging=description.isin(SWINGING_STRIKES),
+        foul=description.isin(FOULS),
+        in_play=description.isin(IN_PLAY),
+        ball=description.isin(BALLS),
+        intentional=description.isin(INTENTIONAL_BALLS),
+        first_strike=strike & (pitches.pitch_number == 1),
+        at_30=(pitches.balls == 3) & (pitches.strikes == 0),
+        at_02=(pitches.balls == 0) & (pitches.strikes == 2),
+    )
+    pitches['strike_30'] = pitches.at_30 & pitches.Str
+
+    # Plate-appearance level: reached counts, length and final event
+    pa = pitches.groupby(PA_KEY, sort=False).agg(
+        pitcher=('pitcher', 'first'),
+        game_year=('game_year', 'first'),
+        Tm=('Tm', 'first'),
+        length=('Pit', 'size'),
+        reached_30=('at_30', 'any'),
+        reached_02=('at_02', 'any'),
+        event=('events', 'last'),
+        final=('description', 'last'),
+    )
+    pa = pa[pa.event.notna()]
+    strikeout = pa.event.isin(STRIKEOUTS)
+    pa = pa.assign(
+        PA=1,
+        outs=pa.event.map(OUTS).fillna(0),
+        looking=strikeout & pa.final.isin(CALLED_STRIKES),
+        swinging_k=strikeout & ~pa.final.isin(CALLED_STRIKES),
+        k_02=strikeout & pa.reached_02,
+        hit_02=pa.event.isin(HITS) & pa.reached_02,
+        k_3p=strikeout & (pa.length == 3),
+        bb_4p=pa.event.isin(WALKS) & (pa.length == 4),
     )
 
-    # Let merging cause granular team data to fall out when a player has multi-team year
-    # (it won't be in the provided data)
-    supplemental_data.Tm = supplemental_data.Tm.replace('TOT', '- - -')
-    merged = (
-        provided_data.merge(
-            supplemental_data,
-            left_on=['Name', 'Season', 'Age', 'Team'],
-            right_on=['Name', 'Season', 'Age', 'Tm'],
-            how='left',
-        )
-        # Ensure top TOT is taken from supplemental data
-        .groupby(['PlayerId', 'Team', 'Season'])
-        .first()
+    pitch_sums = pitches.groupby(PITCH_GROUPER)[
+        ['Pit', 'Str', 'called', 'swinging', 'foul', 'in_play', 'ball', 'intentional']
+        + ['first_strike', 'strike_30']
+    ].sum()
+    pa_sums = pa.groupby(PITCH_GROUPER)[
+        ['PA', 'outs', 'reached_30', 'reached_02', 'looking', 'swinging_k', 'k_02', 'hit_02']
+        + ['k_3p', 'bb_4p']
+    ].sum()
+    return pitch_sums.join(pa_sums, how='outer').fillna(0).astype(np.int64)
+
+
+def _supplemental_from_counts(counts, names, ages):
+    """
+    Rates in the ``supplemental-stats.csv`` schema from summed pitch counts
+    (one row per pitcher, season and team, plus a 'TOT' row for multi-team seasons).
+    """
+    counts = counts.reset_index()
+    team_counts = counts.groupby(['pitcher', 'game_year']).Tm.transform('size')
+    totals = (
+        counts[team_counts > 1]
+        .groupby(['pitcher', 'game_year'])
+        .sum(numeric_only=True)
         .reset_index()
-        .drop('Tm', axis=1)
-        .reset_index(drop=True)
-        .sort_values(['Name', 'Season', 'Team'])
+        .assign(Tm='TOT')
     )
-    if len(provided_data) != len(merged):
-        raise Exception(f'{len(provided_data)=} and {len(merged)=} do not match post merge!')
-    return (provided_data, supplemental_data, merged) if return_intermediaries else merged
+    # TOT first, then the team stints (as on baseball-reference)
+    counts = pd.concat([totals.assign(_order=0), counts.assign(_order=1)], ignore_index=True)
+    counts['Name'] = counts.pitcher.map(names)
+    counts['Age'] = [ages.get(key, np.nan) for key in zip(counts.pitcher, counts.game_year)]
+    counts = counts.sort_values(['game_year', 'Name', 'pitcher', '_order', 'Tm'])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        swings = counts.swinging + counts.foul + counts.in_play
+        strikeouts = counts.looking + counts.swinging_k
+        data = pd.DataFrame(
+            {
+                'Rk': counts.groupby('game_year').cumcount() + 1,
+                'Name': counts.Name,
+                'Age': counts.Age,
+                'Tm': counts.Tm,
+                'IP': counts.outs // 3 + (counts.outs % 3) / 10,
+                'PA': counts.PA,
+                'Pit': counts.Pit,
+                'Pit/PA': (counts.Pit / counts.PA).round(2),
+                'Str': counts.Str,
+                'Str%': (counts.Str / counts.Pit).round(3),
+                'L/Str': (counts.called / counts.Str).round(3),
+                'S/Str': (counts.swinging / counts.Str).round(3),
+                'F/Str': (counts.foul / counts.Str).round(3),
+                'I/Str': (counts.in_play / counts.Str).round(3),
+                'AS/Str': ((counts.Str - counts.called) / counts.Str).round(3),
+                'I/Bll': (counts.intentional / counts.ball).round(3),
+                'AS/Pit': (swings / counts.Pit).round(3),
+                'Con': ((counts.foul + counts.in_play) / swings).round(3),
+                '1st%': (counts.first_strike / counts.PA).round(3),
+                '30%': (counts.reached_30 / counts.PA).round(3),
+                '30c': counts.reached_30,
+                '30s': counts.strike_30,
+                '02%': (counts.reached_02 / counts.PA).round(3),
+                '02c': counts.reached_02,
+                '02s': counts.k_02,
+                '02h': counts.hit_02,
+                'L/SO': counts.looking,
+                'S/SO': counts.swinging_k,
+                'L/SO%': (counts.looking / strikeouts).round(3),
+                '3pK': counts.k_3p,
+                '4pW': counts.bb_4p,
+                # Every pitch is known in pitch-level data
+                'PAu': 0,
+                'Pitu': 0,
+                'Stru': 0,
+                'Season': counts.game_year,
+            }
+        )
+    return data.reset_index(drop=True)
+
+
+def aggregate_pitches(paths, chunksize=1_000_000):
+    """
+    Aggregate pitch-by-pitch (Statcast-style, see ``PITCH_COLUMNS``) CSV/Parquet files
+    into pitcher-season rows with the ``supplemental-stats.csv`` schema, so they can
+    be fed to ``load_data``.
+
+    Files are streamed in chunks of ``chunksize`` rows: each chunk is reduced to
+    per (pitcher, season, team) counts with vectorized group sums and added to
+    running totals, so memory is bounded by the chunk size and the number of
+    pitcher-seasons, not by the file size. The rows of a plate appearance cut by
+    a chunk boundary are carried over to the next chunk.
+
+    Notes: IP is derived from the outs of plate-appearance events (baserunning outs
+    are not counted), Age comes from ``age_pit`` when the dump has it, names are
+    converted from 'Last, First' and team codes to the ``k.csv`` ones (``STATCAST_TEAMS``).
+
+    Parameters
+    ----------
+    paths : str, pathlib.Path or listlike of them
+        Pitch-level files (``.csv`` or ``.parquet``).
+    chunksize : int, default=1_000_000
+        Rows read at a time.
+
+    Returns
+    -------
+    pandas.DataFrame in the ``supplemental-stats.csv`` schema.
+    """
+    paths = [paths] if isinstance(paths, (str, Path)) else paths
+    totals = None
+    names = {}
+    ages = {}
+
+    def add(chunk):
+        nonlocal totals
+        with span('aggregate', rows=len(chunk)):
+            counts = _pitch_counts(chunk)
+            totals = counts if totals is None else totals.add(counts, fill_value=0)
+            names.update(chunk.drop_duplicates('pitcher').set_index('pitcher').player_name)
+            if 'age_pit' in chunk:
+                seasons = chunk.drop_duplicates(['pitcher', 'game_year'])
+                ages.update(seasons.set_index(['pitcher', 'game_year']).age_pit)
+
+    for path in paths:
+        carry = None
+        for chunk in read_pitch_chunks(path, chunksize, columns=PITCH_COLUMNS + ['age_pit']):
+            if carry is not None:
+                chunk = pd.concat([carry, chunk], ignore_index=True)
+            # Hold back the (possibly incomplete) last plate appearance
+            last = chunk[PA_KEY].iloc[-1]
+            tail = (chunk[PA_KEY] == last).all(axis=1)
+            carry = chunk[tail]
+            if (~tail).any():
+                add(chunk[~tail])
+        if carry is not None and len(carry):
+            add(carry)
+
+    if totals is None:
+        raise ValueError(f'No pitches found in {paths!r}.')
+    names = {
+        pitcher: Scraper.convert_spanish_letters(' '.join(reversed(name.split(', ', 1))))
+        for pitcher, name in names.items()
+    }
+    return _supplemental_from_counts(totals.astype(np.int64), names, ages)
+
+
+def fingerprint_data(data):
+    """
+    Content hash of a DataFrame (values, index, column names and dtypes).
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+
+    Returns
+    -------
+    str, hex sha256 digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in data.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
 
 
 class PlayerLookup:
@@ -298,8 +699,10 @@ class PlayerLookup:
     @cached_property
     def mapping(self):
         print(f'loading player ids from {self.datapath}...')
-        with open(self.datapath, 'r') as fp:
-            loaded = json.load(fp)
+        with span('load') as load_span:
+            with open(self.datapath, 'r') as fp:
+                loaded = json.load(fp)
+            load_span.rows = len(loaded)
         return pd.DataFrame(loaded)
 
     def _check_source(self, source):
@@ -338,6 +741,19 @@ class PlayerLookup:
         source_col = self._check_source(source)
         return self._lookup(player_id, key_column=source_col, return_column='Name')
 
+    def get_names_from_ids(self, player_ids, source='mlb'):
+        """
+        Vectorized ``get_name_from_id`` for many ids in a single lookup.
+        Source can be 'mlb' or 'fangraphs'.
+
+        Returns
+        -------
+        numpy.ndarray of names aligned with ``player_ids`` (NaN for unknown ids).
+        """
+        source_col = self._check_source(source)
+        names = self.mapping.drop_duplicates(source_col).set_index(source_col)['Name']
+        return names.reindex(np.asarray(player_ids)).to_numpy()
+
     def get_id_from_name(self, player_name, source='mlb'):
         """
         Retrieve player id by name.
@@ -345,3 +761,103 @@ class PlayerLookup:
         """
         source_col = self._check_source(source)
         return self._lookup(player_name, key_column='Name', return_column=source_col)
+
+
+class PlayerIndex:
+    """
+    Player-indexed view of long (player-season) data.
+
+    Rows are sorted once by (key, order) into contiguous per-player slices described
+    by ``ids`` and ``offsets`` (player ``i`` owns rows ``offsets[i]:offsets[i + 1]``),
+    so retrieving one pitcher's history is a dict lookup plus array slicing, i.e.
+    O(history length), instead of a boolean mask over the full frame.
+    Per-player reductions (see ``reduce``) run as a single ``ufunc.reduceat``.
+    """
+
+    def __init__(self, data, key='PlayerId', order='Season'):
+        self.key = key
+        self.order = order
+        sorter = np.lexsort((data[order].to_numpy(), data[key].to_numpy()))
+        self.columns = {col: data[col].to_numpy()[sorter] for col in data.columns}
+
+        keys = self.columns[key]
+        if len(keys):
+            starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+        else:
+            starts = np.array([], dtype=np.int64)
+        self.ids = keys[starts]
+        self.offsets = np.append(starts, len(keys))
+        self._positions = {player_id: i for i, player_id in enumerate(self.ids.tolist())}
+
+        self._names = {}
+        if 'Name' in self.columns:
+            for name, player_id in zip(self.columns['Name'][starts].tolist(), self.ids.tolist()):
+                self._names.setdefault(name, []).append(player_id)
+
+    def __repr__(self):
+        return (
+            f'{__class__.__name__}(key={self.key!r}, players={len(self)}, rows={self.offsets[-1]})'
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, player_id):
+        return player_id in self._positions
+
+    def __iter__(self):
+        """
+        Yield ``(player_id, arrays)`` for every player (see ``arrays``).
+        """
+        for i, player_id in enumerate(self.ids.tolist()):
+            lo, hi = self.offsets[i], self.offsets[i + 1]
+            yield player_id, {col: values[lo:hi] for col, values in self.columns.items()}
+
+    @classmethod
+    def from_predictions(cls, X_df, y_df, preds=None, lookup=None, target='K%'):
+        """
+        Build an index of features, target (``target``) and predictions ('xK%'),
+        with names resolved from MLBAMID in one bulk lookup.
+        """
+        lookup = PlayerLookup() if lookup is None else lookup
+        data = X_df.reset_index(drop=True).assign(**{target: np.asarray(y_df)})
+        if preds is not None:
+            data['xK%'] = np.asarray(preds)
+        if 'Name' not in data.columns:
+            data['Name'] = lookup.get_names_from_ids(data.MLBAMID.to_numpy())
+        return cls(data)
+
+    def find(self, name):
+        """
+        Ids of the players with the given name (empty list when unknown).
+        """
+        return list(self._names.get(name, []))
+
+    def arrays(self, player_id, columns=None):
+        """
+        One player's rows as zero-copy array slices keyed by column.
+        """
+        i = self._positions[player_id]
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        columns = self.columns if columns is None else columns
+        return {col: self.columns[col][lo:hi] for col in columns}
+
+    def history(self, player_id, columns=None):
+        """
+        One player's rows as a DataFrame ordered by ``order``.
+        """
+        return pd.DataFrame(self.arrays(player_id, columns))
+
+    def reduce(self, column, ufunc=np.add):
+        """
+        Per-player reduction of a numeric column (aligned with ``ids``).
+        """
+        return (
+            ufunc.reduceat(self.columns[column], self.offsets[:-1]) if len(self) else np.array([])
+        )
+
+    def mean(self, column):
+        """
+        Per-player mean of a numeric column (aligned with ``ids``).
+        """
+        return self.reduce(column) / np.diff(self.offsets)
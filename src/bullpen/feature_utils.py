@@ -0,0 +1,312 @@
+"""
+Per-pitcher history features (lags, rolling and exponentially weighted means, deltas).
+
+Every feature of a player-season only uses that player's *prior* seasons, so the
+target (K%) can safely be one of the source columns.
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bullpen.data_utils import fingerprint_data
+from bullpen.trace_utils import span
+
+HERE = Path(__file__)
+FEATURE_DIR = HERE.parents[2].joinpath('features')
+
+# Team values of a multi-team season's combined row (k.csv / baseball-reference)
+TOTAL_TEAMS = ('- - -', 'TOT')
+
+# Bumped when feature definitions change, so persisted tables are rebuilt
+STORE_VERSION = 2
+
+
+def group_starts(keys):
+    """
+    Start position of each run of equal values in sorted ``keys``.
+    """
+    if not len(keys):
+        return np.array([], dtype=np.int64)
+    return np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+
+
+def group_positions(starts, n):
+    """
+    Position of each row within its group (0 for a player's first season).
+    """
+    sizes = np.diff(np.append(starts, n))
+    return np.arange(n) - np.repeat(starts, sizes)
+
+
+def lag(values, positions, k=1):
+    """
+    ``values`` shifted by ``k`` rows within each group (NaN for the first ``k`` rows).
+    """
+    out = np.full(len(values), np.nan)
+    valid = positions >= k
+    out[valid] = values[np.flatnonzero(valid) - k]
+    return out
+
+
+def _prior_sums(values, weights):
+    # Exclusive cumulative sums: sums[i] covers rows [0, i)
+    missing = np.isnan(values)
+    weights = np.where(missing, 0.0, weights)
+    weighted = np.concatenate([[0.0], np.cumsum(weights * np.where(missing, 0.0, values))])
+    total = np.concatenate([[0.0], np.cumsum(weights)])
+    return weighted, total
+
+
+def rolling_mean(values, positions, window, weights=None):
+    """
+    (Weighted) mean of the previous ``window`` rows of each group, excluding the current one.
+    """
+    weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=float)
+    weighted, total = _prior_sums(values, weights)
+    hi = np.arange(len(values))
+    lo = hi - np.minimum(positions, window)
+    denominator = total[hi] - total[lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, (weighted[hi] - weighted[lo]) / denominator, np.nan)
+
+
+def ewm_mean(values, positions, alpha, weights=None):
+    """
+    Exponentially weighted mean of the previous rows of each group (excluding the current
+    one); the row ``j`` seasons back has weight ``(1 - alpha) ** (j - 1)`` (times ``weights``).
+
+    Computed with the per-group recurrence ``s[i] = x[i - 1] + (1 - alpha) * s[i - 1]``,
+    restarting at each group's first row. Each step is vectorized over every group's row at
+    the same position, so there are as many steps as the longest history, and sums never
+    mix groups (a global cumulative sum would carry earlier groups' scale into later ones).
+    """
+    decay = 1.0 - alpha
+    weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=float)
+    missing = np.isnan(values)
+    weights = np.where(missing, 0.0, weights)
+    weighted = weights * np.where(missing, 0.0, values)
+
+    numerator = np.zeros(len(values))
+    denominator = np.zeros(len(values))
+    order = np.argsort(positions, kind='stable')
+    bounds = np.searchsorted(positions[order], np.arange(positions.max(initial=0) + 2))
+    for position in range(1, len(bounds) - 1):
+        rows = order[bounds[position] : bounds[position + 1]]
+        numerator[rows] = weighted[rows - 1] + decay * numerator[rows - 1]
+        denominator[rows] = weights[rows - 1] + decay * denominator[rows - 1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def player_seasons(data, columns, key='PlayerId', order='Season', weight='TBF', team='Team'):
+    """
+    Collapse ``data`` to one row per (key, order), sorted.
+
+    A multi-team season is represented by its combined row (Team in ``TOTAL_TEAMS``)
+    when present, otherwise by the ``weight``-weighted mean of its stints.
+
+    Returns
+    -------
+    pandas.DataFrame with ``key``, ``order``, ``weight`` and ``columns``.
+    """
+    data = data[[c for c in dict.fromkeys([key, order, weight, team, *columns]) if c in data]]
+    if team in data:
+        total = data[team].isin(TOTAL_TEAMS)
+        has_total = total.groupby([data[key], data[order]]).transform('any')
+        data = data[total | ~has_total]
+
+    sorter = np.lexsort((data[order].to_numpy(), data[key].to_numpy()))
+    keys = data[key].to_numpy()[sorter]
+    orders = data[order].to_numpy()[sorter]
+    new_group = (keys[1:] != keys[:-1]) | (orders[1:] != orders[:-1])
+    starts = np.flatnonzero(np.concatenate([[True], new_group])) if len(keys) else keys[:0]
+    weights = data[weight].to_numpy(dtype=float)[sorter]
+
+    out = {key: keys[starts], order: orders[starts], weight: weights[starts]}
+    for col in columns:
+        out[col] = data[col].to_numpy(dtype=float)[sorter][starts]
+    if len(starts) < len(keys):
+        # Stints of a season without a combined row: weighted mean of the stints
+        out[weight] = np.add.reduceat(weights, starts)
+        for col in columns:
+            values = data[col].to_numpy(dtype=float)[sorter]
+            out[col] = np.add.reduceat(values * weights, starts) / out[weight]
+    return pd.DataFrame(out)
+
+
+class FeatureStore:
+    """
+    Lag, rolling and exponentially weighted history features per pitcher.
+
+    Features are computed once for the full (all seasons, all players) data with
+    a single sort into contiguous per-player slices and vectorized shifts, cumulative
+    sums and per-position recurrences, keyed by (PlayerId, Season), and persisted in
+    ``store_dir`` under the fingerprint of the data and configuration. ``build`` reuses the
+    persisted table when nothing changed; ``augment`` joins the features onto
+    any split (e.g. inside ``train_model`` / ``cross_validate_model``).
+
+    For each source column ``col``:
+        - ``{col}_lag{k}``: value ``k`` seasons pitched ago
+        - ``{col}_roll{w}``: ``weight``-weighted mean of the previous ``w`` seasons
+        - ``{col}_ewm{alpha}``: exponentially and ``weight``-weighted mean of all previous seasons
+        - ``{col}_delta``: ``{col}_lag1 - {col}_lag2``
+    plus ``n_prior`` (seasons pitched before) and ``gap`` (seasons since the last one).
+    """
+
+    def __init__(
+        self,
+        columns=('K%', 'S/Str', 'Con'),
+        lags=(1, 2),
+        windows=(3,),
+        alphas=(0.5,),
+        weight='TBF',
+        key='PlayerId',
+        order='Season',
+        store_dir=FEATURE_DIR,
+    ):
+        self.columns = list(columns)
+        self.lags = list(lags)
+        self.windows = list(windows)
+        self.alphas = list(alphas)
+        self.weight = weight
+        self.key = key
+        self.order = order
+        self.store_dir = Path(store_dir)
+        self.table_ = None
+        self.fill_values_ = None
+
+    def __repr__(self):
+        return (
+            f'{__class__.__name__}(columns={self.columns!r}, lags={self.lags!r}, '
+            f'windows={self.windows!r}, alphas={self.alphas!r})'
+        )
+
+    @property
+    def feature_names(self):
+        names = []
+        for col in self.columns:
+            names += [f'{col}_lag{k}' for k in self.lags]
+            names += [f'{col}_roll{w}' for w in self.windows]
+            names += [f'{col}_ewm{alpha}' for alpha in self.alphas]
+            names.append(f'{col}_delta')
+        return names + ['n_prior', 'gap']
+
+    def compute(self, data):
+        """
+        History features of every (key, order) pair in ``data``.
+
+        Returns
+        -------
+        pandas.DataFrame indexed by (key, order) with ``feature_names`` columns.
+        """
+        with span('features', rows=len(data)):
+            seasons = player_seasons(data, self.columns, self.key, self.order, self.weight)
+            n = len(seasons)
+            positions = group_positions(group_starts(seasons[self.key].to_numpy()), n)
+            weights = seasons[self.weight].to_numpy(dtype=float)
+
+            features = {}
+            for col in self.columns:
+                values = seasons[col].to_numpy(dtype=float)
+                for k in self.lags:
+                    features[f'{col}_lag{k}'] = lag(values, positions, k)
+                for w in self.windows:
+                    features[f'{col}_roll{w}'] = rolling_mean(values, positions, w, weights)
+                for alpha in self.alphas:
+                    features[f'{col}_ewm{alpha}'] = ewm_mean(values, positions, alpha, weights)
+                features[f'{col}_delta'] = lag(values, positions, 1) - lag(values, positions, 2)
+            features['n_prior'] = positions.astype(float)
+            order = seasons[self.order].to_numpy(dtype=float)
+            features['gap'] = order - lag(order, positions, 1)
+
+            index = pd.MultiIndex.from_frame(seasons[[self.key, self.order]])
+            return pd.DataFrame(features, index=index)[self.feature_names]
+
+    def fingerprint(self, data):
+        """
+        Content hash of the source columns of ``data`` and the store configuration.
+        """
+        source = [self.key, self.order, self.weight, 'Team', *self.columns]
+        digest = hashlib.sha256(fingerprint_data(data[[c for c in source if c in data]]).encode())
+        digest.update(f'{self!r} {self.weight} {self.key} {self.order} {STORE_VERSION}'.encode())
+        return digest.hexdigest()
+
+    def path(self, data):
+        return self.store_dir.joinpath(f'{self.fingerprint(data)[:16]}.pkl')
+
+    def _set_fill_values(self):
+        # Missing history (first seasons) is filled with the feature's mean over the
+        # seasons before the row's, so no later season leaks into a time-series fold;
+        # a missing delta or gap with 0. ``n_prior`` tells the models apart.
+        # fill_values_ holds the running means through each season.
+        by_season = self.table_.groupby(level=self.order)
+        self.fill_values_ = by_season.sum().cumsum() / by_season.count().cumsum()
+        for col in self.columns:
+            self.fill_values_[f'{col}_delta'] = 0.0
+        self.fill_values_['gap'] = 0.0
+
+    def _fills(self, orders):
+        # Running means through the latest season before each of ``orders`` (0 without one)
+        rows = np.searchsorted(self.fill_values_.index.to_numpy(), orders, side='left') - 1
+        fills = self.fill_values_.to_numpy()[np.maximum(rows, 0)]
+        fills[rows < 0] = 0.0
+        return np.nan_to_num(fills, nan=0.0)
+
+    def build(self, data, force=False):
+        """
+        Load the persisted features of ``data`` (computing and saving them on a miss).
+
+        Returns
+        -------
+        self
+        """
+        path = self.path(data)
+        if path.exists() and not force:
+            self.table_ = pd.read_pickle(path)
+        else:
+            self.table_ = self.compute(data)
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            self.table_.to_pickle(path)
+        self._set_fill_values()
+        return self
+
+    def update(self, data, new_data):
+        """
+        Recompute the features of the players in ``new_data`` only (from their full
+        history in ``data``, which must include ``new_data``) and persist the result
+        under the fingerprint of ``data``.
+
+        Returns
+        -------
+        int, number of player-season feature rows recomputed.
+        """
+        if self.table_ is None:
+            raise ValueError(f'{__class__.__name__} has no features; call build(data) first.')
+        affected = new_data[self.key].unique()
+        part = self.compute(data[data[self.key].isin(affected)])
+        kept = self.table_[~self.table_.index.get_level_values(self.key).isin(affected)]
+        self.table_ = pd.concat([kept, part]).sort_index()
+
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.table_.to_pickle(self.path(data))
+        self._set_fill_values()
+        return len(part)
+
+    def augment(self, X, fill=True):
+        """
+        ``X`` with the history features of its (key, order) rows appended.
+
+        With ``fill`` missing features are filled with their mean over the seasons
+        before the row's (0 for deltas and gaps, and without earlier seasons).
+        """
+        if self.table_ is None:
+            raise ValueError(f'{__class__.__name__} has no features; call build(data) first.')
+        index = pd.MultiIndex.from_frame(X[[self.key, self.order]])
+        values = self.table_.reindex(index)[self.feature_names].to_numpy()
+        if fill:
+            fills = self._fills(X[self.order].to_numpy())
+            values = np.where(np.isnan(values), fills, values)
+        return X.assign(**dict(zip(self.feature_names, values.T)))
@@ -0,0 +1,318 @@
+"""
+In-season rolling xK% from pitcher game logs.
+
+``RollingWindow`` keeps per-pitcher sliding-window sums of game-log counts
+(over the last ``days`` days or the last ``batters`` batters faced). Each daily
+``update`` costs O(new games + games leaving the window); rates and xK% for
+every active pitcher are then derived from the window sums in one vectorized pass.
+
+Game logs have one row per pitcher and game with ``Date``, ``PlayerId``, ``Name``,
+``Team`` and the ``COUNT_COLUMNS`` counts.
+"""
+
+import numpy as np
+import pandas as pd
+
+from bullpen.model_utils import ArticleModel
+
+COUNT_COLUMNS = [
+    'PA',
+    'Pit',
+    'Str',
+    'called',
+    'swinging',
+    'foul',
+    'in_play',
+    '30c',
+    'L/SO',
+    'S/SO',
+]
+
+# Count features of ``window_rates``: window totals, not the season totals models
+# are trained on, so they are never passed to a model
+WINDOW_TOTALS = ['TBF', 'L/SO', 'S/SO']
+
+
+def read_game_logs(paths, since=None):
+    """
+    Read game-log CSV files, keeping only games after ``since`` (a date), sorted by date.
+    """
+    paths = [paths] if isinstance(paths, str) or not hasattr(paths, '__iter__') else paths
+    games = pd.concat([pd.read_csv(path, parse_dates=['Date']) for path in paths])
+    if since is not None:
+        games = games[games.Date > pd.Timestamp(since)]
+    return games.sort_values('Date', kind='stable').reset_index(drop=True)
+
+
+def window_rates(sums):
+    """
+    Rate features (``ArticleModel``/linear inputs), the ``WINDOW_TOTALS`` counts and
+    realized K% from window count sums.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        swings = sums.swinging + sums.foul + sums.in_play
+        return pd.DataFrame(
+            {
+                'TBF': sums.PA,
+                'Pit/PA': sums.Pit / sums.PA,
+                'Str%': sums.Str / sums.Pit,
+                'L/Str': sums.called / sums.Str,
+                'S/Str': sums.swinging / sums.Str,
+                'F/Str': sums.foul / sums.Str,
+                'I/Str': sums.in_play / sums.Str,
+                'Con': (sums.foul + sums.in_play) / swings,
+                '30%': sums['30c'] / sums.PA,
+                'L/SO': sums['L/SO'],
+                'S/SO': sums['S/SO'],
+                'K%': (sums['L/SO'] + sums['S/SO']) / sums.PA,
+            },
+            index=sums.index,
+        )
+
+
+def _grow(array, size, fill=0):
+    if len(array) >= size:
+        return array
+    grown = np.full((max(size, 2 * len(array)),) + array.shape[1:], fill, dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+class RollingWindow:
+    """
+    Per-pitcher sliding-window sums of game-log counts.
+
+    With ``days`` the window holds each pitcher's games of the last ``days`` days
+    (up to the latest update). Games are stored in arrival (date) order, so the
+    games leaving the window are always a contiguous prefix and are subtracted
+    with one ``np.subtract.at``.
+
+    With ``batters`` the window holds each pitcher's most recent games covering at
+    least ``batters`` batters faced (whole games). Per-pitcher cumulative sums are
+    kept and the oldest-game pointer of the pitchers who just pitched is advanced
+    (vectorized over pitchers) while the remaining games still cover ``batters``.
+
+    Games that left every window are dropped from the game store (renumbering the
+    rest) once they make up more than half of it, so memory stays proportional to
+    the games in the windows over a season of updates.
+    """
+
+    def __init__(self, days=None, batters=None, key='PlayerId', counts=COUNT_COLUMNS):
+        if (days is None) == (batters is None):
+            raise ValueError('Pass exactly one of days or batters.')
+        self.days = days
+        self.batters = batters
+        self.key = key
+        self.counts = list(counts)
+        self.asof = None
+        self.n_games = 0
+
+        self.ids = []
+        self.names = []
+        self.teams = []
+        self._positions = {}
+        n_counts = len(self.counts)
+        self._sums = np.zeros((0, n_counts))
+        # Game store (arrival order); ``_dead`` games have left every window
+        self._head = 0
+        self._dead = 0
+        self._game_pitcher = np.zeros(0, dtype=np.int64)
+        self._game_date = np.zeros(0, dtype='datetime64[D]')
+        self._game_counts = np.zeros((0, n_counts))
+        # Batters-faced window: cumulative sums and per-pitcher game chains
+        self._cum = np.zeros((0, n_counts))
+        self._game_cum_before = np.zeros((0, n_counts))
+        self._next_game = np.zeros(0, dtype=np.int64)
+        self._last_game = np.zeros(0, dtype=np.int64)
+        self._first_game = np.zeros(0, dtype=np.int64)
+
+    def __repr__(self):
+        window = f'days={self.days!r}' if self.days is not None else f'batters={self.batters!r}'
+        return f'{__class__.__name__}({window}, pitchers={len(self.ids)}, games={self.n_games})'
+
+    def _pitcher_positions(self, games):
+        new = games.drop_duplicates(self.key, keep='last')
+        for player_id, name, team in zip(new[self.key], new.Name, new.Team):
+            position = self._positions.get(player_id)
+            if position is None:
+                self._positions[player_id] = len(self.ids)
+                self.ids.append(player_id)
+                self.names.append(name)
+                self.teams.append(team)
+            else:
+                self.teams[position] = team
+        n = len(self.ids)
+        self._sums = _grow(self._sums, n)
+        self._cum = _grow(self._cum, n)
+        self._last_game = _grow(self._last_game, n, fill=-1)
+        self._first_game = _grow(self._first_game, n, fill=-1)
+        return np.array([self._positions[p] for p in games[self.key].tolist()], dtype=np.int64)
+
+    def update(self, games, asof=None):
+        """
+        Add new games (all dated after the previous update) and slide the windows.
+
+        Parameters
+        ----------
+        games : pandas.DataFrame
+            New game-log rows.
+        asof : Optional date, default=None
+            Date the window ends on (default: the latest game date).
+
+        Returns
+        -------
+        self
+        """
+        games = games.sort_values('Date', kind='stable')
+        dates = games.Date.to_numpy().astype('datetime64[D]')
+        if self.asof is not None and len(dates) and dates.min() <= self.asof:
+            raise ValueError(f'Games must be dated after the previous update ({self.asof}).')
+        positions = self._pitcher_positions(games)
+        values = games[self.counts].to_numpy(dtype=np.float64)
+
+        lo, hi = self.n_games, self.n_games + len(games)
+        self._game_pitcher = _grow(self._game_pitcher, hi)
+        self._game_date = _grow(self._game_date, hi)
+        self._game_counts = _grow(self._game_counts, hi)
+        self._game_pitcher[lo:hi] = positions
+        self._game_date[lo:hi] = dates
+        self._game_counts[lo:hi] = values
+        self.n_games = hi
+
+        if asof is not None:
+            self.asof = np.datetime64(pd.Timestamp(asof).date(), 'D')
+        elif len(dates):
+            self.asof = dates.max()
+
+        if self.days is not None:
+            self._slide_days(positions, values)
+        else:
+            self._slide_batters(positions, values, lo, hi)
+        if 2 * self._dead > self.n_games:
+            self._compact()
+        return self
+
+    def _compact(self):
+        n = self.n_games
+        if self.days is not None:
+            live = np.arange(n) >= self._head
+        else:
+            # A pitcher's games from its oldest window game on are all still chained
+            live = np.arange(n) >= self._first_game[self._game_pitcher[:n]]
+        renumber = np.cumsum(live) - 1
+
+        def moved(games):
+            return np.where(games >= 0, renumber[games], -1)
+
+        self._game_pitcher = self._game_pitcher[:n][live]
+        self._game_date = self._game_date[:n][live]
+        self._game_counts = self._game_counts[:n][live]
+        if self.batters is not None:
+            self._game_cum_before = self._game_cum_before[:n][live]
+            self._next_game = moved(self._next_game[:n][live])
+            self._first_game = moved(self._first_game)
+            self._last_game = moved(self._last_game)
+        self.n_games = len(self._game_pitcher)
+        self._head = 0
+        self._dead = 0
+
+    def _slide_days(self, positions, values):
+        np.add.at(self._sums, positions, values)
+        cutoff = self.asof - np.timedelta64(self.days, 'D')
+        new_head = self._head + np.searchsorted(
+            self._game_date[self._head : self.n_games], cutoff, side='right'
+        )
+        evicted = slice(self._head, new_head)
+        np.subtract.at(self._sums, self._game_pitcher[evicted], self._game_counts[evicted])
+        self._dead += new_head - self._head
+        self._head = new_head
+
+    def _slide_batters(self, positions, values, lo, hi):
+        self._game_cum_before = _grow(self._game_cum_before, hi)
+        self._next_game = _grow(self._next_game, hi, fill=-1)
+        self._next_game[lo:hi] = -1
+
+        # Chain each pitcher's games (a pitcher may have several new games, e.g. doubleheaders)
+        order = np.lexsort((np.arange(len(positions)), positions))
+        pitchers, games, rows = positions[order], lo + order, values[order]
+        is_first = np.concatenate([[True], pitchers[1:] != pitchers[:-1]])
+        is_last = np.concatenate([pitchers[1:] != pitchers[:-1], [True]])
+
+        # Cumulative counts before each game: previous total plus earlier new games
+        running = np.cumsum(rows, axis=0) - rows
+        group_start = np.maximum.accumulate(np.where(is_first, np.arange(len(rows)), 0))
+        before = self._cum[pitchers] + running - running[group_start]
+        self._game_cum_before[games] = before
+
+        previous = np.where(is_first, self._last_game[pitchers], np.roll(games, 1))
+        linked = previous >= 0
+        self._next_game[previous[linked]] = games[linked]
+        self._first_game[pitchers[~linked]] = games[~linked]
+        self._last_game[pitchers[is_last]] = games[is_last]
+        self._cum[pitchers[is_last]] = before[is_last] + rows[is_last]
+
+        pa = self.counts.index('PA')
+        active = np.unique(positions)
+        while len(active):
+            first = self._first_game[active]
+            following = self._next_game[first]
+            remaining = self._cum[active, pa] - self._game_cum_before[following, pa]
+            advance = (following >= 0) & (remaining >= self.batters)
+            self._first_game[active[advance]] = following[advance]
+            self._dead += int(advance.sum())
+            active = active[advance]
+
+        touched = np.unique(positions)
+        first = self._first_game[touched]
+        self._sums[touched] = self._cum[touched] - self._game_cum_before[first]
+
+    def sums(self, active_only=True):
+        """
+        Window count sums per pitcher (by default only pitchers with batters faced in the window).
+        """
+        n = len(self.ids)
+        sums = pd.DataFrame(
+            self._sums[:n], columns=self.counts, index=pd.Index(self.ids, name=self.key)
+        )
+        sums.insert(0, 'Team', self.teams)
+        sums.insert(0, 'Name', self.names)
+        return sums[sums.PA > 0] if active_only else sums
+
+    def features(self):
+        """
+        Window features of every active pitcher (see ``window_rates``).
+        """
+        sums = self.sums()
+        return pd.concat([sums[['Name', 'Team']], window_rates(sums)], axis=1)
+
+    def score(self, model=None):
+        """
+        xK% of every active pitcher over the window, in one vectorized ``predict``.
+
+        Parameters
+        ----------
+        model : Optional fitted model, default=None
+            Anything with ``predict`` taking rate features (the ``WINDOW_TOTALS`` counts
+            are not comparable to season totals, so a model fit on any of them is
+            rejected); the article formula (``ArticleModel``) when None.
+
+        Returns
+        -------
+        pandas.DataFrame of the window features with 'xK%' and 'Date' (window end) columns.
+        """
+        features = self.features()
+        X = features.drop(columns=WINDOW_TOTALS)
+        if model is None:
+            preds = ArticleModel().fit(X, None).predict(X)
+        else:
+            columns = getattr(model, 'feature_names_in_', None)
+            if columns is not None:
+                totals = [c for c in WINDOW_TOTALS if c in set(columns)]
+                if totals:
+                    raise ValueError(
+                        f'Model uses the count features {totals}, which are season totals in '
+                        'training but window totals here. Fit it on rate features only.'
+                    )
+                X = X[list(columns)]
+            preds = model.predict(X)
+        return features.assign(**{'xK%': preds, 'Date': pd.Timestamp(self.asof)})
@@ -0,0 +1,191 @@
+"""
+Leaderboard of every registered model family on the same time-series splits.
+
+Each split's features are prepared once in the main process: the raw numeric
+frame (for ``Baseline`` and ``ArticleModel``, which read columns by name) and one
+transformed matrix per processor, all placed in shared memory (see
+``shared_utils.SharedArrays``). Every (family, split) fit then runs in a process
+pool, attaching to the matrices it needs by name instead of refitting the
+processor or receiving a pickled copy of the data.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+
+from bullpen.cv_utils import pred_X_y
+from bullpen.model_utils import ArticleModel, Baseline, make_processing_pipeline
+from bullpen.pipeline_utils import LASSO_FEATURES
+from bullpen.shared_utils import SharedArrays
+
+
+def lasso_processor(X):
+    return make_processing_pipeline(numeric_features=LASSO_FEATURES)
+
+
+def full_processor(X):
+    return make_processing_pipeline(
+        categorical_features=['Team'],
+        numeric_features=[c for c in X.columns if c != 'Team'],
+    )
+
+
+# Processor factories (called with the training X_df of each split)
+PROCESSORS = {'lasso': lasso_processor, 'full': full_processor}
+
+
+class Family:
+    """
+    A model family on the leaderboard: an unfitted ``estimator`` fit either on the
+    raw numeric features (``processor=None``) or on the matrix of a ``PROCESSORS`` entry.
+    """
+
+    def __init__(self, name, estimator, processor=None):
+        self.name = name
+        self.estimator = estimator
+        self.processor = processor
+
+    def __repr__(self):
+        return (
+            f'{__class__.__name__}(name={self.name!r}, estimator={self.estimator!r}, '
+            f'processor={self.processor!r})'
+        )
+
+
+FAMILIES = {}
+
+
+def register_family(name, estimator, processor=None):
+    """
+    Add (or replace) a family run by ``run_leaderboard``.
+    """
+    if processor is not None and processor not in PROCESSORS:
+        raise ValueError(f'Unrecognized {processor=!r}. Must be one of {tuple(PROCESSORS)}.')
+    FAMILIES[name] = Family(name, estimator, processor)
+    return FAMILIES[name]
+
+
+register_family('baseline-last', Baseline('last'))
+register_family('baseline-mean', Baseline('mean'))
+register_family('article', ArticleModel())
+register_family('linear', LinearRegression(), processor='lasso')
+# One thread per fit: families and splits already run in parallel
+register_family(
+    'xgboost',
+    xgb.XGBRegressor(tree_method='hist', n_estimators=100, max_depth=5, n_jobs=1),
+    processor='full',
+)
+
+
+def share_leaderboard_splits(splits, processors, key='PlayerId'):
+    """
+    Place the raw numeric features, processed matrices and targets of every split
+    in shared memory.
+
+    Validation rows are limited to players seen in the split's training seasons,
+    so every family (including the per-player baselines) is scored on the same rows.
+
+    Returns
+    -------
+    bullpen.shared_utils.SharedArrays keyed by '{idx}-{matrix}-{kind}' where matrix is
+    'raw', 'y' or a processor name and kind is 'train' or 'val'.
+    """
+    arrays = {}
+    columns = {}
+    for idx, (train, val) in enumerate(zip(splits['train'], splits['val'])):
+        val = val[val[key].isin(train[key])]
+        for kind, split in (('train', train), ('val', val)):
+            X_df, y_df = pred_X_y(split)
+            raw = X_df.select_dtypes('number')
+            arrays[f'{idx}-raw-{kind}'] = raw.to_numpy(dtype=np.float64)
+            columns[f'{idx}-raw-{kind}'] = list(raw.columns)
+            arrays[f'{idx}-y-{kind}'] = y_df.to_numpy(dtype=np.float64)
+            if kind == 'train':
+                fitted = {name: PROCESSORS[name](X_df).fit(X_df) for name in processors}
+            for name, processor in fitted.items():
+                matrix = processor.transform(X_df)
+                matrix = matrix.toarray() if sparse.issparse(matrix) else matrix
+                arrays[f'{idx}-{name}-{kind}'] = np.asarray(matrix, dtype=np.float64)
+    return SharedArrays(arrays, columns=columns)
+
+
+def _features(shared, idx, family, kind):
+    if family.processor is None:
+        key = f'{idx}-raw-{kind}'
+        return pd.DataFrame(shared[key], columns=shared.columns[key], copy=False)
+    return shared[f'{idx}-{family.processor}-{kind}']
+
+
+def _score_family(family, shared, idx):
+    X, y = _features(shared, idx, family, 'train'), shared[f'{idx}-y-train']
+    X_val, y_val = _features(shared, idx, family, 'val'), shared[f'{idx}-y-val']
+    model = clone(family.estimator)
+
+    start = time.perf_counter()
+    model.fit(X, pd.Series(y) if family.processor is None else y)
+    fit_seconds = time.perf_counter() - start
+    preds = model.predict(X)
+    start = time.perf_counter()
+    val_preds = model.predict(X_val)
+    predict_seconds = time.perf_counter() - start
+
+    return {
+        'family': family.name,
+        'split': idx,
+        'train_score': r2_score(y, preds),
+        'train_mse': mean_squared_error(y, preds),
+        'val_score': r2_score(y_val, val_preds),
+        'val_mse': mean_squared_error(y_val, val_preds),
+        'val_rows': len(y_val),
+        'fit_seconds': fit_seconds,
+        'predict_us_per_row': predict_seconds / max(len(y_val), 1) * 1e6,
+    }
+
+
+def run_leaderboard(splits, families=None, n_jobs=None, key='PlayerId', sort_by='val_mse'):
+    """
+    Fit and score every family on every time-series split in parallel.
+
+    Parameters
+    ----------
+    splits : dict
+        Output of ``cv_utils.make_timeseries_splits``.
+    families : Optional list of str, default=None
+        Names of registered families (default: all of ``FAMILIES``).
+    n_jobs : Optional int, default=None
+        Worker processes (None uses all cores).
+    key : str, default='PlayerId'
+        Player column; validation rows of players unseen in training are dropped.
+    sort_by : str, default='val_mse'
+        Leaderboard column to sort by (ascending; scores sort descending).
+
+    Returns
+    -------
+    (leaderboard, results): pandas.DataFrame of the per-family means over splits,
+    indexed by family and sorted by ``sort_by``, and the per-(family, split) results.
+    """
+    families = [FAMILIES[name] for name in (FAMILIES if families is None else families)]
+    processors = sorted({f.processor for f in families if f.processor is not None})
+
+    with share_leaderboard_splits(splits, processors, key=key) as shared:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            futures = [
+                pool.submit(_score_family, family, shared, idx)
+                for family in families
+                for idx in range(len(splits['train']))
+            ]
+            results = pd.DataFrame([future.result() for future in futures])
+
+    leaderboard = results.drop(columns='split').groupby('family', sort=False).mean()
+    leaderboard['val_rows'] = leaderboard.val_rows.round().astype(np.int64)
+    ascending = not sort_by.endswith('score')
+    leaderboard = leaderboard.sort_values(sort_by, ascending=ascending)
+    print(leaderboard.to_string(float_format=lambda v: f'{v:.5g}'))
+    return leaderboard, results
@@ -1,14 +1,25 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
 from pathlib import Path
 
+import joblib
 import numpy as np
 import pandas as pd
-from sklearn.base import BaseEstimator, RegressorMixin
+import xgboost as xgb
+from scipy import sparse
+from sklearn.base import BaseEstimator, RegressorMixin, clone
 from sklearn.compose import ColumnTransformer
-from sklearn.metrics import mean_squared_error
+from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
 
-from bullpen.data_utils import PlayerLookup
+from bullpen.data_utils import PlayerLookup, fingerprint_data
+from bullpen.feature_utils import group_positions, group_starts
+from bullpen.trace_utils import in_worker, merge_worker, span
 
 HERE = Path(__file__)
 MODEL_DIR = HERE.parents[2].joinpath('models')
@@ -23,7 +34,7 @@ def sort_features_by_coefs(feature_names, coefs, print_top_n=0):
     return out
 
 
-def make_processing_pipeline(categorical_features=None, numeric_features=None):
+def make_processing_pipeline(categorical_features=None, numeric_features=None, lean=False):
     """
     Create an sklearn ColumnTransformer object to handle transformations.
     Makes a strong assumption that *only* OHE used for categorical
@@ -35,6 +46,12 @@ def make_processing_pipeline(categorical_features=None, numeric_features=None):
         The name of the categorical columns in the training dataframe.
     numeric_features : Optional list of str, default=None
         The name of the numeric columns in the training dataframe.
+    lean : bool, default=False
+        Memory-lean mode: the numeric block is cast to float32 before scaling and
+        the one-hot block stays a sparse float32 matrix (the transformed output is
+        always sparse when there are categorical features, instead of being
+        densified to float64). Linear models and xgboost consume this directly.
+        See ``processing_memory_report`` for the footprint compared with the default.
 
     Returns
     -------
@@ -48,19 +65,64 @@ def make_processing_pipeline(categorical_features=None, numeric_features=None):
                 # When an unknown category is encountered during transform,
                 # the resulting one-hot encoded columns for this feature will be all zeros.
                 # TL;DR Creates a new category for missing values.
-                ('encoder', OneHotEncoder(handle_unknown='ignore')),
+                (
+                    'encoder',
+                    OneHotEncoder(handle_unknown='ignore', dtype=np.float32)
+                    if lean
+                    else OneHotEncoder(handle_unknown='ignore'),
+                ),
             ]
         )
         transformers.append(('categorical', categorical_transformer, categorical_features))
 
     if numeric_features:
-        numeric_transformer = Pipeline(steps=[('scaler', StandardScaler())])
+        steps = [('scaler', StandardScaler())]
+        if lean:
+            # StandardScaler preserves float32 input
+            cast = FunctionTransformer(
+                np.asarray, kw_args={'dtype': np.float32}, feature_names_out='one-to-one'
+            )
+            steps.insert(0, ('cast', cast))
+        numeric_transformer = Pipeline(steps=steps)
         transformers.append(('numeric', numeric_transformer, numeric_features))
 
-    processor = ColumnTransformer(transformers=transformers)
+    processor = ColumnTransformer(transformers=transformers, sparse_threshold=1.0 if lean else 0.3)
     return processor
 
 
+def transformed_nbytes(matrix):
+    """
+    Memory footprint in bytes of a transformed (dense or scipy sparse) matrix.
+    """
+    if sparse.issparse(matrix):
+        matrix = matrix.tocsr()
+        return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    return np.asarray(matrix).nbytes
+
+
+def processing_memory_report(X, categorical_features=None, numeric_features=None):
+    """
+    Compare the transformed matrix of the default and lean processing pipelines on X.
+
+    Returns
+    -------
+    pandas.DataFrame indexed by mode ('default', 'lean') with nbytes, dtype and sparsity.
+    """
+    report = {}
+    for mode, lean in (('default', False), ('lean', True)):
+        processor = make_processing_pipeline(categorical_features, numeric_features, lean=lean)
+        matrix = processor.fit_transform(X)
+        report[mode] = {
+            'nbytes': transformed_nbytes(matrix),
+            'dtype': str(matrix.dtype),
+            'sparse': sparse.issparse(matrix),
+            'shape': matrix.shape,
+        }
+    report = pd.DataFrame.from_dict(report, orient='index')
+    report['ratio'] = report.nbytes / report.loc['default', 'nbytes']
+    return report
+
+
 class Baseline(BaseEstimator, RegressorMixin):
     def __init__(self, method, grouper=None, target='K%'):
         self.method = method
@@ -85,9 +147,33 @@ class Baseline(BaseEstimator, RegressorMixin):
             raise ValueError(
                 f"Invalid method {self.method!r}. Supported methods are 'last' and 'mean'."
             )
+        self.group_counts_ = data.groupby(self.grouper).size()
         self.fitted_ = True
         return self
 
+    def partial_fit(self, X, y):
+        """
+        Update the group aggregates with new (later) rows without revisiting old ones:
+        'last' takes the new last value, 'mean' combines the running means by count.
+        """
+        if not hasattr(self, 'fitted_') or not self.fitted_:
+            return self.fit(X, y)
+
+        new = clone(self).fit(X, y)
+        old_counts = self.group_counts_.reindex(new.group_counts_.index, fill_value=0)
+        if self.method == 'mean':
+            old_preds = self.group_aggregates_.reindex(new.group_aggregates_.index, fill_value=0)
+            updated = (old_preds * old_counts + new.group_aggregates_ * new.group_counts_) / (
+                old_counts + new.group_counts_
+            )
+        else:
+            updated = new.group_aggregates_
+        self.group_aggregates_ = updated.combine_first(self.group_aggregates_).rename('preds')
+        self.group_counts_ = (
+            (old_counts + new.group_counts_).combine_first(self.group_counts_).astype(np.int64)
+        )
+        return self
+
     def predict(self, X):
         if not hasattr(self, 'fitted_') or not self.fitted_:
             raise ValueError(
@@ -116,9 +202,13 @@ class ArticleModel(BaseEstimator, RegressorMixin):
     def __repr__(self):
         return f'{__class__.__name__}()'
 
+    @staticmethod
+    def formula(X):
+        return -0.61 + (X['L/Str'] * 1.1538) + (X['S/Str'] * 1.4696) + (X['F/Str'] * 0.9417)
+
     def fit(self, X, y):
         self.best_params_ = 'return xK% from article'
-        self.preds_ = -0.61 + (X['L/Str'] * 1.1538) + (X['S/Str'] * 1.4696) + (X['F/Str'] * 0.9417)
+        self.preds_ = self.formula(X)
         self.fitted_ = True
         return self
 
@@ -128,17 +218,275 @@ class ArticleModel(BaseEstimator, RegressorMixin):
                 f"This {self} instance is not fitted yet. Call 'fit' before using this method."
             )
 
-        if self.preds_.isnull().any():
-            raise ValueError('Some groups in X were not seen during fitting.')
+        # The formula has no fitted parameters, so any rows (e.g. a validation split) can be scored
+        preds = self.formula(X)
+        if preds.isnull().any():
+            raise ValueError('Some rows in X are missing L/Str, S/Str or F/Str.')
+
+        return preds.to_numpy()
+
+
+class RefitArticleModel(BaseEstimator, RegressorMixin):
+    """
+    The ``ArticleModel`` formula with its coefficients refit by least squares per ``by``
+    group (season), optionally over a rolling ``window`` of groups and weighted by ``weight``.
+
+    xK% = b0 + (L/Str * b1) + (S/Str * b2) + (F/Str * b3)
+
+    All groups are solved at once: per-row outer products of the design rows are
+    summed per group with one ``np.add.reduceat`` into stacked (groups, 4, 4) normal
+    equations, rolling windows are differences of their cumulative sums and a single
+    batched ``np.linalg.solve`` returns every coefficient vector. ``coefs_`` then
+    tracks the drift of the coefficients across seasons.
+
+    Rows with a missing feature, target or weight are dropped. A group (window) with
+    fewer than ``min_rows`` positively weighted rows or a rank-deficient design is
+    not solved: its ``coefs_`` row is NaN.
+
+    Rows are predicted with the coefficients of their group, or of the latest earlier
+    solved group for groups not seen or not solved during fitting (e.g. the season
+    being forecast).
+    """
+
+    features = ['L/Str', 'S/Str', 'F/Str']
+
+    def __init__(self, by='Season', window=1, weight=None, min_rows=4):
+        self.by = by
+        self.window = window
+        self.weight = weight
+        self.min_rows = min_rows
+
+    def __repr__(self):
+        return (
+            f'{__class__.__name__}(by={self.by!r}, window={self.window!r}, weight={self.weight!r})'
+        )
+
+    def _design(self, X):
+        values = X[self.features].to_numpy(dtype=np.float64)
+        return np.hstack([np.ones((len(values), 1)), values])
+
+    def fit(self, X, y):
+        A = self._design(X)
+        y = np.asarray(y, dtype=np.float64)
+        w = np.ones(len(A)) if self.weight is None else X[self.weight].to_numpy(float)
+        valid = np.isfinite(A).all(axis=1) & np.isfinite(y) & np.isfinite(w)
+        groups = X[self.by].to_numpy()[valid]
+        if not len(groups):
+            raise ValueError('No rows without missing values to fit.')
+        sorter = np.argsort(groups, kind='stable')
+        groups = groups[sorter]
+        A, y, w = A[valid][sorter], y[valid][sorter], w[valid][sorter]
+
+        starts = np.flatnonzero(np.concatenate([[True], groups[1:] != groups[:-1]]))
+        gram = np.add.reduceat(w[:, None, None] * A[:, :, None] * A[:, None, :], starts)
+        moment = np.add.reduceat((w * y)[:, None] * A, starts)
+        rows = np.add.reduceat((w > 0).astype(np.int64), starts)
+        if self.window > 1:
+            # Rolling sums over the previous `window` groups (including the current one)
+            gram, moment, rows = (self._rolling(sums, self.window) for sums in (gram, moment, rows))
+
+        solvable = (rows >= self.min_rows) & (np.linalg.matrix_rank(gram) == A.shape[1])
+        solution = np.full(moment.shape, np.nan)
+        solution[solvable] = np.linalg.solve(gram[solvable], moment[solvable][:, :, None])[:, :, 0]
+        self.coefs_ = pd.DataFrame(
+            solution,
+            index=pd.Index(groups[starts], name=self.by),
+            columns=['intercept'] + self.features,
+        )
+        self.best_params_ = f'refit article coefs by {self.by} (window={self.window})'
+        self.fitted_ = True
+        return self
+
+    def predict(self, X):
+        if not hasattr(self, 'fitted_') or not self.fitted_:
+            raise ValueError(
+                f"This {self} instance is not fitted yet. Call 'fit' before using this method."
+            )
+        solved = self.coefs_.dropna()
+        if solved.empty:
+            raise ValueError(f'{self} has no solved group (see min_rows).')
+        fitted = solved.index.to_numpy()
+        rows = np.searchsorted(fitted, X[self.by].to_numpy(), side='right') - 1
+        coefs = solved.to_numpy()[np.clip(rows, 0, len(fitted) - 1)]
+        return np.einsum('ij,ij->i', self._design(X), coefs)
+
+    @staticmethod
+    def _rolling(sums, window):
+        sums = np.cumsum(sums, axis=0)
+        sums[window:] = sums[window:] - sums[:-window].copy()
+        return sums
+
+
+class IncrementalLinearModel(BaseEstimator, RegressorMixin):
+    """
+    Ordinary least squares on numeric ``features`` that can be updated with new rows.
+
+    Only the sufficient statistics (``A.T @ A`` and ``A.T @ y`` of the design
+    matrix ``A = [1, X]``) are kept, so ``partial_fit`` on a new season costs
+    O(new rows) and gives exactly the coefficients of a refit on all rows seen.
+    Predictions match ``LinearRegression`` (with or without ``StandardScaler``,
+    which does not change an OLS fit with an intercept).
+    """
+
+    def __init__(self, features):
+        self.features = features
+
+    def __repr__(self):
+        return f'{__class__.__name__}(features={self.features!r})'
+
+    def _design(self, X):
+        values = X[self.features].to_numpy(dtype=np.float64)
+        return np.hstack([np.ones((len(values), 1)), values])
+
+    def fit(self, X, y):
+        n_coefs = len(self.features) + 1
+        self.gram_ = np.zeros((n_coefs, n_coefs))
+        self.moment_ = np.zeros(n_coefs)
+        self.n_rows_ = 0
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y):
+        if not hasattr(self, 'gram_'):
+            return self.fit(X, y)
+        A = self._design(X)
+        self.gram_ += A.T @ A
+        self.moment_ += A.T @ np.asarray(y, dtype=np.float64)
+        self.n_rows_ += len(A)
+
+        solution = np.linalg.lstsq(self.gram_, self.moment_, rcond=None)[0]
+        self.intercept_ = solution[0]
+        self.coef_ = solution[1:]
+        self.best_params_ = f'OLS on {self.n_rows_} rows'
+        return self
+
+    def predict(self, X):
+        if not hasattr(self, 'coef_'):
+            raise ValueError(
+                f"This {self} instance is not fitted yet. Call 'fit' before using this method."
+            )
+        return self.intercept_ + X[self.features].to_numpy(dtype=np.float64) @ self.coef_
+
+
+def warm_start_xgboost(reg, X, y, n_estimators=25):
+    """
+    Continue training a fitted xgboost ``Pipeline`` (processor + XGBRegressor or a
+    GridSearchCV over one) on new rows: ``n_estimators`` trees are added to the
+    existing booster and the fitted processor is reused as is.
+
+    Returns
+    -------
+    sklearn Pipeline with the same processor and the extended regressor.
+    """
+    processor = reg.named_steps['processor']
+    regressor = reg.named_steps['regressor']
+    regressor = getattr(regressor, 'best_estimator_', regressor)
+
+    extended = clone(regressor).set_params(n_estimators=n_estimators)
+    with span('fit', rows=len(X), model='xgboost-warm-start'):
+        extended.fit(processor.transform(X), y, xgb_model=regressor.get_booster())
+    return Pipeline(steps=[('processor', processor), ('regressor', extended)])
+
+
+class FoldedLinearScorer:
+    """
+    Pure NumPy scorer for a fitted linear pipeline (see ``fold_linear_pipeline``).
+
+    xK% = intercepts[team] + X @ coefs
+
+    The scaler means/scales are folded into ``coefs`` and ``intercepts`` and the
+    one-hot team coefficients become a team-indexed intercept table. The last
+    entry of ``intercepts`` is used for teams not seen during fitting (all-zero
+    one-hot row), and for every row when the pipeline has no team feature.
+    """
+
+    def __init__(self, features, coefs, intercepts, teams=None, team_column='Team'):
+        self.features = list(features)
+        self.coefs = np.asarray(coefs, dtype=np.float64)
+        self.intercepts = np.asarray(intercepts, dtype=np.float64)
+        self.teams = [] if teams is None else list(teams)
+        self.team_column = team_column
+
+    def __repr__(self):
+        return f'{__class__.__name__}(features={self.features!r}, teams={len(self.teams)})'
+
+    def team_codes(self, teams):
+        """
+        Map team names to rows of ``intercepts`` (unknown teams map to -1, i.e. the last row).
+        """
+        return pd.Categorical(teams, categories=self.teams).codes
+
+    def score(self, values, team_codes=None):
+        """
+        Score a raw (n_rows, n_features) array ordered like ``features``.
+        """
+        preds = np.asarray(values, dtype=np.float64) @ self.coefs
+        if team_codes is None:
+            return preds + self.intercepts[-1]
+        return preds + self.intercepts[team_codes]
+
+    def predict(self, X):
+        team_codes = self.team_codes(X[self.team_column]) if self.teams else None
+        return self.score(X[self.features].to_numpy(dtype=np.float64), team_codes)
+
+
+def fold_linear_pipeline(reg):
+    """
+    Export a fitted ``Pipeline(processor, regressor)`` (as built by ``train_model``)
+    to a ``FoldedLinearScorer``.
 
-        return self.preds_.to_numpy()
+    Assumes the processor comes from ``make_processing_pipeline`` (OneHotEncoder on a
+    single categorical column and/or StandardScaler on numeric columns) and the
+    regressor is linear (``coef_``/``intercept_``), optionally wrapped in a search CV
+    object with a ``best_estimator_``.
+
+    Parameters
+    ----------
+    reg : sklearn Pipeline
+        Fitted pipeline with 'processor' and 'regressor' steps.
+
+    Returns
+    -------
+    FoldedLinearScorer reproducing ``reg.predict``.
+    """
+    processor = reg.named_steps['processor']
+    regressor = reg.named_steps['regressor']
+    regressor = getattr(regressor, 'best_estimator_', regressor)
+    coef = np.ravel(regressor.coef_)
+    intercept = float(np.ravel(regressor.intercept_)[0]) if regressor.fit_intercept else 0.0
+
+    features, coefs = [], np.array([])
+    teams, team_offsets, team_column = None, np.array([]), 'Team'
+    for name, _, columns in processor.transformers_:
+        if name not in processor.output_indices_:
+            continue
+        block = coef[processor.output_indices_[name]]
+        if name == 'categorical':
+            if len(columns) != 1:
+                raise ValueError(f'Only a single categorical column can be folded, got {columns}.')
+            encoder = processor.named_transformers_[name].named_steps['encoder']
+            team_column = columns[0]
+            teams = encoder.categories_[0]
+            team_offsets = block
+        elif name == 'numeric':
+            scaler = processor.named_transformers_[name].named_steps['scaler']
+            mean = scaler.mean_ if scaler.with_mean else np.zeros(len(columns))
+            scale = scaler.scale_ if scaler.with_std else np.ones(len(columns))
+            features = list(columns)
+            coefs = block / scale
+            intercept -= np.sum(block * mean / scale)
+
+    intercepts = np.append(intercept + team_offsets, intercept)
+    return FoldedLinearScorer(features, coefs, intercepts, teams=teams, team_column=team_column)
 
 
 def train_baseline(model, X, y, results):
-    model.fit(X, y)
-    preds = model.predict(X)
-    mse = mean_squared_error(y, preds)
-    score = model.score(X, y)
+    with span('fit', rows=len(X), model=repr(model)):
+        model.fit(X, y)
+    with span('predict', rows=len(X), model=repr(model)):
+        preds = model.predict(X)
+    with span('score', rows=len(X), model=repr(model)):
+        mse = mean_squared_error(y, preds)
+        score = model.score(X, y)
     params = model.best_params_
     print(f'{model} {params=} {score=:.3f} {mse=:.5f}')
     results[repr(model)] = (score, mse)
@@ -146,13 +494,20 @@ def train_baseline(model, X, y, results):
     return preds, results
 
 
-def train_model(processor, model, X, y, results, name):
+def train_model(processor, model, X, y, results, name, features=None):
+    # Optional ``feature_utils.FeatureStore`` (already built): its history features
+    # are appended to X, so list them in the processor (``features.feature_names``)
+    if features is not None:
+        X = features.augment(X)
     reg = Pipeline(steps=[('processor', processor), ('regressor', model)])
 
-    reg.fit(X, y)
-    preds = reg.predict(X)
-    mse = mean_squared_error(y, preds)
-    score = reg.score(X, y)
+    with span('fit', rows=len(X), model=name):
+        reg.fit(X, y)
+    with span('predict', rows=len(X), model=name):
+        preds = reg.predict(X)
+    with span('score', rows=len(X), model=name):
+        mse = mean_squared_error(y, preds)
+        score = reg.score(X, y)
     obj = reg.named_steps['regressor']
     params = obj.best_params_ if hasattr(obj, 'best_params_') else None
     # name = reg.named_steps["regressor"].best_estimator_.__class__.__name__
@@ -162,6 +517,370 @@ def train_model(processor, model, X, y, results, name):
     return preds, results
 
 
+_BOOTSTRAP = {}
+
+
+def _init_bootstrap_worker(processor, model, X, y):
+    # Ship the training data to each worker once instead of with every task
+    _BOOTSTRAP.update(processor=processor, model=model, X=X, y=y)
+
+
+def _fit_bootstrap_members(samples):
+    """
+    Fit one pipeline per array of row positions in ``samples`` (see ``BootstrapEnsemble``).
+    """
+    X, y = _BOOTSTRAP['X'], _BOOTSTRAP['y']
+    members = []
+    for rows in samples:
+        reg = Pipeline(
+            steps=[
+                ('processor', clone(_BOOTSTRAP['processor'])),
+                ('regressor', clone(_BOOTSTRAP['model'])),
+            ]
+        )
+        members.append(reg.fit(X.iloc[rows], y.iloc[rows]))
+    return members
+
+
+class BootstrapEnsemble(BaseEstimator, RegressorMixin):
+    """
+    Bootstrap ensemble of ``train_model``-style pipelines for xK% prediction intervals.
+
+    Each member is fit on a cluster bootstrap sample: whole ``groups`` (players, with
+    all their seasons) are drawn with replacement, so the correlated seasons of a
+    pitcher stay together. With ``strata`` players are drawn within each stratum of
+    their smallest ``strata`` value (debut season cohort), so each cohort keeps its
+    number of players. Members are fit in chunks
+    across a process pool (the training data is sent to each worker once).
+    Member predictions are kept as a compact (members, rows) float32 array and
+    reduced to per-row quantiles in one vectorized ``np.quantile``.
+
+    Parameters
+    ----------
+    processor : sklearn ColumnTransformer
+        Unfitted processor (see ``make_processing_pipeline``), cloned per member.
+    model : sklearn estimator
+        Unfitted regressor, cloned per member.
+    n_members : int, default=50
+    groups : str, default='PlayerId'
+        Cluster column: a group's rows are always drawn together.
+    strata : Optional str, default='Season'
+        Column whose per-group minimum stratifies the draws (None draws from all groups).
+    n_jobs : Optional int, default=None
+        Worker processes (None uses all cores).
+    seed : Optional int, default=None
+    """
+
+    def __init__(
+        self,
+        processor,
+        model,
+        n_members=50,
+        groups='PlayerId',
+        strata='Season',
+        n_jobs=None,
+        seed=None,
+    ):
+        self.processor = processor
+        self.model = model
+        self.n_members = n_members
+        self.groups = groups
+        self.strata = strata
+        self.n_jobs = n_jobs
+        self.seed = seed
+
+    def __repr__(self):
+        return f'{__class__.__name__}(model={self.model!r}, n_members={self.n_members!r})'
+
+    def bootstrap_samples(self, X):
+        """
+        Row positions of every member's cluster bootstrap sample.
+        """
+        rng = np.random.default_rng(self.seed)
+        codes = X.groupby(self.groups, sort=False).ngroup().to_numpy()
+        sorter = np.argsort(codes, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(codes))])
+        if self.strata is None:
+            strata = np.zeros(len(offsets) - 1, dtype=np.int64)
+        else:
+            strata = pd.factorize(X[self.strata].groupby(codes).min().to_numpy())[0]
+
+        # Draw clusters with replacement within each stratum for all members at once
+        stratum_sizes = np.bincount(strata)
+        stratum_clusters = np.argsort(strata, kind='stable')
+        stratum_offsets = np.concatenate([[0], np.cumsum(stratum_sizes)])
+        draws = rng.random((self.n_members, len(strata)))
+        picks = stratum_offsets[strata] + (draws * stratum_sizes[strata]).astype(np.int64)
+        clusters = stratum_clusters[picks]
+
+        sizes = offsets[1:] - offsets[:-1]
+        samples = []
+        for member_clusters in clusters:
+            lengths = sizes[member_clusters]
+            starts = np.repeat(offsets[member_clusters] - np.cumsum(lengths) + lengths, lengths)
+            samples.append(sorter[starts + np.arange(lengths.sum())])
+        return samples
+
+    def fit(self, X, y):
+        samples = self.bootstrap_samples(X)
+        n_workers = self.n_jobs or os.cpu_count() or 1
+        chunks = [samples[i::n_workers] for i in range(min(n_workers, len(samples)))]
+        with span('fit', rows=len(X) * self.n_members, model='bootstrap'):
+            with ProcessPoolExecutor(
+                max_workers=len(chunks),
+                initializer=_init_bootstrap_worker,
+                initargs=(self.processor, self.model, X, y),
+            ) as pool:
+                outputs = pool.map(in_worker(_fit_bootstrap_members), chunks)
+                self.members_ = [m for members in map(merge_worker, outputs) for m in members]
+        self.fitted_ = True
+        return self
+
+    def predict_members(self, X):
+        """
+        Predictions of every member as a (members, rows) float32 array.
+        """
+        if not hasattr(self, 'fitted_') or not self.fitted_:
+            raise ValueError(
+                f"This {self} instance is not fitted yet. Call 'fit' before using this method."
+            )
+        preds = np.empty((len(self.members_), len(X)), dtype=np.float32)
+        for i, member in enumerate(self.members_):
+            preds[i] = member.predict(X)
+        return preds
+
+    def predict(self, X):
+        return self.predict_members(X).mean(axis=0, dtype=np.float64)
+
+    def predict_interval(self, X, quantiles=(0.05, 0.5, 0.95), member_preds=None):
+        """
+        Per-row quantiles of the member predictions.
+
+        Returns
+        -------
+        pandas.DataFrame indexed like X with one column per quantile (e.g. 'q0.05').
+        """
+        member_preds = self.predict_members(X) if member_preds is None else member_preds
+        values = np.quantile(member_preds, quantiles, axis=0).T
+        return pd.DataFrame(values, index=X.index, columns=[f'q{q:g}' for q in quantiles])
+
+
+def train_xgboost_grid(processor, param_grid, X, y, nthread=None):
+    """
+    Fit one XGBoost model per parameter combination on the same training data,
+    reusing the processed features and histogram quantiles across combinations.
+
+    Equivalent to calling ``train_model`` with ``XGBRegressor(tree_method='hist', **params)``
+    for every combination in ``param_grid``, but:
+        - the processor is fit/transformed once
+        - the ``QuantileDMatrix`` (and its quantile sketch) is built once per ``max_bin``
+        - combinations that only differ in ``n_estimators`` share one booster,
+          trained to the largest ``n_estimators`` and sliced with ``iteration_range``
+
+    Parameters
+    ----------
+    processor : sklearn ColumnTransformer
+        Unfitted processor (see ``make_processing_pipeline``); it is cloned before fitting.
+    param_grid : dict of str to list
+        XGBRegressor-style parameter grid
+        (e.g. ``{'max_depth': [5, 10], 'n_estimators': [25, 50]}``).
+    X : pandas.DataFrame
+        Training features.
+    y : pandas.Series
+        Training target.
+    nthread : Optional int, default=None
+        Number of threads used to build the DMatrix and train (None uses all cores).
+
+    Returns
+    -------
+    list of dict, one per parameter combination (in ``product`` order), with the
+    parameters plus 'score' (R^2) and 'mse' on the training data.
+    """
+    with span('transform', rows=len(X)):
+        features = clone(processor).fit_transform(X)
+    label = np.asarray(y)
+
+    param_names = list(param_grid.keys())
+    param_combinations = [dict(zip(param_names, p)) for p in product(*param_grid.values())]
+
+    # Group combinations that can share a booster (everything but n_estimators equal)
+    groups = {}
+    for param_dict in param_combinations:
+        key = tuple((k, v) for k, v in param_dict.items() if k != 'n_estimators')
+        groups.setdefault(key, []).append(param_dict.get('n_estimators', 100))
+
+    dmatrices = {}
+    boosted = {}
+    for key, n_estimators in groups.items():
+        booster_params = {'objective': 'reg:squarederror', 'tree_method': 'hist'}
+        booster_params.update({k: v for k, v in key if v is not None})
+        if 'random_state' in booster_params:
+            booster_params['seed'] = booster_params.pop('random_state')
+        if nthread is not None:
+            booster_params['nthread'] = nthread
+
+        max_bin = booster_params.get('max_bin', 256)
+        if max_bin not in dmatrices:
+            dmatrices[max_bin] = xgb.QuantileDMatrix(
+                features, label=label, max_bin=max_bin, nthread=nthread
+            )
+        dtrain = dmatrices[max_bin]
+
+        with span('fit', rows=len(X), model='xgboost'):
+            booster = xgb.train(booster_params, dtrain, num_boost_round=max(n_estimators))
+        with span('predict', rows=len(X) * len(n_estimators), model='xgboost'):
+            for n in n_estimators:
+                boosted[key, n] = booster.predict(dtrain, iteration_range=(0, n))
+
+    results = []
+    for param_dict in param_combinations:
+        key = tuple((k, v) for k, v in param_dict.items() if k != 'n_estimators')
+        preds = boosted[key, param_dict.get('n_estimators', 100)]
+        results.append(
+            {**param_dict, 'score': r2_score(y, preds), 'mse': mean_squared_error(y, preds)}
+        )
+    return results
+
+
+class ModelRegistry:
+    """
+    Registry of trained model artifacts in ``model_dir``.
+
+    Metadata (training data fingerprint, features, metrics, size) is kept in
+    ``registry.json`` next to the artifacts. Any other ``*.joblib`` file in the
+    directory is picked up with whatever metadata can be inferred without loading it.
+    The metadata is read once and cached until the next ``register`` (``refresh``
+    picks up files written by other processes).
+
+    Models are only deserialized on first use (with ``mmap_mode='r'`` so large
+    uncompressed arrays are memory-mapped rather than read) and at most
+    ``max_cached`` loaded models are kept, least recently used evicted first.
+    The latency of each load is recorded in ``load_times_``.
+    """
+
+    index_name = 'registry.json'
+
+    def __init__(self, model_dir=MODEL_DIR, max_cached=2):
+        self.model_dir = Path(model_dir)
+        self.max_cached = max_cached
+        self.load_times_ = {}
+        self._cache = OrderedDict()
+        self._metadata = None
+
+    def __repr__(self):
+        return (
+            f'{__class__.__name__}(model_dir={str(self.model_dir)!r}, max_cached={self.max_cached})'
+        )
+
+    def __contains__(self, name):
+        return name in self.metadata
+
+    def __getitem__(self, name):
+        return self.load(name)
+
+    @property
+    def index_path(self):
+        return self.model_dir.joinpath(self.index_name)
+
+    def _read_index(self):
+        if not self.index_path.exists():
+            return {}
+        with open(self.index_path, 'r') as fp:
+            return json.load(fp)
+
+    @property
+    def metadata(self):
+        """
+        Metadata of every known model keyed by name.
+        """
+        if self._metadata is not None:
+            return self._metadata
+        index = self._read_index()
+        for path in sorted(self.model_dir.glob('*.joblib')):
+            index.setdefault(
+                path.stem,
+                {
+                    'path': path.name,
+                    'fingerprint': None,
+                    'features': None,
+                    'metrics': None,
+                    'size_bytes': path.stat().st_size,
+                },
+            )
+        self._metadata = index
+        return index
+
+    def refresh(self):
+        """
+        Drop the cached metadata, so it is re-read on next use.
+        """
+        self._metadata = None
+
+    def register(self, name, model, train_data=None, features=None, metrics=None):
+        """
+        Save a model as ``{name}.joblib`` and record its metadata.
+
+        Parameters
+        ----------
+        name : str
+            Registry name of the model (e.g. 'linear').
+        model : fitted estimator or Pipeline
+        train_data : Optional pandas.DataFrame, default=None
+            Training data, only used to fingerprint it.
+        features : Optional list of str, default=None
+            Input features; taken from ``model.feature_names_in_`` when available.
+        metrics : Optional dict, default=None
+            E.g. ``{'score': 0.945, 'mse': 0.00018}``.
+
+        Returns
+        -------
+        dict of the recorded metadata.
+        """
+        path = self.model_dir.joinpath(f'{name}.joblib')
+        joblib.dump(model, path)
+
+        if features is None and hasattr(model, 'feature_names_in_'):
+            features = list(model.feature_names_in_)
+        entry = {
+            'path': path.name,
+            'fingerprint': None if train_data is None else fingerprint_data(train_data),
+            'features': None if features is None else list(features),
+            'metrics': metrics,
+            'size_bytes': path.stat().st_size,
+        }
+        index = self._read_index()
+        index[name] = entry
+        with open(self.index_path, 'w') as fp:
+            json.dump(index, fp, indent=2)
+
+        self.refresh()
+        self._cache.pop(name, None)
+        return entry
+
+    def load(self, name):
+        """
+        Return the model registered as ``name``, deserializing it only on a cache miss.
+        """
+        if name in self._cache:
+            self._cache.move_to_end(name)
+            return self._cache[name]
+
+        entry = self.metadata.get(name)
+        if entry is None:
+            raise KeyError(f'Unrecognized model {name!r}. Must be one of {tuple(self.metadata)}.')
+
+        path = self.model_dir.joinpath(entry['path'])
+        start = time.perf_counter()
+        model = joblib.load(path, mmap_mode='r')
+        self.load_times_[name] = time.perf_counter() - start
+        print(f'loaded {name} from {path} in {self.load_times_[name]:.4f}s')
+
+        self._cache[name] = model
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return model
+
+
 def find_delta_extrema(X_df, y_df, preds, extrema='max'):
     diffs = np.abs(y_df - preds)
     f = getattr(np, f'arg{extrema}')
@@ -170,3 +889,74 @@ def find_delta_extrema(X_df, y_df, preds, extrema='max'):
     fangraphs_id = X_df.iloc[idx].PlayerId
     name = LOOKUP.get_name_from_id(mlb_id)
     return name, mlb_id, fangraphs_id
+
+
+def _topk_indices(values, k, largest=True):
+    """
+    Indices of the k largest (or smallest) values, ordered, in O(n + k log k).
+    """
+    if k >= len(values):
+        top = np.arange(len(values))
+    else:
+        keyed = -values if largest else values
+        top = np.argpartition(keyed, k - 1)[:k]
+    order = np.argsort(-values[top] if largest else values[top], kind='stable')
+    return top[order]
+
+
+def find_delta_topk(X_df, y_df, preds, k=10, by=None, largest=True):
+    """
+    Top-k players by absolute residual |K% - xK%| (biggest misses by default).
+
+    Unlike ``find_delta_extrema`` (one player per call), this selects k rows with
+    ``np.argpartition`` (within each group of ``by``: one ``np.lexsort`` by group and
+    residual) and resolves every name in one bulk lookup.
+
+    Parameters
+    ----------
+    X_df : pandas.DataFrame
+        Features with at least MLBAMID and PlayerId.
+    y_df : pandas.Series
+        Target K%.
+    preds : array-like
+        Predicted xK%.
+    k : int, default=10
+        Number of rows to return (per group when ``by`` is given).
+    by : Optional str or list of str, default=None
+        Column(s) of ``X_df`` to group by (e.g. 'Season' or 'Team'); missing values
+        form their own group.
+    largest : bool, default=True
+        Return the largest absolute residuals; False returns the smallest.
+
+    Returns
+    -------
+    pandas.DataFrame with one row per selected player-season, ranked within group.
+    """
+    abs_delta = np.abs(np.asarray(y_df, dtype=np.float64) - np.asarray(preds, dtype=np.float64))
+
+    if by is None:
+        selected = _topk_indices(abs_delta, k, largest)
+        ranks = np.arange(1, len(selected) + 1)
+    else:
+        by = [by] if isinstance(by, str) else list(by)
+        codes = X_df.groupby(by, sort=True, dropna=False).ngroup().to_numpy()
+        order = np.lexsort((-abs_delta if largest else abs_delta, codes))
+        positions = group_positions(group_starts(codes[order]), len(order))
+        selected = order[positions < k]
+        ranks = positions[positions < k] + 1
+
+    rows = X_df.iloc[selected]
+    context = [c for c in ['Team', 'Season'] + (by or []) if c in rows.columns]
+    out = pd.DataFrame(
+        {
+            'Name': LOOKUP.get_names_from_ids(rows.MLBAMID.to_numpy()),
+            'MLBAMID': rows.MLBAMID.to_numpy(),
+            'PlayerId': rows.PlayerId.to_numpy(),
+            **{c: rows[c].to_numpy() for c in dict.fromkeys(context)},
+            'K%': np.asarray(y_df)[selected],
+            'xK%': np.asarray(preds)[selected],
+            'abs_delta': abs_delta[selected],
+            'rank': ranks,
+        }
+    )
+    return out
@@ -0,0 +1,221 @@
+"""
+Dense player × season × feature panel of long (player-season) data.
+
+``Panel`` is built once from the ``load_data`` output: a float32 array of shape
+(players, seasons, features) with a (players, seasons) validity mask and the
+``ids`` / ``seasons`` axes. Seasons are consecutive calendar seasons, so history
+operations (lags, differences, trailing means) are slices and cumulative sums along
+axis 1 instead of per-player groupby passes, and ``to_long`` converts back with a
+single ``np.nonzero`` over the mask.
+"""
+
+import numpy as np
+import pandas as pd
+
+from bullpen.feature_utils import player_seasons
+
+
+class Panel:
+    """
+    Player × season × feature panel.
+
+    ``mask[i, j]`` flags that player ``ids[i]`` pitched in ``seasons[j]``. Values of
+    masked-out cells are NaN; derived panels (``lag``, ``diff``, ``rolling_mean``)
+    keep the mask of the panel they were derived from and are NaN where the history
+    they need is missing.
+
+    Parameters
+    ----------
+    values : numpy.ndarray of shape (players, seasons, features)
+    mask : numpy.ndarray of bool, shape (players, seasons)
+    ids : numpy.ndarray of player ids
+    seasons : numpy.ndarray of consecutive seasons
+    features : list of str
+    key : str, default='PlayerId'
+    season : str, default='Season'
+    """
+
+    def __init__(self, values, mask, ids, seasons, features, key='PlayerId', season='Season'):
+        self.values = np.asarray(values, dtype=np.float32)
+        self.mask = np.asarray(mask, dtype=bool)
+        self.ids = np.asarray(ids)
+        self.seasons = np.asarray(seasons)
+        self.features = list(features)
+        self.key = key
+        self.season = season
+        shape = (len(self.ids), len(self.seasons), len(self.features))
+        if self.values.shape != shape:
+            raise ValueError(
+                f'values of shape {self.values.shape} do not match '
+                f'(players, seasons, features)={shape}.'
+            )
+
+    def __repr__(self):
+        return (
+            f'{__class__.__name__}(players={len(self.ids)}, seasons={len(self.seasons)}, '
+            f'features={len(self.features)}, rows={int(self.mask.sum())})'
+        )
+
+    def __getitem__(self, feature):
+        """
+        (players, seasons) view of one feature.
+        """
+        return self.values[:, :, self.features.index(feature)]
+
+    @classmethod
+    def from_long(cls, data, columns=None, key='PlayerId', season='Season', weight='TBF'):
+        """
+        Build a panel from long data (e.g. ``load_data`` output).
+
+        Multi-team seasons are collapsed to one row per player-season as in
+        ``feature_utils.player_seasons`` (combined row, else ``weight``-weighted stints).
+
+        Parameters
+        ----------
+        data : pandas.DataFrame
+        columns : Optional list of str, default=None
+            Feature columns (default: every numeric column except ids and ``season``).
+            ``weight`` is always included.
+        key : str, default='PlayerId'
+        season : str, default='Season'
+        weight : str, default='TBF'
+
+        Returns
+        -------
+        Panel
+        """
+        if columns is None:
+            columns = [
+                c
+                for c in data.select_dtypes('number').columns
+                if c not in (key, season, 'MLBAMID', weight)
+            ]
+        columns = [weight, *[c for c in columns if c != weight]]
+        seasons = player_seasons(data, columns[1:], key=key, order=season, weight=weight)
+
+        ids, rows = np.unique(seasons[key].to_numpy(), return_inverse=True)
+        years = seasons[season].to_numpy()
+        first = years.min() if len(years) else 0
+        axis = np.arange(first, years.max() + 1) if len(years) else years[:0]
+        cols = years - first
+
+        values = np.full((len(ids), len(axis), len(columns)), np.nan, dtype=np.float32)
+        values[rows, cols] = seasons[columns].to_numpy(dtype=np.float32)
+        mask = np.zeros((len(ids), len(axis)), dtype=bool)
+        mask[rows, cols] = True
+        return cls(values, mask, ids, axis, columns, key=key, season=season)
+
+    def _derive(self, values, suffix):
+        features = [f'{feature}{suffix}' for feature in self.features]
+        return Panel(values, self.mask, self.ids, self.seasons, features, self.key, self.season)
+
+    def select(self, features):
+        """
+        Panel of a subset of the features.
+        """
+        positions = [self.features.index(feature) for feature in features]
+        return Panel(
+            self.values[:, :, positions],
+            self.mask,
+            self.ids,
+            self.seasons,
+            features,
+            self.key,
+            self.season,
+        )
+
+    def join(self, *others):
+        """
+        Concatenate the features of panels sharing the same axes.
+        """
+        for other in others:
+            if not (
+                np.array_equal(other.ids, self.ids) and np.array_equal(other.seasons, self.seasons)
+            ):
+                raise ValueError('Panels must share the same ids and seasons to be joined.')
+        return Panel(
+            np.concatenate([self.values, *(other.values for other in others)], axis=2),
+            self.mask,
+            self.ids,
+            self.seasons,
+            self.features + [f for other in others for f in other.features],
+            self.key,
+            self.season,
+        )
+
+    def lag(self, k=1):
+        """
+        Value ``k`` calendar seasons earlier ('{feature}_lag{k}').
+        """
+        shifted = np.full_like(self.values, np.nan)
+        if k < len(self.seasons):
+            shifted[:, k:] = self.values[:, : len(self.seasons) - k]
+        return self._derive(shifted, f'_lag{k}')
+
+    def diff(self, k=1):
+        """
+        Change from ``k`` calendar seasons earlier ('{feature}_diff{k}').
+        """
+        return self._derive(self.values - self.lag(k).values, f'_diff{k}')
+
+    def _cumulative(self, weights):
+        # Exclusive cumulative sums along the season axis: [:, j] covers seasons [0, j)
+        missing = np.isnan(self.values)
+        weights = np.where(missing, 0.0, weights[:, :, None])
+        weighted = np.cumsum(np.where(missing, 0.0, self.values) * weights, axis=1)
+        total = np.cumsum(weights, axis=1)
+        pad = np.zeros_like(weighted[:, :1])
+        return np.concatenate([pad, weighted], axis=1), np.concatenate([pad, total], axis=1)
+
+    def _weights(self, weight):
+        if weight is None:
+            return np.ones(self.mask.shape)
+        return np.nan_to_num(self[weight].astype(np.float64))
+
+    def rolling_mean(self, window, prior=False, weight=None):
+        """
+        (Weighted) mean over a trailing window of ``window`` calendar seasons.
+
+        Parameters
+        ----------
+        window : int
+        prior : bool, default=False
+            Window ends the season before (so it excludes the current season's value).
+        weight : Optional str, default=None
+            Feature weighting each season (e.g. 'TBF').
+
+        Returns
+        -------
+        Panel with features '{feature}_roll{window}' (or '_prior{window}' with ``prior``).
+        """
+        weighted, total = self._cumulative(self._weights(weight))
+        hi = np.arange(len(self.seasons)) + (0 if prior else 1)
+        lo = np.maximum(hi - window, 0)
+        denominator = total[:, hi] - total[:, lo]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(
+                denominator > 0, (weighted[:, hi] - weighted[:, lo]) / denominator, np.nan
+            )
+        return self._derive(means, f'_prior{window}' if prior else f'_roll{window}')
+
+    def mean(self, weight=None):
+        """
+        Per-player (weighted) mean of every feature over all seasons.
+
+        Returns
+        -------
+        numpy.ndarray of shape (players, features).
+        """
+        weighted, total = self._cumulative(self._weights(weight))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(total[:, -1] > 0, weighted[:, -1] / total[:, -1], np.nan)
+
+    def to_long(self):
+        """
+        Long DataFrame with one row per valid (player, season), sorted by player and season.
+        """
+        players, seasons = np.nonzero(self.mask)
+        data = pd.DataFrame(self.values[players, seasons], columns=self.features)
+        data.insert(0, self.season, self.seasons[seasons])
+        data.insert(0, self.key, self.ids[players])
+        return data
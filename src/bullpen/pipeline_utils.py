@@ -0,0 +1,443 @@
+"""
+Content-addressed, incremental pipeline runner (``bullpen`` console entry point).
+
+Stages declare their input and output files. A stage's cache key is the hash
+of its name, parameters and the content of its inputs, so a stage only re-runs
+when something upstream of it actually changed (an upstream re-run producing
+identical outputs does not invalidate anything). Independent stages run in
+parallel in a process pool.
+
+    $ bullpen run                 # merge -> split -> train-* -> evaluate/predict
+    $ bullpen run evaluate        # only what evaluate needs
+    $ bullpen run --scrape        # also re-scrape baseball-reference
+    $ bullpen status
+    $ bullpen serve --model linear
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import joblib
+import pandas as pd
+import xgboost as xgb
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import GridSearchCV
+from sklearn.pipeline import Pipeline
+
+from bullpen.cv_utils import pred_X_y
+from bullpen.data_utils import (
+    DATA_DIR,
+    batch_scrape,
+    load_data,
+    partition_players,
+    read_partition,
+    save_partition,
+    select_fold,
+)
+from bullpen.model_utils import make_processing_pipeline
+from bullpen.trace_utils import in_worker, merge_worker
+
+LASSO_FEATURES = ['Pit/PA', 'Str%', 'F/Str', 'I/Str', 'Con', '30%', 'L/SO']
+
+
+def hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_fingerprint(func):
+    """
+    Source of ``func`` (its bytecode and constants when the source is unavailable).
+    """
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        code = func.__code__
+        return f'{code.co_code.hex()} {code.co_consts!r}'
+
+
+class Stage:
+    """
+    One pipeline step: ``func(inputs, outputs, **params)`` reads the ``inputs``
+    files and writes every ``outputs`` file (both dicts of name to path).
+    """
+
+    def __init__(self, name, func, inputs=None, outputs=None, params=None):
+        self.name = name
+        self.func = func
+        self.inputs = {k: Path(v) for k, v in (inputs or {}).items()}
+        self.outputs = {k: Path(v) for k, v in (outputs or {}).items()}
+        self.params = params or {}
+
+    def __repr__(self):
+        return f'{__class__.__name__}(name={self.name!r})'
+
+    def key(self):
+        """
+        Content hash of the stage definition (including the code of ``func``, not of
+        the helpers it calls) and its input files.
+        """
+        digest = hashlib.sha256()
+        digest.update(self.name.encode())
+        digest.update(f'{self.func.__module__}.{self.func.__qualname__}'.encode())
+        digest.update(code_fingerprint(self.func).encode())
+        digest.update(json.dumps(self.params, sort_keys=True, default=str).encode())
+        for name, path in sorted(self.inputs.items()):
+            digest.update(f'{name}={hash_file(path)}'.encode())
+        return digest.hexdigest()
+
+
+def _run_stage(stage):
+    stage.func(
+        {k: str(v) for k, v in stage.inputs.items()},
+        {k: str(v) for k, v in stage.outputs.items()},
+        **stage.params,
+    )
+    return {name: hash_file(path) for name, path in stage.outputs.items()}
+
+
+class PipelineRunner:
+    """
+    Run stages in dependency order (a stage depends on the stages producing its
+    inputs), skipping those whose cache key and outputs are unchanged.
+    Cache records live in ``{workdir}/cache.json``.
+    """
+
+    def __init__(self, stages, workdir):
+        self.stages = {stage.name: stage for stage in stages}
+        self.workdir = Path(workdir)
+        producers = {path: stage.name for stage in stages for path in stage.outputs.values()}
+        self.deps = {
+            stage.name: sorted(
+                {producers[p] for p in stage.inputs.values() if p in producers} - {stage.name}
+            )
+            for stage in stages
+        }
+
+    def __repr__(self):
+        return f'{__class__.__name__}(stages={list(self.stages)!r}, workdir={str(self.workdir)!r})'
+
+    @property
+    def cache_path(self):
+        return self.workdir.joinpath('cache.json')
+
+    def _read_cache(self):
+        if not self.cache_path.exists():
+            return {}
+        with open(self.cache_path, 'r') as fp:
+            return json.load(fp)
+
+    def _write_cache(self, cache):
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, 'w') as fp:
+            json.dump(cache, fp, indent=2)
+
+    def upstream(self, targets):
+        """
+        ``targets`` plus every stage they (transitively) depend on.
+        """
+        needed, todo = set(), list(targets)
+        while todo:
+            name = todo.pop()
+            if name not in self.stages:
+                raise ValueError(
+                    f'Unrecognized stage {name!r}. Must be one of {tuple(self.stages)}.'
+                )
+            if name not in needed:
+                needed.add(name)
+                todo.extend(self.deps[name])
+        return needed
+
+    def is_fresh(self, name, cache):
+        stage = self.stages[name]
+        record = cache.get(name)
+        if record is None or not all(path.exists() for path in stage.outputs.values()):
+            return False
+        if any(not path.exists() for path in stage.inputs.values()):
+            return False
+        if record['key'] != stage.key():
+            return False
+        return all(hash_file(stage.outputs[k]) == h for k, h in record['outputs'].items())
+
+    def status(self, targets=None):
+        cache = self._read_cache()
+        names = self.upstream(targets or self.stages)
+        return {name: 'fresh' if self.is_fresh(name, cache) else 'stale' for name in names}
+
+    def run(self, targets=None, jobs=None, force=False):
+        """
+        Bring ``targets`` (default: every stage) up to date.
+
+        Returns
+        -------
+        dict of stage name to 'ran' or 'cached'.
+        """
+        names = self.upstream(targets or self.stages)
+        cache = self._read_cache()
+        done, result, running = set(), {}, {}
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            while len(done) < len(names):
+                ready = [
+                    name
+                    for name in sorted(names - done - set(running.values()))
+                    if all(dep in done for dep in self.deps[name] if dep in names)
+                ]
+                for name in ready:
+                    if not force and self.is_fresh(name, cache):
+                        print(f'[{name}] cached')
+                        result[name] = 'cached'
+                        done.add(name)
+                    else:
+                        print(f'[{name}] running...')
+                        for path in self.stages[name].outputs.values():
+                            path.parent.mkdir(parents=True, exist_ok=True)
+                        running[pool.submit(in_worker(_run_stage), self.stages[name])] = name
+                if len(done) == len(names):
+                    break
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    outputs = merge_worker(future.result())
+                    cache[name] = {'key': self.stages[name].key(), 'outputs': outputs}
+                    self._write_cache(cache)
+                    print(f'[{name}] done')
+                    result[name] = 'ran'
+                    done.add(name)
+        return result
+
+
+def scrape_stage(inputs, outputs, years):
+    batch_scrape(years).to_csv(outputs['supplemental'], index=False)
+
+
+def merge_stage(inputs, outputs):
+    load_data(inputs['provided'], inputs['supplemental']).to_csv(outputs['merged'], index=False)
+
+
+def split_stage(inputs, outputs, seed=53, train_frac=0.7, key='Name'):
+    """
+    Player-level train/test partition, saved as an id-to-fold index.
+
+    Split on ``key='Name'`` by default: with ``seed=53`` this is the split of
+    notebooks/02-data-partitioning.ipynb behind data/train.csv and data/test.csv.
+    """
+    data = pd.read_csv(inputs['merged'])
+    save_partition(partition_players(data, train_frac, seed, key=key), outputs['folds'])
+
+
+def read_fold(inputs, fold, holdout_season=None, season=None):
+    """
+    Rows of the merged data in ``fold``, without ``holdout_season`` or only ``season``.
+    """
+    data = select_fold(pd.read_csv(inputs['merged']), read_partition(inputs['folds']), fold)
+    if holdout_season is not None:
+        data = data[data.Season != holdout_season]
+    if season is not None:
+        data = data[data.Season == season]
+    return data
+
+
+def _train(inputs, outputs, processor, estimator, param_grid, features=None, holdout_season=2024):
+    train = read_fold(inputs, 'train', holdout_season=holdout_season)
+    X_df, y_df = pred_X_y(train)
+    X_df = X_df if features is None else X_df[features]
+    reg = Pipeline(
+        steps=[
+            ('processor', processor),
+            ('regressor', GridSearchCV(estimator, param_grid=param_grid, cv=5)),
+        ]
+    )
+    reg.fit(X_df, y_df)
+    # Dumped directly rather than through ``ModelRegistry.register``: train stages run
+    # concurrently and would race on the registry index. The registry still picks
+    # the artifacts up from the directory.
+    joblib.dump(reg, outputs['model'])
+
+
+def train_linear_stage(inputs, outputs, holdout_season=2024):
+    _train(
+        inputs,
+        outputs,
+        make_processing_pipeline(numeric_features=LASSO_FEATURES),
+        LinearRegression(),
+        {'fit_intercept': [True, False]},
+        features=LASSO_FEATURES,
+        holdout_season=holdout_season,
+    )
+
+
+def train_xgboost_stage(inputs, outputs, holdout_season=2024):
+    X_df, _ = pred_X_y(pd.read_csv(inputs['merged'], nrows=1))
+    _train(
+        inputs,
+        outputs,
+        make_processing_pipeline(
+            categorical_features=['Team'],
+            numeric_features=[f for f in X_df.columns if f != 'Team'],
+        ),
+        xgb.XGBRegressor(),
+        {'n_estimators': [25, 50, 100, 150], 'max_depth': [5, 10, 15]},
+        holdout_season=holdout_season,
+    )
+
+
+def evaluate_stage(inputs, outputs, target_year=2024):
+    X_df, y_df = pred_X_y(read_fold(inputs, 'test', season=target_year))
+    metrics = {}
+    for name, path in inputs.items():
+        if name in ('merged', 'folds'):
+            continue
+        preds = joblib.load(path).predict(X_df)
+        metrics[name] = {'score': r2_score(y_df, preds), 'mse': mean_squared_error(y_df, preds)}
+        print(
+            f'{name} {target_year} score={metrics[name]["score"]:.3f} mse={metrics[name]["mse"]:.5f}'
+        )
+    with open(outputs['metrics'], 'w') as fp:
+        json.dump(metrics, fp, indent=2)
+
+
+def predict_stage(inputs, outputs, target_year=2024):
+    test = read_fold(inputs, 'test', season=target_year)
+    X_df, _ = pred_X_y(test)
+    preds = joblib.load(inputs['model']).predict(X_df)
+    test[['MLBAMID', 'PlayerId', 'Name', 'Team', 'Season']].assign(**{'xK%': preds}).to_csv(
+        outputs['predictions'], index=False
+    )
+
+
+def make_pipeline(
+    workdir='.bullpen',
+    data_dir=DATA_DIR,
+    scrape=False,
+    years=(2021, 2022, 2023, 2024),
+    target_year=2024,
+    seed=53,
+):
+    """
+    The scrape -> merge -> split -> train -> evaluate/predict pipeline.
+
+    Without ``scrape`` the committed ``supplemental-stats.csv`` is used as a
+    source file; with it, supplemental data is scraped into ``workdir``.
+    """
+    workdir = Path(workdir)
+    data_dir = Path(data_dir)
+    models = workdir.joinpath('models')
+    supplemental = (
+        workdir.joinpath('supplemental-stats.csv')
+        if scrape
+        else data_dir.joinpath('supplemental-stats.csv')
+    )
+
+    split = {'merged': workdir.joinpath('merged.csv'), 'folds': workdir.joinpath('folds.csv')}
+
+    stages = [
+        Stage(
+            'merge',
+            merge_stage,
+            inputs={'provided': data_dir.joinpath('k.csv'), 'supplemental': supplemental},
+            outputs={'merged': workdir.joinpath('merged.csv')},
+        ),
+        Stage(
+            'split',
+            split_stage,
+            inputs={'merged': workdir.joinpath('merged.csv')},
+            outputs={'folds': workdir.joinpath('folds.csv')},
+            params={'seed': seed},
+        ),
+        Stage(
+            'train-linear',
+            train_linear_stage,
+            inputs=split,
+            outputs={'model': models.joinpath('linear.joblib')},
+            params={'holdout_season': target_year},
+        ),
+        Stage(
+            'train-xgboost',
+            train_xgboost_stage,
+            inputs=split,
+            outputs={'model': models.joinpath('xgboost.joblib')},
+            params={'holdout_season': target_year},
+        ),
+        Stage(
+            'evaluate',
+            evaluate_stage,
+            inputs={
+                **split,
+                'linear': models.joinpath('linear.joblib'),
+                'xgboost': models.joinpath('xgboost.joblib'),
+            },
+            outputs={'metrics': workdir.joinpath('metrics.json')},
+            params={'target_year': target_year},
+        ),
+        Stage(
+            'predict',
+            predict_stage,
+            inputs={
+                **split,
+                'model': models.joinpath('linear.joblib'),
+            },
+            outputs={'predictions': workdir.joinpath('predictions.csv')},
+            params={'target_year': target_year},
+        ),
+    ]
+    if scrape:
+        stages.insert(
+            0,
+            Stage(
+                'scrape',
+                scrape_stage,
+                outputs={'supplemental': supplemental},
+                params={'years': list(years)},
+            ),
+        )
+    return PipelineRunner(stages, workdir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='bullpen', description="Pitcher's expected K% pipeline.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for command in ('run', 'status'):
+        sub = subparsers.add_parser(command)
+        sub.add_argument('stages', nargs='*', help='Target stages (default: all).')
+        sub.add_argument('--workdir', default='.bullpen')
+        sub.add_argument('--data-dir', default=str(DATA_DIR))
+        sub.add_argument('--scrape', action='store_true', help='Scrape supplemental data.')
+        sub.add_argument('--target-year', type=int, default=2024)
+        if command == 'run':
+            sub.add_argument('--jobs', type=int, default=None, help='Parallel stages.')
+            sub.add_argument('--force', action='store_true', help='Ignore the cache.')
+
+    serve = subparsers.add_parser('serve', add_help=False)
+    serve.add_argument('serve_args', nargs=argparse.REMAINDER)
+
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        from bullpen.serve_utils import main as serve_main
+
+        return serve_main(args.serve_args)
+
+    runner = make_pipeline(
+        args.workdir, args.data_dir, scrape=args.scrape, target_year=args.target_year
+    )
+    if args.command == 'status':
+        for name, state in sorted(runner.status(args.stages or None).items()):
+            print(f'{name}: {state}')
+    else:
+        runner.run(args.stages or None, jobs=args.jobs, force=args.force)
+
+
+if __name__ == '__main__':
+    main()
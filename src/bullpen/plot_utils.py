@@ -1,12 +1,25 @@
+import base64
+import html
+import io
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 
 # import plotly.io as pio
 import scipy.stats
 
-from bullpen.data_utils import PlayerLookup
+from bullpen.data_utils import PlayerIndex, PlayerLookup
+from bullpen.trace_utils import in_worker, merge_worker
 
 LOOKUP = PlayerLookup()
 
@@ -18,7 +31,34 @@ def plot_pred_vs_target(
     title,
     mode='static',
     savepath=None,
+    max_points=50_000,
+    bins=100,
+    show=True,
 ):
+    """
+    Plot predicted xK% against the target K%.
+
+    Parameters
+    ----------
+    X_df : pandas.DataFrame
+        Features with at least MLBAMID, Team and Season (used for hover data).
+    y_df : pandas.Series
+        Target K%.
+    preds : array-like
+        Predicted xK%.
+    title : str
+    mode : str, default='static'
+        'static' (matplotlib), 'interactive' (plotly express scatter with an OLS trendline)
+        or 'scalable' (see ``make_scalable_pred_vs_target``) for large datasets.
+    savepath : Optional str, default=None
+        Where to save the figure (HTML for 'interactive'/'scalable').
+    max_points : int, default=50_000
+        'scalable' only: above this many points, aggregate into a 2D histogram.
+    bins : int, default=100
+        'scalable' only: number of bins per axis when aggregating.
+    show : bool, default=True
+        Display the figure.
+    """
     if mode == 'static':
         plot_model = scipy.stats.linregress(preds, y_df)
         plt.scatter(preds, y_df, alpha=0.5)
@@ -34,7 +74,8 @@ def plot_pred_vs_target(
         plt.legend()
         if savepath:
             plt.savefig(savepath)
-        plt.show()
+        if show:
+            plt.show()
 
     if mode == 'interactive':
         data = pd.concat(
@@ -52,29 +93,93 @@ def plot_pred_vs_target(
             width=600,
             title=title,
         )
-        fig.show()
+        if show:
+            fig.show()
         if savepath:
             # pio.write_html(fig, savepath)
             # https://kanishkegb.github.io/plotly-with-markdown/
             fig.write_html(savepath, full_html=False, include_plotlyjs='cdn')
 
+    if mode == 'scalable':
+        fig = make_scalable_pred_vs_target(X_df, y_df, preds, title, max_points, bins)
+        if show:
+            fig.show()
+        if savepath:
+            fig.write_html(savepath, full_html=False, include_plotlyjs='cdn')
+        return fig
+
 
-def plot_player(player_name, X_df, y_df, preds, target_year=2024, ylim=None, savepath=None):
-    ylim = [0, 0.51] if ylim is None else ylim
-    data = pd.concat(
-        [X_df, y_df.rename('K%'), pd.Series(preds, name='xK%')],
-        axis=1,
-    ).merge(LOOKUP.mapping, on=['MLBAMID', 'PlayerId'])
-
-    player_mask = data.Name == player_name
-    mlb_id, fangraphs_id = data.loc[player_mask, ['MLBAMID', 'PlayerId']].iloc[0]
-    seasons = data.loc[player_mask, 'Season'].tolist()
-    ks = data.loc[player_mask, 'K%'].tolist()
-
-    target_mask = player_mask & (data.Season == target_year)
-    target = (
-        data.loc[target_mask, 'xK%'].item() if target_mask.sum() else 0.3
-    )  # 0.3 is just a placeholder for missing data
+def make_scalable_pred_vs_target(X_df, y_df, preds, title, max_points=50_000, bins=100):
+    """
+    Plotly pred vs target figure that stays light for large datasets.
+
+    Up to ``max_points`` points are drawn as a single WebGL (scattergl) trace with
+    hover text built once from vectorized arrays (names via one bulk lookup rather
+    than a merge). Above that, points are binned with ``numpy.histogram2d`` and only
+    the bin counts are shipped as a heatmap, so the figure size depends on ``bins``,
+    not on the number of rows. The regression line is drawn from its two end points.
+    Pairs with a non-finite prediction or target are left out of the fit and the bins
+    (a ``ValueError`` is raised when fewer than two pairs are left).
+    """
+    x = np.asarray(preds, dtype=np.float64)
+    y = np.asarray(y_df, dtype=np.float64)
+    finite = np.isfinite(x) & np.isfinite(y)
+    if finite.sum() < 2:
+        raise ValueError(
+            f'Need at least 2 pairs with a finite xK% and K% to plot, got {finite.sum()}.'
+        )
+    fit = scipy.stats.linregress(x[finite], y[finite])
+    line_x = np.array([x[finite].min(), x[finite].max()])
+
+    if len(x) <= max_points:
+        names = LOOKUP.get_names_from_ids(X_df.MLBAMID.to_numpy())
+        hover = (
+            pd.Series(names, dtype=object).fillna('').astype(str)
+            + '<br>Team: '
+            + X_df.Team.astype(str).to_numpy()
+            + '<br>Season: '
+            + X_df.Season.astype(str).to_numpy()
+        )
+        data_trace = go.Scattergl(
+            x=x,
+            y=y,
+            mode='markers',
+            marker={'opacity': 0.5},
+            text=hover.to_numpy(),
+            hovertemplate='%{text}<br>xK%: %{x:.3f}<br>K%: %{y:.3f}<extra></extra>',
+            name='player-seasons',
+        )
+    else:
+        counts, x_edges, y_edges = np.histogram2d(x[finite], y[finite], bins=bins)
+        data_trace = go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=np.where(counts.T > 0, counts.T, np.nan),
+            colorscale='Viridis',
+            hovertemplate='xK%: %{x:.3f}<br>K%: %{y:.3f}<br>count: %{z}<extra></extra>',
+            name='player-seasons',
+        )
+
+    fig = go.Figure(
+        [
+            data_trace,
+            go.Scattergl(
+                x=line_x,
+                y=fit.intercept + fit.slope * line_x,
+                mode='lines',
+                line={'color': 'black'},
+                name=f'r^2: {fit.rvalue**2:.3f}',
+            ),
+        ]
+    )
+    fig.update_layout(title=title, xaxis_title='xK%', yaxis_title='K%', height=600, width=600)
+    return fig
+
+
+def make_player_figure(player_name, mlb_id, fangraphs_id, seasons, ks, target, target_year):
+    """
+    Draw a player card (K% history plus target year xK%) and return the matplotlib Figure.
+    """
     alpha = None if target else 0
     title = f'{player_name}\n(MLBAMID: {mlb_id} FanGraphs {fangraphs_id})'
     if not target:
@@ -104,8 +209,159 @@ def plot_player(player_name, X_df, y_df, preds, target_year=2024, ylim=None, sav
     ax.set_xlabel('Year')
     ax.set_ylabel('K%')
     ax.set_title(title)
+    return fig
+
+
+def _player_card(player_name, player, target_year):
+    """
+    Arguments of ``make_player_figure`` for one player's ``PlayerIndex.arrays``.
+    """
+    target = player['xK%'][player['Season'] == target_year]
+    # 0.3 is just a placeholder for missing data
+    target = target[0] if len(target) else 0.3
+    return (
+        player_name,
+        player['MLBAMID'][0],
+        player['PlayerId'][0],
+        player['Season'].tolist(),
+        player['K%'].tolist(),
+        target,
+    )
+
+
+def plot_player(
+    player_name, X_df, y_df, preds, target_year=2024, ylim=None, savepath=None, index=None
+):
+    """
+    Plot one player's K% history and target year xK%.
+
+    Pass a prebuilt ``index`` (``PlayerIndex.from_predictions(X_df, y_df, preds)``)
+    when plotting many players to avoid re-indexing the data on every call.
+    """
+    ylim = [0, 0.51] if ylim is None else ylim
+    index = PlayerIndex.from_predictions(X_df, y_df, preds, LOOKUP) if index is None else index
+
+    player_ids = index.find(player_name)
+    if not player_ids:
+        raise ValueError(f'Unrecognized {player_name=!r}.')
+    card = _player_card(player_name, index.arrays(player_ids[0]), target_year)
+    ks, target = card[-2:]
+
+    make_player_figure(*card, target_year)
     if savepath:
         plt.savefig(savepath)
     plt.show()
     print(f'xK%: {target:.4f}')
     print(f'K% : {ks}')
+
+
+def _slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-')
+
+
+def _init_render_worker():
+    matplotlib.use('Agg', force=True)
+
+
+def _render_player_cards(cards, outdir, fmt, target_year):
+    """
+    Render a chunk of player cards (see ``batch_plot_players``) and return the written paths.
+    """
+    paths = []
+    for player_name, mlb_id, fangraphs_id, seasons, ks, target in cards:
+        fig = make_player_figure(
+            player_name, mlb_id, fangraphs_id, seasons, ks, target, target_year
+        )
+        path = Path(outdir).joinpath(f'{fangraphs_id}-{_slugify(player_name)}.{fmt}')
+        if fmt == 'html':
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png')
+            encoded = base64.b64encode(buffer.getvalue()).decode()
+            rows = ''.join(f'<tr><td>{s}</td><td>{k:.4f}</td></tr>' for s, k in zip(seasons, ks))
+            path.write_text(
+                f'<html><head><meta charset="utf-8"><title>{html.escape(player_name)}</title>'
+                '</head><body>'
+                f'<img src="data:image/png;base64,{encoded}">'
+                f'<p>{target_year} xK%: {target:.4f}</p>'
+                f'<table><tr><th>Season</th><th>K%</th></tr>{rows}</table>'
+                '</body></html>',
+                encoding='utf-8',
+            )
+        else:
+            fig.savefig(path, format=fmt)
+        plt.close(fig)
+        paths.append(str(path))
+    return paths
+
+
+def batch_plot_players(
+    X_df, y_df, preds, outdir, players=None, target_year=2024, fmt='png', n_jobs=None
+):
+    """
+    Render ``plot_player`` cards for many players to files, without displaying them.
+
+    The data is enriched with names once (bulk lookup), grouped by player once
+    (``PlayerIndex``) and the cards are rendered with the Agg backend across a process pool.
+
+    Parameters
+    ----------
+    X_df : pandas.DataFrame
+        Features with at least MLBAMID, PlayerId and Season.
+    y_df : pandas.Series
+        Target K%.
+    preds : array-like
+        Predicted xK%.
+    outdir : str or Path
+        Directory to write '{PlayerId}-{name}.{fmt}' files to (created if missing).
+    players : Optional list of str, default=None
+        Player names to render (default: every player in X_df).
+    target_year : int, default=2024
+    fmt : str, default='png'
+        'png' (or any other matplotlib format such as 'svg') or 'html'
+        (a self-contained card with the embedded image and the K% history).
+    n_jobs : Optional int, default=None
+        Number of worker processes (None uses all cores).
+
+    Returns
+    -------
+    dict with the written paths and the rendering throughput.
+    """
+    start = time.perf_counter()
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    index = PlayerIndex.from_predictions(X_df, y_df, preds, LOOKUP)
+    players = None if players is None else set(players)
+    cards = [
+        _player_card(player['Name'][0], player, target_year)
+        for _, player in index
+        if isinstance(player['Name'][0], str) and (players is None or player['Name'][0] in players)
+    ]
+
+    n_jobs = os.cpu_count() if n_jobs is None else n_jobs
+    n_chunks = max(1, min(len(cards), n_jobs * 4))
+    chunks = [cards[i::n_chunks] for i in range(n_chunks)]
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_render_worker) as pool:
+        paths = [
+            path
+            for chunk_paths in map(
+                merge_worker,
+                pool.map(
+                    in_worker(_render_player_cards),
+                    chunks,
+                    [outdir] * n_chunks,
+                    [fmt] * n_chunks,
+                    [target_year] * n_chunks,
+                ),
+            )
+            for path in chunk_paths
+        ]
+
+    elapsed = time.perf_counter() - start
+    print(f'rendered {len(paths)} player cards to {outdir} in {elapsed:.2f}s')
+    return {
+        'paths': paths,
+        'players': len(paths),
+        'seconds': elapsed,
+        'players_per_s': len(paths) / elapsed if elapsed else float('inf'),
+    }
@@ -0,0 +1,117 @@
+"""
+Monte Carlo strikeout projections from xK% predictions.
+"""
+
+import numpy as np
+
+from bullpen.trace_utils import span
+
+ID_COLUMNS = ['MLBAMID', 'PlayerId', 'Name', 'Team', 'Season']
+
+
+def simulate_strikeouts(p, tbf, n_sims=10_000, dispersion=None, max_elements=10_000_000, rng=None):
+    """
+    Histogram of simulated strikeout totals per pitcher.
+
+    Strikeouts are Binomial(tbf, p) or, with ``dispersion`` (a Beta concentration
+    kappa), beta-binomial: each simulation first draws the pitcher's true rate from
+    Beta(p * kappa, (1 - p) * kappa). Draws are made in (pitchers, simulations) blocks
+    of at most ``max_elements`` values and folded into per-pitcher integer histograms
+    (strikeouts range over 0..tbf), so memory stays bounded whatever ``n_sims`` is.
+
+    Returns
+    -------
+    numpy.ndarray of shape (pitchers, max(tbf) + 1) with simulation counts per total.
+    """
+    rng = np.random.default_rng(rng)
+    p = np.clip(np.asarray(p, dtype=np.float64), 0.0, 1.0)
+    tbf = np.asarray(tbf, dtype=np.int64)
+    width = int(tbf.max(initial=0)) + 1
+    hist = np.zeros((len(p), width), dtype=np.int64)
+
+    sims_per_block = max(1, min(n_sims, max_elements))
+    rows_per_block = max(1, max_elements // sims_per_block)
+    for lo in range(0, len(p), rows_per_block):
+        hi = min(lo + rows_per_block, len(p))
+        rows = np.arange(hi - lo)
+        for done in range(0, n_sims, sims_per_block):
+            size = (hi - lo, min(sims_per_block, n_sims - done))
+            rates = p[lo:hi, None]
+            if dispersion is not None:
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    a = np.maximum(rates * dispersion, 1e-12)
+                    b = np.maximum((1 - rates) * dispersion, 1e-12)
+                rates = rng.beta(np.broadcast_to(a, size), np.broadcast_to(b, size))
+            ks = rng.binomial(tbf[lo:hi, None], rates, size=size)
+            # One bincount over (row, total) pairs updates the whole block's histograms
+            flat = (rows[:, None] * width + ks).ravel()
+            hist[lo:hi] += np.bincount(flat, minlength=(hi - lo) * width).reshape(-1, width)
+    return hist
+
+
+def histogram_percentiles(hist, percentiles):
+    """
+    Percentiles (inverted CDF) of each row's integer histogram.
+    """
+    cdf = np.cumsum(hist, axis=1)
+    targets = np.asarray(percentiles, dtype=np.float64) / 100 * cdf[:, -1:]
+    return np.stack(
+        [np.argmax(cdf >= np.maximum(target, 1)[:, None], axis=1) for target in targets.T],
+        axis=1,
+    )
+
+
+def project_strikeouts(
+    data,
+    n_sims=10_000,
+    percentiles=(10, 50, 90),
+    pred='xK%',
+    tbf='TBF',
+    dispersion=None,
+    max_elements=10_000_000,
+    seed=None,
+):
+    """
+    Simulated strikeout distribution of every pitcher in a ``k.csv``-shaped frame.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        One row per pitcher with the ``pred`` rate (e.g. model xK%) and expected ``tbf``.
+    n_sims : int, default=10_000
+        Simulations per pitcher.
+    percentiles : listlike of float, default=(10, 50, 90)
+    pred : str, default='xK%'
+    tbf : str, default='TBF'
+        Expected batters faced (rounded to integers).
+    dispersion : Optional float, default=None
+        Beta concentration for beta-binomial draws (None: binomial). Smaller values
+        add more uncertainty about the pitcher's true strikeout rate.
+    max_elements : int, default=10_000_000
+        Largest block of simulated values held in memory at once.
+    seed : Optional int, default=None
+
+    Returns
+    -------
+    pandas.DataFrame with the id columns of ``data``, 'K_mean', 'K_std' and one
+    'K_p{percentile}' column per percentile.
+    """
+    batters = data[tbf].round().to_numpy(dtype=np.int64)
+    with span('simulate', rows=len(data) * n_sims):
+        hist = simulate_strikeouts(
+            data[pred].to_numpy(), batters, n_sims, dispersion, max_elements, seed
+        )
+
+    totals = np.arange(hist.shape[1])
+    mean = hist @ totals / n_sims
+    std = np.sqrt(np.maximum(hist @ totals**2 / n_sims - mean**2, 0.0))
+    values = histogram_percentiles(hist, percentiles)
+
+    projection = data[[c for c in ID_COLUMNS if c in data]].copy()
+    projection[tbf] = batters
+    projection[pred] = data[pred].to_numpy()
+    projection['K_mean'] = mean
+    projection['K_std'] = std
+    for i, q in enumerate(percentiles):
+        projection[f'K_p{q:g}'] = values[:, i]
+    return projection
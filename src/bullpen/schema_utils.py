@@ -0,0 +1,236 @@
+"""
+Declarative data schemas and a vectorized validator.
+
+A ``Schema`` maps column names to ``Column`` specs (dtype kind, value range,
+nullability) plus key-uniqueness and dataset-level checks. ``Schema.validate``
+runs every check column-wise as vectorized comparisons on the underlying NumPy
+arrays and returns a report of the failures, so it is cheap enough to run on
+every ``load_data``.
+"""
+
+import numpy as np
+import pandas as pd
+
+TOTAL_TEAM = '- - -'
+
+
+class Column:
+    """
+    Spec of one column: ``dtype`` kind ('int', 'float' or 'str'), inclusive
+    ``min``/``max`` bounds and whether missing values are allowed.
+    """
+
+    def __init__(self, dtype='float', min=None, max=None, nullable=False):
+        self.dtype = dtype
+        self.min = min
+        self.max = max
+        self.nullable = nullable
+
+    def __repr__(self):
+        return (
+            f'{__class__.__name__}(dtype={self.dtype!r}, min={self.min!r}, max={self.max!r}, '
+            f'nullable={self.nullable!r})'
+        )
+
+
+def rate(nullable=False):
+    return Column('float', 0.0, 1.0, nullable=nullable)
+
+
+def count(max=None):
+    return Column('int', 0, max)
+
+
+class SchemaError(ValueError):
+    """
+    Raised by ``Schema.check``; ``report`` holds the failed checks.
+    """
+
+    def __init__(self, report):
+        self.report = report
+        lines = [
+            f'  {row.check}({row.column}): '
+            + (
+                row.detail
+                if isinstance(row.detail, str)
+                else f'{row.failures} rows, e.g. row {row.example!r}'
+            )
+            for row in report.itertuples()
+        ]
+        super().__init__('Schema validation failed:\n' + '\n'.join(lines))
+
+
+def _dtype_ok(series, kind):
+    if kind == 'int':
+        return pd.api.types.is_integer_dtype(series.dtype)
+    if kind == 'float':
+        return pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(
+            series.dtype
+        )
+    if kind == 'str':
+        return pd.api.types.is_string_dtype(series.dtype) or series.dtype == object
+    raise ValueError(f"Unrecognized {kind=!r}. Must be one of ('int', 'float', 'str').")
+
+
+class Schema:
+    """
+    Declarative table schema.
+
+    Parameters
+    ----------
+    columns : dict of str to Column
+    unique : Optional list of str, default=None
+        Columns that must jointly be unique.
+    checks : Optional list of callables, default=None
+        Dataset-level checks ``check(data)`` returning a dict of check name to a boolean
+        array flagging failing rows (e.g. ``total_consistency``).
+    """
+
+    def __init__(self, columns, unique=None, checks=None):
+        self.columns = dict(columns)
+        self.unique = list(unique or [])
+        self.checks = list(checks or [])
+
+    def __repr__(self):
+        return f'{__class__.__name__}(columns={len(self.columns)}, unique={self.unique!r})'
+
+    def validate(self, data):
+        """
+        Run every check on ``data``.
+
+        Returns
+        -------
+        pandas.DataFrame with one row per failed check (check, column, failures, the index
+        label of an example failing row and, for whole-column failures, a detail message);
+        empty when ``data`` is valid.
+        """
+        failures = []
+
+        def fail(check, column, mask):
+            n = int(np.count_nonzero(mask))
+            if n:
+                failures.append((check, column, n, data.index[int(np.argmax(mask))], None))
+
+        missing = [c for c in self.columns if c not in data.columns]
+        for column in missing:
+            failures.append(('missing', column, len(data), None, 'column is missing'))
+        present = [c for c in self.columns if c in data.columns]
+
+        for column in present:
+            expected = self.columns[column].dtype
+            if not _dtype_ok(data[column], expected):
+                detail = f'dtype {data[column].dtype}, expected {expected}'
+                failures.append(('dtype', column, len(data), None, detail))
+
+        # Column-wise over the underlying NumPy arrays (no per-row Python, no 2D copies)
+        for column in present:
+            spec = self.columns[column]
+            series = data[column]
+            values = series.to_numpy()
+            if values.dtype.kind == 'f':
+                nulls = np.isnan(values)
+            elif values.dtype.kind in 'iub':
+                nulls = None
+            else:
+                nulls = series.isna().to_numpy()
+            if not spec.nullable and nulls is not None:
+                fail('null', column, nulls)
+
+            if values.dtype.kind in 'iuf' and (spec.min is not None or spec.max is not None):
+                bad = np.zeros(len(values), dtype=bool)
+                if spec.min is not None:
+                    bad |= values < spec.min
+                if spec.max is not None:
+                    bad |= values > spec.max
+                fail('range', column, bad)
+
+        if self.unique and all(c in data.columns for c in self.unique):
+            keys = pd.MultiIndex.from_arrays([data[c] for c in self.unique])
+            fail('unique', ','.join(self.unique), keys.duplicated())
+
+        for check in self.checks:
+            for name, mask in check(data).items():
+                fail(name, check.__name__, np.asarray(mask))
+
+        return pd.DataFrame(failures, columns=['check', 'column', 'failures', 'example', 'detail'])
+
+    def check(self, data):
+        """
+        Validate ``data`` and raise ``SchemaError`` on any failure.
+
+        Returns
+        -------
+        data, unchanged.
+        """
+        report = self.validate(data)
+        if len(report):
+            raise SchemaError(report)
+        return data
+
+
+def total_consistency(data, key='PlayerId', team='Team', season='Season', tolerance=10):
+    """
+    Multi-team ('- - -') rows are a player's only row of the season, and every row's
+    supplemental batters faced (PA) agrees with the provided TBF within ``tolerance``
+    (a mismatch means team and combined rows were merged against each other).
+    """
+    checks = {}
+    if all(c in data.columns for c in (key, team, season)):
+        is_total = (data[team] == TOTAL_TEAM).to_numpy()
+        shared = pd.MultiIndex.from_arrays([data[key], data[season]]).duplicated(keep=False)
+        checks['total_alone'] = is_total & shared
+    if 'PA' in data.columns and 'TBF' in data.columns:
+        with np.errstate(invalid='ignore'):
+            checks['total_batters'] = (
+                np.abs(data.PA.to_numpy(dtype=np.float64) - data.TBF.to_numpy(dtype=np.float64))
+                > tolerance
+            )
+    return checks
+
+
+MERGED_SCHEMA = Schema(
+    columns={
+        'PlayerId': Column('int', 0),
+        'Team': Column('str'),
+        'Season': Column('int', 1871, 2100),
+        'MLBAMID': Column('int', 0),
+        'Name': Column('str'),
+        'Age': Column('int', 15, 60),
+        'TBF': count(),
+        'K%': rate(),
+        'Rk': count(),
+        'IP': Column('float', 0),
+        'PA': count(),
+        'Pit': count(),
+        'Pit/PA': Column('float', 1, 15),
+        'Str': count(),
+        'Str%': rate(),
+        'L/Str': rate(),
+        'S/Str': rate(),
+        'F/Str': rate(),
+        'I/Str': rate(),
+        'AS/Str': rate(),
+        'I/Bll': rate(),
+        'AS/Pit': rate(),
+        'Con': rate(),
+        '1st%': rate(),
+        '30%': rate(),
+        '30c': count(),
+        '30s': count(),
+        '02%': rate(),
+        '02c': count(),
+        '02s': count(),
+        '02h': count(),
+        'L/SO': count(),
+        'S/SO': count(),
+        # No strikeouts leaves L/SO% undefined
+        'L/SO%': rate(nullable=True),
+        '3pK': count(),
+        '4pW': count(),
+        'PAu': count(),
+        'Pitu': count(),
+        'Stru': count(),
+    },
+    unique=['PlayerId', 'Team', 'Season'],
+    checks=[total_consistency],
+)
@@ -0,0 +1,360 @@
+"""
+Long-running local inference service.
+
+Loads a model once (from the ``ModelRegistry``), keeps it warm and scores
+batched rows posted as JSON or CSV. Each request's columns are checked and
+aligned to the model's features, then concurrent requests are micro-batched
+into a single ``predict`` call.
+
+    $ python -m bullpen.serve_utils --model linear --port 8000
+    $ curl -X POST -H 'Content-Type: text/csv' --data-binary @data/test.csv localhost:8000/predict
+"""
+
+import argparse
+import io
+import json
+import queue
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from bullpen.model_utils import ModelRegistry
+
+
+class BatcherUnavailable(RuntimeError):
+    """
+    Raised by ``MicroBatcher.submit`` when no prediction comes back in time
+    (or the batching thread is not running).
+    """
+
+
+class _Request:
+    def __init__(self, frame):
+        self.frame = frame
+        self.submitted = time.perf_counter()
+        self.done = threading.Event()
+        self.preds = None
+        self.error = None
+        self.timings = {}
+
+
+class MicroBatcher:
+    """
+    Collect concurrently submitted frames into one ``predict`` call.
+
+    A batch is closed when it holds ``max_batch_rows`` rows or ``max_wait``
+    seconds have passed since its first request arrived. When the batched
+    ``predict`` fails, each request of the batch is retried alone, so only the
+    requests that fail on their own get the error. ``predict`` must return one
+    value per row. A request waits at most ``timeout`` seconds for its predictions.
+    """
+
+    def __init__(self, predict, max_batch_rows=10_000, max_wait=0.002, timeout=30.0):
+        self.predict = predict
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __repr__(self):
+        return (
+            f'{__class__.__name__}(max_batch_rows={self.max_batch_rows!r}, '
+            f'max_wait={self.max_wait!r})'
+        )
+
+    def submit(self, frame):
+        """
+        Score ``frame`` (blocking) and return ``(preds, timings)``.
+
+        Raises
+        ------
+        BatcherUnavailable if the batching thread is not running or the predictions
+        take longer than ``timeout`` seconds.
+        """
+        if not self._thread.is_alive():
+            raise BatcherUnavailable(f'{self} is not running.')
+        request = _Request(frame)
+        self._queue.put(request)
+        if not request.done.wait(self.timeout):
+            raise BatcherUnavailable(f'No predictions within {self.timeout}s.')
+        if request.error is not None:
+            raise request.error
+        return request.preds, request.timings
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        batch = [first]
+        rows = len(first.frame)
+        deadline = time.perf_counter() + self.max_wait
+        while rows < self.max_batch_rows:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if request is None:
+                # Put the stop signal back for the main loop
+                self._queue.put(None)
+                break
+            batch.append(request)
+            rows += len(request.frame)
+        return batch
+
+    @staticmethod
+    def _finish(request, preds, start, end, batch_rows, batch_requests):
+        request.preds = preds
+        request.timings = {
+            'queue_ms': (start - request.submitted) * 1e3,
+            'predict_ms': (end - start) * 1e3,
+            'batch_rows': batch_rows,
+            'batch_requests': batch_requests,
+        }
+        request.done.set()
+
+    def _predict_rows(self, data):
+        preds = np.asarray(self.predict(data), dtype=np.float64)
+        if preds.shape != (len(data),):
+            raise ValueError(f'predict returned {preds.shape} values for {len(data)} rows.')
+        return preds
+
+    def _predict_alone(self, request):
+        start = time.perf_counter()
+        try:
+            preds = self._predict_rows(request.frame)
+        except Exception as e:
+            request.error = e
+            request.done.set()
+            return
+        self._finish(request, preds, start, time.perf_counter(), len(request.frame), 1)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            if len(batch) == 1:
+                self._predict_alone(first)
+                continue
+
+            start = time.perf_counter()
+            try:
+                data = pd.concat([r.frame for r in batch], ignore_index=True)
+                preds = self._predict_rows(data)
+            except Exception:
+                # Don't fail every request for one bad one
+                for request in batch:
+                    self._predict_alone(request)
+                continue
+            end = time.perf_counter()
+
+            offsets = np.cumsum([0] + [len(r.frame) for r in batch])
+            for request, lo, hi in zip(batch, offsets[:-1], offsets[1:]):
+                self._finish(request, preds[lo:hi], start, end, int(offsets[-1]), len(batch))
+
+
+def parse_rows(body, content_type):
+    """
+    Parse a request body of CSV rows or JSON records
+    (a list of records or ``{"rows": [...]}``) into a DataFrame.
+    """
+    if 'csv' in (content_type or ''):
+        return pd.read_csv(io.BytesIO(body))
+    loaded = json.loads(body)
+    if isinstance(loaded, dict):
+        loaded = loaded['rows']
+    return pd.DataFrame.from_records(loaded)
+
+
+def align_rows(data, features):
+    """
+    ``data`` restricted to (and ordered as) the model's ``features``.
+
+    Raises
+    ------
+    ValueError if any of ``features`` is missing (``features=None`` returns ``data`` as is).
+    """
+    if features is None:
+        return data
+    missing = [c for c in features if c not in data.columns]
+    if missing:
+        raise ValueError(f'Missing columns {missing}. The model expects {features}.')
+    return data[features]
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        # Keep the request log quiet; latency is reported per request instead
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, {'status': 'ok', 'model': self.server.model_name})
+        elif self.path == '/metrics':
+            self._send(200, self.server.stats())
+        else:
+            self._send(404, {'error': f'Unrecognized path {self.path!r}.'})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send(404, {'error': f'Unrecognized path {self.path!r}.'})
+            return
+
+        start = time.perf_counter()
+        try:
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            data = parse_rows(body, self.headers.get('Content-Type'))
+            rows = align_rows(data, self.server.features)
+        except Exception as e:
+            self._send(400, {'error': f'{e.__class__.__name__}: {e}'})
+            return
+        try:
+            preds, timings = self.server.batcher.submit(rows)
+        except BatcherUnavailable as e:
+            self._send(503, {'error': f'{e.__class__.__name__}: {e}'})
+            return
+        except Exception as e:
+            self._send(500, {'error': f'{e.__class__.__name__}: {e}'})
+            return
+
+        latency = {**timings, 'total_ms': (time.perf_counter() - start) * 1e3}
+        self.server.record(len(data), latency['total_ms'])
+        self._send(200, {'xK%': preds.tolist(), 'rows': len(data), 'latency': latency})
+
+
+class PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, model, address=('127.0.0.1', 8000), model_name=None, **batcher_kwargs):
+        super().__init__(address, PredictionHandler)
+        self.model = model
+        self.model_name = repr(model) if model_name is None else model_name
+        # Columns the model was fit on (None when it does not record them)
+        features = getattr(model, 'feature_names_in_', None)
+        self.features = None if features is None else list(features)
+        self.batcher = MicroBatcher(model.predict, **batcher_kwargs)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._rows = 0
+        self._total_ms = 0.0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def record(self, rows, total_ms):
+        with self._lock:
+            self._requests += 1
+            self._rows += rows
+            self._total_ms += total_ms
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'rows': self._rows,
+                'mean_latency_ms': self._total_ms / self._requests if self._requests else None,
+            }
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+
+
+def load_test(url, data, n_requests=100, rows_per_request=100, concurrency=8, seed=0):
+    """
+    Fire ``n_requests`` JSON requests of ``rows_per_request`` random rows of
+    ``data`` at a running server from ``concurrency`` threads.
+
+    Returns
+    -------
+    dict with throughput (requests and rows per second) and client-side latency percentiles.
+    """
+    rng = np.random.default_rng(seed)
+    bodies = [
+        data.iloc[rng.integers(0, len(data), rows_per_request)].to_json(orient='records').encode()
+        for _ in range(n_requests)
+    ]
+
+    def post(body):
+        request = urllib.request.Request(
+            f'{url}/predict', data=body, headers={'Content-Type': 'application/json'}
+        )
+        start = time.perf_counter()
+        with urllib.request.urlopen(request) as response:
+            json.load(response)
+        return (time.perf_counter() - start) * 1e3
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = np.array(list(pool.map(post, bodies)))
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        'requests': n_requests,
+        'rows': n_requests * rows_per_request,
+        'elapsed_s': elapsed,
+        'requests_per_s': n_requests / elapsed,
+        'rows_per_s': n_requests * rows_per_request / elapsed,
+        'p50_ms': p50,
+        'p95_ms': p95,
+        'p99_ms': p99,
+    }
+
+
+def serve(model_name='linear', host='127.0.0.1', port=8000, registry=None, **batcher_kwargs):
+    registry = ModelRegistry() if registry is None else registry
+    model = registry.load(model_name)
+    server = PredictionServer(model, (host, port), model_name=model_name, **batcher_kwargs)
+    print(f'serving {model_name} on {server.url} (POST /predict, GET /health, GET /metrics)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve xK% predictions over HTTP.')
+    parser.add_argument('--model', default='linear', help='Registry name of the model.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-rows', type=int, default=10_000)
+    parser.add_argument('--max-wait', type=float, default=0.002, help='Seconds.')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Seconds per request.')
+    args = parser.parse_args(argv)
+    serve(
+        args.model,
+        args.host,
+        args.port,
+        max_batch_rows=args.max_batch_rows,
+        max_wait=args.max_wait,
+        timeout=args.timeout,
+    )
+
+
+if __name__ == '__main__':
+    main()
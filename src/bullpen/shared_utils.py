@@ -0,0 +1,98 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Segments attached by this process (kept alive so views into them stay valid)
+_ATTACHED = {}
+
+
+def attach_array(spec):
+    """
+    Attach to a shared memory block by name and return a read-only, zero-copy view.
+
+    Attachments are cached per process so a worker that handles many tasks
+    only maps each block once.
+
+    Parameters
+    ----------
+    spec : tuple of (str, tuple of int, str)
+        Shared memory block name, array shape and dtype string
+        (as stored in ``SharedArrays.specs``).
+
+    Returns
+    -------
+    numpy.ndarray backed by the shared memory block.
+    """
+    name, shape, dtype = spec
+    if name not in _ATTACHED:
+        _ATTACHED[name] = shared_memory.SharedMemory(name=name)
+    arr = np.ndarray(shape, dtype=dtype, buffer=_ATTACHED[name].buf)
+    arr.flags.writeable = False
+    return arr
+
+
+class SharedArrays:
+    """
+    Named numpy arrays copied into shared memory once.
+
+    The owning process creates the blocks and is responsible for releasing
+    them (via ``close()`` or a ``with`` block). Pickling an instance only ships
+    the block names, shapes and dtypes, so sending it to a process pool costs
+    a few bytes regardless of the array sizes; workers index it by key to get
+    zero-copy views.
+    """
+
+    def __init__(self, arrays, columns=None):
+        self.specs = {}
+        self.columns = {} if columns is None else dict(columns)
+        self._blocks = {}
+        for key, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            # Zero-sized segments are not allowed
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            self._blocks[key] = shm
+            self.specs[key] = (shm.name, arr.shape, arr.dtype.str)
+
+    def __repr__(self):
+        return f'{__class__.__name__}(keys={list(self.specs)!r})'
+
+    def __getstate__(self):
+        return {'specs': self.specs, 'columns': self.columns, '_blocks': {}}
+
+    def __getitem__(self, key):
+        if key in self._blocks:
+            name, shape, dtype = self.specs[key]
+            arr = np.ndarray(shape, dtype=dtype, buffer=self._blocks[key].buf)
+            arr.flags.writeable = False
+            return arr
+        return attach_array(self.specs[key])
+
+    def __contains__(self, key):
+        return key in self.specs
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def nbytes(self):
+        return sum(
+            int(np.prod(shape)) * np.dtype(dtype).itemsize
+            for _, shape, dtype in self.specs.values()
+        )
+
+    def close(self):
+        """
+        Release and unlink every block (owning process only).
+        """
+        for shm in self._blocks.values():
+            try:
+                shm.close()
+            except BufferError:
+                # Views still referenced in this process; the mapping goes away with them
+                pass
+            shm.unlink()
+        self._blocks = {}
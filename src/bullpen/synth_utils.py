@@ -0,0 +1,313 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bullpen.data_utils import PROVIDED_NAME_FIXES, SUPPLEMENTAL_NAME_FIXES
+
+TEAMS = [
+    'ARI', 'ATL', 'BAL', 'BOS', 'CHC', 'CHW', 'CIN', 'CLE', 'COL', 'DET',
+    'HOU', 'KCR', 'LAA', 'LAD', 'MIA', 'MIL', 'MIN', 'NYM', 'NYY', 'OAK',
+    'PHI', 'PIT', 'SDP', 'SEA', 'SFG', 'STL', 'TBR', 'TEX', 'TOR', 'WSN',
+]  # fmt: skip
+
+FIRST_NAMES = [
+    'Aaron', 'Adam', 'Alex', 'Andrew', 'Brandon', 'Brent', 'Carlos', 'Chris', 'Cody', 'Corbin',
+    'Dylan', 'Eduardo', 'Edwin', 'Eric', 'Felix', 'Frankie', 'Gerrit', 'Hunter', 'Jack', 'Jake',
+    'James', 'Jesús', 'Joe', 'Jordan', 'José', 'Josh', 'Justin', 'Kyle', 'Logan', 'Luis',
+    'Max', 'Michael', 'Nick', 'Pablo', 'Ryan', 'Sandy', 'Shane', 'Spencer', 'Tyler', 'Zack',
+]  # fmt: skip
+
+LAST_NAMES = [
+    'Alcántara', 'Anderson', 'Bieber', 'Burnes', 'Castillo', 'Cole', 'Cruz', 'Díaz', 'Fried',
+    'Gallen', 'García', 'Gray', 'Hader', 'Hernández', 'Kershaw', 'López', 'Manaea', 'Martínez',
+    'Miller', 'Musgrove', 'Nola', 'Ohtani', 'Ortiz', 'Peralta', 'Ramírez', 'Rodríguez', 'Sale',
+    'Scherzer', 'Smith', 'Snell', 'Strider', 'Suárez', 'Valdez', 'Verlander', 'Webb', 'Wheeler',
+    'Williams', 'Woodruff', 'Yamamoto', 'Zimmermann',
+]  # fmt: skip
+
+# Counting columns of supplemental-stats.csv, summed for TOT rows
+COUNT_COLUMNS = [
+    'PA', 'Pit', 'Str', 'L', 'S', 'F', 'I', 'first', 'outs', '30c', '30s',
+    '02c', '02s', '02h', 'L/SO', 'S/SO', '3pK', '4pW',
+]  # fmt: skip
+
+SUPPLEMENTAL_COLUMNS = [
+    'Rk', 'Name', 'Age', 'Tm', 'IP', 'PA', 'Pit', 'Pit/PA', 'Str', 'Str%', 'L/Str', 'S/Str',
+    'F/Str', 'I/Str', 'AS/Str', 'I/Bll', 'AS/Pit', 'Con', '1st%', '30%', '30c', '30s', '02%',
+    '02c', '02s', '02h', 'L/SO', 'S/SO', 'L/SO%', '3pK', '4pW', 'PAu', 'Pitu', 'Stru', 'Season',
+]  # fmt: skip
+
+PROVIDED_COLUMNS = ['MLBAMID', 'PlayerId', 'Name', 'Team', 'Age', 'Season', 'TBF', 'K%']
+
+
+def _ratio(num, den, decimals=3):
+    num = np.asarray(num, dtype=np.float64)
+    den = np.asarray(den, dtype=np.float64)
+    out = np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+    return out.round(decimals) if decimals is not None else out
+
+
+def _rates(counts):
+    """
+    Derived (rate) columns of supplemental-stats.csv from the counting columns,
+    following baseball-reference's definitions.
+    """
+    strikes = counts['Str']
+    swings = counts['S'] + counts['F'] + counts['I']
+    outs = counts['outs']
+    return {
+        'IP': outs // 3 + (outs % 3) / 10,
+        'Pit/PA': _ratio(counts['Pit'], counts['PA'], 2),
+        'Str%': _ratio(strikes, counts['Pit']),
+        'L/Str': _ratio(counts['L'], strikes),
+        'S/Str': _ratio(counts['S'], strikes),
+        'F/Str': _ratio(counts['F'], strikes),
+        'I/Str': _ratio(counts['I'], strikes),
+        'AS/Str': _ratio(swings, strikes),
+        'I/Bll': np.zeros(len(strikes)),
+        'AS/Pit': _ratio(swings, counts['Pit']),
+        'Con': _ratio(counts['F'] + counts['I'], swings),
+        '1st%': _ratio(counts['first'], counts['PA']),
+        '30%': _ratio(counts['30c'], counts['PA']),
+        '02%': _ratio(counts['02c'], counts['PA']),
+        'L/SO%': _ratio(counts['L/SO'], counts['L/SO'] + counts['S/SO']),
+    }
+
+
+def _name_pool():
+    """
+    Every first/last name combination except those ``data_utils.merge_data`` renames
+    (on either side), which would not merge back together.
+    """
+    reserved = {
+        name
+        for fixes in (SUPPLEMENTAL_NAME_FIXES, PROVIDED_NAME_FIXES)
+        for name in (*fixes, *fixes.values())
+    }
+    names = [f'{first} {last}' for last in LAST_NAMES for first in FIRST_NAMES]
+    return np.array([name for name in names if name not in reserved], dtype=object)
+
+
+NAME_POOL = _name_pool()
+
+
+def _names(n, offset=0):
+    """
+    Deterministic unique names (a numeric suffix is added once the pool is exhausted).
+    """
+    idx = np.arange(offset, offset + n)
+    names = pd.Series(NAME_POOL[idx % len(NAME_POOL)])
+    cycle = idx // len(NAME_POOL)
+    suffix = np.where(cycle > 0, ' ' + pd.Series(cycle + 1).astype(str), '')
+    return (names + suffix).to_numpy()
+
+
+def generate_data(
+    n_players=1_000,
+    seasons=range(2021, 2025),
+    multi_team_rate=0.1,
+    min_tbf=115,
+    seed=None,
+):
+    """
+    Generate schema-faithful synthetic ``k.csv``, ``supplemental-stats.csv`` and
+    ``player_ids.json`` data.
+
+    Every table is built with vectorized NumPy draws (no per-player Python loops):
+    each pitcher gets latent skills, a contiguous career within ``seasons`` and one
+    stint (team) per season, or 2-3 stints for ``multi_team_rate`` of player-seasons.
+    Counting stats are drawn per stint (strikes split into looking/swinging/foul/in play,
+    strikeouts consistent with the article xK% formula, ...) and every rate column is
+    derived from the counts, so e.g. L/Str + S/Str + F/Str + I/Str == 1 and
+    K% == (L/SO + S/SO) / TBF. Multi-team seasons get a 'TOT' supplemental row
+    (summed counts, recomputed rates) followed by the per-team rows, and a
+    single '- - -' row in the provided data, as in the real data.
+
+    Parameters
+    ----------
+    n_players : int, default=1_000
+        Number of distinct pitchers.
+    seasons : listlike of int, default=range(2021, 2025)
+        Contiguous seasons to generate.
+    multi_team_rate : float, default=0.1
+        Probability that a player-season is split across multiple teams.
+    min_tbf : int, default=115
+        Only player-seasons with at least this many batters faced are kept in the
+        provided (k.csv) data; the supplemental data has every player-season.
+    seed : Optional int, default=None
+        Seed for ``numpy.random.default_rng``.
+
+    Returns
+    -------
+    tuple of (provided pandas.DataFrame, supplemental pandas.DataFrame, list of dict player ids).
+    """
+    rng = np.random.default_rng(seed)
+    seasons = np.asarray(list(seasons))
+    n_seasons = len(seasons)
+
+    # Players and their latent skills
+    player_ids = np.arange(n_players) + 1_000
+    mlb_ids = rng.permutation(n_players) + 400_000
+    names = _names(n_players)
+    first_idx = rng.integers(0, n_seasons, n_players)
+    career = rng.integers(1, n_seasons + 1, n_players)
+    career = np.minimum(career, n_seasons - first_idx)
+    age0 = rng.integers(20, 36, n_players)
+    skill = {
+        'L': rng.normal(0.255, 0.03, n_players),
+        'S': rng.normal(0.185, 0.04, n_players),
+        'F': rng.normal(0.275, 0.03, n_players),
+        'pit_pa': rng.normal(3.9, 0.15, n_players),
+        'str_pct': rng.normal(0.635, 0.02, n_players),
+        'tbf': rng.lognormal(5.2, 0.8, n_players),
+    }
+
+    # Player-seasons (contiguous per player)
+    ps_player = np.repeat(np.arange(n_players), career)
+    ps_starts = np.repeat(np.cumsum(career) - career, career)
+    ps_year = first_idx[ps_player] + np.arange(len(ps_player)) - ps_starts
+    n_ps = len(ps_player)
+    ps_teams = np.where(
+        rng.random(n_ps) < multi_team_rate, rng.integers(2, 4, n_ps), np.ones(n_ps, dtype=int)
+    )
+
+    # Stints (one per player-season-team), contiguous per player-season
+    st_ps = np.repeat(np.arange(n_ps), ps_teams)
+    st_player = ps_player[st_ps]
+    n_st = len(st_ps)
+    st_offsets = np.cumsum(ps_teams) - ps_teams
+    home = rng.integers(0, len(TEAMS), n_ps)
+    # 0 < 2 * step < len(TEAMS) keeps the (up to 3) teams of a player-season distinct
+    step = rng.integers(1, len(TEAMS) // 2, n_ps)
+    st_team = (home[st_ps] + (np.arange(n_st) - st_offsets[st_ps]) * step[st_ps]) % len(TEAMS)
+
+    # Batters faced per player-season, split across its stints
+    ps_tbf = np.clip(rng.lognormal(np.log(skill['tbf'][ps_player]), 0.3), 1, 900)
+    share = rng.uniform(0.2, 1.0, n_st)
+    share /= np.add.reduceat(share, st_offsets)[st_ps]
+    pa = np.maximum(1, np.rint(ps_tbf[st_ps] * share)).astype(np.int64)
+    pit = np.maximum(pa, np.rint(pa * rng.normal(skill['pit_pa'][st_player], 0.1)))
+    pit = pit.astype(np.int64)
+    strikes = rng.binomial(pit, np.clip(rng.normal(skill['str_pct'][st_player], 0.01), 0.3, 0.9))
+    p_l = np.clip(rng.normal(skill['L'][st_player], 0.01), 0.05, 0.6)
+    p_s = np.clip(rng.normal(skill['S'][st_player], 0.01), 0.02, 0.5)
+    p_f = np.clip(rng.normal(skill['F'][st_player], 0.01), 0.05, 0.5)
+    looking = rng.binomial(strikes, p_l)
+    swinging = rng.binomial(strikes - looking, np.clip(p_s / (1 - p_l), 0, 1))
+    fouls = rng.binomial(strikes - looking - swinging, np.clip(p_f / (1 - p_l - p_s), 0, 1))
+    in_play = strikes - looking - swinging - fouls
+
+    # Strikeouts follow the article formula on the true rates (plus noise)
+    k_rate = -0.61 + 1.1538 * p_l + 1.4696 * p_s + 0.9417 * p_f + rng.normal(0, 0.02, n_st)
+    strikeouts = rng.binomial(pa, np.clip(k_rate, 0.05, 0.5))
+    so_looking = rng.binomial(strikeouts, 0.23)
+    c30 = rng.binomial(pa, 0.045)
+    c02 = rng.binomial(pa, 0.25)
+    counts = {
+        'PA': pa,
+        'Pit': pit,
+        'Str': strikes,
+        'L': looking,
+        'S': swinging,
+        'F': fouls,
+        'I': in_play,
+        'first': rng.binomial(pa, 0.6),
+        'outs': rng.binomial(pa, 0.69),
+        '30c': c30,
+        '30s': rng.binomial(c30, 0.5),
+        '02c': c02,
+        '02s': rng.binomial(c02, 0.55),
+        '02h': rng.binomial(c02, 0.07),
+        'L/SO': so_looking,
+        'S/SO': strikeouts - so_looking,
+        '3pK': rng.binomial(strikeouts, 0.2),
+        '4pW': rng.binomial(pa, 0.02),
+    }
+
+    # Player-season totals (TOT rows for multi-team seasons)
+    totals = {col: np.add.reduceat(counts[col], st_offsets) for col in COUNT_COLUMNS}
+
+    def supplemental_frame(table, player, year, team):
+        return pd.DataFrame(
+            {
+                'Name': names[player],
+                'Age': age0[player] + year,
+                'Tm': team,
+                **{col: table[col] for col in COUNT_COLUMNS},
+                **_rates(table),
+                'PAu': 0,
+                'Pitu': 0,
+                'Stru': 0,
+                'Season': seasons[year],
+                # Ordering helpers: TOT first, then teams in stint order
+                '_player': player,
+                '_order': 0,
+            }
+        )
+
+    stints = supplemental_frame(
+        counts, st_player, ps_year[st_ps], np.array(TEAMS, dtype=object)[st_team]
+    )
+    stints['_order'] = np.arange(n_st) - st_offsets[st_ps] + 1
+    multi = ps_teams > 1
+    tot = supplemental_frame(
+        {col: values[multi] for col, values in totals.items()},
+        ps_player[multi],
+        ps_year[multi],
+        'TOT',
+    )
+    supplemental = (
+        pd.concat([tot, stints], ignore_index=True)
+        .sort_values(['Season', 'Name', '_player', '_order'], kind='stable')
+        .reset_index(drop=True)
+    )
+    supplemental['Rk'] = supplemental.groupby('Season').cumcount() + 1
+    supplemental = supplemental[SUPPLEMENTAL_COLUMNS]
+
+    provided = pd.DataFrame(
+        {
+            'MLBAMID': mlb_ids[ps_player],
+            'PlayerId': player_ids[ps_player],
+            'Name': names[ps_player],
+            'Team': np.where(multi, '- - -', np.array(TEAMS, dtype=object)[st_team[st_offsets]]),
+            'Age': age0[ps_player] + ps_year,
+            'Season': seasons[ps_year],
+            'TBF': totals['PA'],
+            'K%': _ratio(totals['L/SO'] + totals['S/SO'], totals['PA'], decimals=None),
+        }
+    )
+    provided = (
+        provided.loc[provided.TBF >= min_tbf, PROVIDED_COLUMNS]
+        .sort_values(['Season', 'K%'], ascending=[False, False], kind='stable')
+        .reset_index(drop=True)
+    )
+
+    ids = pd.DataFrame({'MLBAMID': mlb_ids, 'PlayerId': player_ids, 'Name': names})
+    return provided, supplemental, ids.to_dict(orient='records')
+
+
+def write_data(outdir, **kwargs):
+    """
+    Generate synthetic data (see ``generate_data``) and write it to ``outdir`` as
+    ``k.csv``, ``supplemental-stats.csv`` and ``player_ids.json``.
+
+    Returns
+    -------
+    dict of file name to written path.
+    """
+    outdir = Path(outdir)
+    outdir.mkdir(parents=True, exist_ok=True)
+    provided, supplemental, ids = generate_data(**kwargs)
+
+    paths = {
+        'k.csv': outdir.joinpath('k.csv'),
+        'supplemental-stats.csv': outdir.joinpath('supplemental-stats.csv'),
+        'player_ids.json': outdir.joinpath('player_ids.json'),
+    }
+    provided.to_csv(paths['k.csv'], index=False)
+    supplemental.to_csv(paths['supplemental-stats.csv'], index=False)
+    with open(paths['player_ids.json'], 'w') as fp:
+        json.dump(ids, fp, default=int, ensure_ascii=False)
+    return paths
@@ -0,0 +1,246 @@
+import functools
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+
+class Span:
+    """
+    One timed section of the pipeline (see ``Tracer.span``).
+
+    ``rows`` can be set inside the ``with`` block once the number of rows
+    processed is known.
+    """
+
+    __slots__ = ('name', 'rows', 'attrs', 'start', 'wall', 'cpu', 'pid', 'tid')
+
+    def __init__(self, name, rows=None, attrs=None):
+        self.name = name
+        self.rows = rows
+        self.attrs = attrs or {}
+
+    def __repr__(self):
+        return f'{__class__.__name__}(name={self.name!r}, rows={self.rows!r})'
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'start': self.start,
+            'wall': self.wall,
+            'cpu': self.cpu,
+            'rows': self.rows,
+            'pid': self.pid,
+            'tid': self.tid,
+            **self.attrs,
+        }
+
+
+class _NoopSpan:
+    """
+    Shared stand-in returned while tracing is disabled (accepts and drops ``rows``).
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    @property
+    def rows(self):
+        return None
+
+    @rows.setter
+    def rows(self, value):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ('tracer', 'span', '_cpu')
+
+    def __init__(self, tracer, span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self):
+        self.span.start = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self.span
+
+    def __exit__(self, *exc_info):
+        span = self.span
+        span.wall = time.perf_counter() - span.start
+        span.cpu = time.thread_time() - self._cpu
+        span.pid = os.getpid()
+        span.tid = threading.get_ident()
+        self.tracer._record(span)
+        return False
+
+
+class Tracer:
+    """
+    Lightweight, optional span tracer.
+
+    Disabled by default: ``span`` then returns a shared no-op context manager,
+    so instrumented code pays one attribute check per span.
+    When enabled, each span records wall time, CPU (thread) time and rows processed.
+    Spans export as JSON, as a Chrome trace (chrome://tracing or https://ui.perfetto.dev)
+    or as an aggregated summary table.
+
+    Spans opened in a worker process land in that process's own tracer: submit the
+    task as ``in_worker(fn)`` and pass each result through ``merge_worker`` to bring
+    them back (see ``in_worker``).
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'{__class__.__name__}(enabled={self.enabled!r}, spans={len(self.spans)})'
+
+    def _record(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def span(self, name, rows=None, **attrs):
+        if not self.enabled:
+            return _NOOP
+        return _ActiveSpan(self, Span(name, rows, attrs))
+
+    def traced(self, name, rows=None):
+        """
+        Decorator tracing every call of a function as span ``name``.
+        ``rows`` is an optional callable taking the function result and returning
+        the number of rows processed (e.g. ``len``).
+        """
+
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with self.span(name) as span:
+                    result = fn(*args, **kwargs)
+                    if rows is not None:
+                        span.rows = rows(result)
+                return result
+
+            return wrapper
+
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self.spans = []
+
+    def to_json(self, path=None):
+        records = [span.to_dict() for span in self.spans]
+        if path is not None:
+            with open(path, 'w') as fp:
+                json.dump(records, fp, indent=2, default=str)
+        return records
+
+    def to_chrome_trace(self, path=None):
+        """
+        Spans as Chrome trace 'complete' events (timestamps in microseconds).
+        """
+        origin = min((span.start for span in self.spans), default=0.0)
+        events = [
+            {
+                'name': span.name,
+                'ph': 'X',
+                'ts': (span.start - origin) * 1e6,
+                'dur': span.wall * 1e6,
+                'pid': span.pid,
+                'tid': span.tid,
+                'args': {'cpu_ms': span.cpu * 1e3, 'rows': span.rows, **span.attrs},
+            }
+            for span in self.spans
+        ]
+        trace = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        if path is not None:
+            with open(path, 'w') as fp:
+                json.dump(trace, fp, default=str)
+        return trace
+
+    def summary(self):
+        """
+        Aggregated spans by name: calls, total/mean wall time, total CPU time,
+        rows and rows per second, sorted by total wall time.
+        """
+        columns = ['calls', 'wall_s', 'mean_wall_s', 'cpu_s', 'rows', 'rows_per_s']
+        if not self.spans:
+            return pd.DataFrame(columns=columns).rename_axis('name')
+        data = pd.DataFrame([span.to_dict() for span in self.spans])
+        summary = data.groupby('name').agg(
+            calls=('wall', 'size'),
+            wall_s=('wall', 'sum'),
+            mean_wall_s=('wall', 'mean'),
+            cpu_s=('cpu', 'sum'),
+            rows=('rows', lambda r: r.sum(min_count=1)),
+        )
+        summary['rows_per_s'] = summary.rows / summary.wall_s
+        return summary[columns].sort_values('wall_s', ascending=False)
+
+
+TRACER = Tracer(enabled=bool(os.environ.get('BULLPEN_TRACE')))
+span = TRACER.span
+traced = TRACER.traced
+
+
+class _InWorker:
+    def __init__(self, fn, enabled):
+        self.fn = fn
+        self.enabled = enabled
+
+    def __call__(self, *args, **kwargs):
+        TRACER.enabled = self.enabled
+        with TRACER._lock:
+            first = len(TRACER.spans)
+        try:
+            result = self.fn(*args, **kwargs)
+        finally:
+            # Workers are reused: hand this call's spans back and keep none
+            with TRACER._lock:
+                spans = TRACER.spans[first:]
+                del TRACER.spans[first:]
+        return result, spans
+
+
+def in_worker(fn):
+    """
+    ``fn`` wrapped for ``ProcessPoolExecutor.submit``/``map``: it runs with the
+    calling process's tracing setting and returns ``(result, spans)``, the spans
+    opened during the call (perf_counter timestamps are system-wide, so they line
+    up with the parent's). Unwrap each result with ``merge_worker``.
+    """
+    return _InWorker(fn, TRACER.enabled)
+
+
+def merge_worker(output):
+    """
+    Record the spans of an ``in_worker`` call in ``TRACER`` and return its result.
+    """
+    result, spans = output
+    if spans:
+        with TRACER._lock:
+            TRACER.spans.extend(spans)
+    return result
+
+
+def enable():
+    TRACER.enabled = True
+
+
+def disable():
+    TRACER.enabled = False
@@ -0,0 +1,157 @@
+"""
+Incremental new-season update of data, features and models.
+
+Instead of re-scraping every year, re-running ``load_data`` on everything and
+retraining from scratch, ``update_season`` only touches the new season:
+
+    1. scrape the new season and append it to ``supplemental-stats.csv``
+    2. merge only the new season's provided rows against its supplemental rows
+    3. recompute history features only for players who pitched in the new season
+    4. update models incrementally (``partial_fit`` or xgboost warm start)
+
+and reports how much work that avoided compared with a full rebuild.
+"""
+
+import time
+
+import pandas as pd
+from sklearn.pipeline import Pipeline
+
+from bullpen.cv_utils import pred_X_y
+from bullpen.data_utils import DATA_DIR, Scraper, merge_data
+from bullpen.model_utils import warm_start_xgboost
+from bullpen.schema_utils import MERGED_SCHEMA
+
+
+def append_season(supplemental_path, season, scraped):
+    """
+    Replace ``season``'s rows of the supplemental csv with ``scraped``.
+
+    Returns
+    -------
+    pandas.DataFrame of the season's rows as read back from the csv (numeric dtypes).
+    """
+    existing = pd.read_csv(supplemental_path)
+    existing = existing[existing.Season != season]
+    pd.concat([existing, scraped], ignore_index=True).to_csv(supplemental_path, index=False)
+    supplemental = pd.read_csv(supplemental_path)
+    return supplemental[supplemental.Season == season].reset_index(drop=True)
+
+
+def update_model(model, X, y, n_estimators=25):
+    """
+    Incrementally update ``model`` with new rows.
+
+    Returns
+    -------
+    tuple of (updated model, str method) where method is 'partial_fit', 'warm_start'
+    or 'skipped' (the model has no incremental update).
+    """
+    if hasattr(model, 'partial_fit'):
+        return model.partial_fit(X, y), 'partial_fit'
+    if isinstance(model, Pipeline):
+        regressor = model.named_steps['regressor']
+        regressor = getattr(regressor, 'best_estimator_', regressor)
+        if hasattr(regressor, 'get_booster'):
+            return warm_start_xgboost(model, X, y, n_estimators=n_estimators), 'warm_start'
+    return model, 'skipped'
+
+
+def update_season(
+    season,
+    merged=None,
+    provided_path=str(DATA_DIR.joinpath('k.csv').resolve()),
+    supplemental_path=str(DATA_DIR.joinpath('supplemental-stats.csv').resolve()),
+    scraped=None,
+    store=None,
+    models=None,
+    train_players=None,
+    n_estimators=25,
+):
+    """
+    Fold a new season into the merged data, features and models.
+
+    Parameters
+    ----------
+    season : int
+        The new season (its rows must already be in the provided ``k.csv``).
+    merged : Optional pandas.DataFrame, default=None
+        Merged data of the previous seasons (``load_data`` output); merged from the
+        csvs (without the rows of ``season``) when None.
+    provided_path, supplemental_path : str
+        See ``load_data``. The supplemental csv is updated in place.
+    scraped : Optional pandas.DataFrame, default=None
+        The season's scraped supplemental rows; scraped from baseball-reference when None.
+    store : Optional feature_utils.FeatureStore, default=None
+        Built feature store to update for the affected players; its features are
+        appended to the rows the models are updated with.
+    models : Optional dict of str to fitted model, default=None
+        Models to update in place of a retrain (see ``update_model``).
+    train_players : Optional listlike of PlayerId, default=None
+        Only these players' new rows are used to update models (e.g. the training fold).
+    n_estimators : int, default=25
+        Trees added to xgboost models.
+
+    Returns
+    -------
+    tuple of (merged data, updated models, report dict).
+    """
+    start = time.perf_counter()
+    if merged is None:
+        # k.csv already holds the new season, the supplemental csv does not yet
+        provided = pd.read_csv(provided_path)
+        merged = merge_data(
+            provided[provided.Season != season].reset_index(drop=True),
+            pd.read_csv(supplemental_path),
+        )
+        MERGED_SCHEMA.check(merged)
+    merged = merged[merged.Season != season]
+
+    if scraped is None:
+        scraped = Scraper(season).scrape()
+    supplemental_new = append_season(supplemental_path, season, scraped)
+
+    provided = pd.read_csv(provided_path)
+    provided_new = provided[provided.Season == season].reset_index(drop=True)
+    merged_new = merge_data(provided_new, supplemental_new)
+    merged = pd.concat([merged, merged_new], ignore_index=True).sort_values(
+        ['Name', 'Season', 'Team']
+    )
+
+    report = {
+        'season': season,
+        'seasons_scraped': 1,
+        'seasons_total': merged.Season.nunique(),
+        'rows_merged': len(merged_new),
+        'rows_total': len(merged),
+    }
+
+    if store is not None:
+        report['feature_rows_computed'] = store.update(merged, merged_new)
+        report['feature_rows_total'] = len(store.table_)
+
+    updated = {}
+    fit_rows = merged_new
+    if train_players is not None:
+        fit_rows = merged_new[merged_new.PlayerId.isin(train_players)]
+    X_new, y_new = pred_X_y(fit_rows)
+    if store is not None:
+        X_new = store.augment(X_new)
+    for name, model in (models or {}).items():
+        updated[name], method = update_model(model, X_new, y_new, n_estimators=n_estimators)
+        report[f'{name}_update'] = method
+    report['model_rows_fit'] = len(fit_rows) if models else 0
+    report['seconds'] = time.perf_counter() - start
+
+    print(
+        f'{season}: scraped 1/{report["seasons_total"]} seasons, '
+        f'merged {report["rows_merged"]}/{report["rows_total"]} rows'
+        + (
+            f', recomputed {report["feature_rows_computed"]}/{report["feature_rows_total"]} '
+            'feature rows'
+            if store is not None
+            else ''
+        )
+        + f' in {report["seconds"]:.2f}s'
+    )
+    return merged, updated, report
@@ -1,5 +1,83 @@
-from bullpen import cv_utils
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from sklearn.linear_model import LinearRegression
+
+from bullpen import cv_utils, trace_utils
+from bullpen.data_utils import DATA_DIR
+from bullpen.model_utils import make_processing_pipeline
 
 
 def test_cv_utils():
     assert hasattr(cv_utils, 'make_timeseries_splits')
+
+
+def test_cross_validate_model_shared():
+    train_df = pd.read_csv(DATA_DIR.joinpath('train.csv'))
+    splits = cv_utils.make_timeseries_splits(train_df.Season.unique().tolist(), train_df)
+    features = ['Pit/PA', 'Str%', 'F/Str', 'I/Str', 'Con', '30%', 'L/SO']
+    processor = make_processing_pipeline(numeric_features=features)
+    param_grid = {'fit_intercept': [True, False]}
+
+    with cv_utils.share_splits(splits) as shared:
+        X_df, y_df = cv_utils.attach_split(shared, 'val', 0)
+        expected_X, expected_y = cv_utils.pred_X_y(splits['val'][0])
+        assert np.allclose(X_df[features], expected_X[features])
+        assert np.allclose(y_df, expected_y)
+
+        results, best = cv_utils.cross_validate_model_shared(
+            LinearRegression, param_grid, shared, processor, n_jobs=2
+        )
+        del X_df, y_df
+
+    expected_results, expected_best = cv_utils.cross_validate_model(
+        LinearRegression, param_grid, splits, processor
+    )
+    assert best == pytest.approx(expected_best)
+    assert len(results) == len(expected_results)
+
+
+def test_cross_validate_model_shared_traced():
+    train_df = pd.read_csv(DATA_DIR.joinpath('train.csv'))
+    splits = cv_utils.make_timeseries_splits(train_df.Season.unique().tolist(), train_df)
+    processor = make_processing_pipeline(numeric_features=['Pit/PA', 'Str%', 'Con'])
+
+    trace_utils.enable()
+    try:
+        trace_utils.TRACER.reset()
+        with cv_utils.share_splits(splits) as shared:
+            cv_utils.cross_validate_model_shared(
+                LinearRegression, {'fit_intercept': [True, False]}, shared, processor, n_jobs=2
+            )
+        spans = [span for span in trace_utils.TRACER.spans if span.name == 'fit']
+    finally:
+        trace_utils.disable()
+        trace_utils.TRACER.reset()
+    # One fit per (parameters, split), recorded in the workers
+    assert len(spans) == 4
+    assert all(span.pid != os.getpid() for span in spans)
+
+
+def test_cross_validate_xgboost_matches_sklearn_wrapper():
+    train_df = pd.read_csv(DATA_DIR.joinpath('train.csv'))
+    splits = cv_utils.make_timeseries_splits(train_df.Season.unique().tolist(), train_df)
+    X_df, _ = cv_utils.pred_X_y(splits['train'][0])
+    processor = make_processing_pipeline(
+        categorical_features=['Team'],
+        numeric_features=[f for f in X_df.columns if f != 'Team'],
+    )
+    param_grid = {'n_estimators': [10, 20], 'max_depth': [3, 5]}
+
+    results, best = cv_utils.cross_validate_xgboost(param_grid, splits, processor, nthread=1)
+
+    def model(**params):
+        return xgb.XGBRegressor(tree_method='hist', n_jobs=1, **params)
+
+    expected_results, expected_best = cv_utils.cross_validate_model(
+        model, param_grid, splits, processor
+    )
+    assert results == pytest.approx(expected_results)
+    assert best == pytest.approx(expected_best)
@@ -6,7 +6,20 @@ import pandas as pd
 import pytest
 import responses
 
-from bullpen.data_utils import PlayerLookup, Scraper, batch_scrape, load_data
+from bullpen.data_utils import (
+    DATA_DIR,
+    PlayerIndex,
+    PlayerLookup,
+    Scraper,
+    aggregate_pitches,
+    batch_scrape,
+    fingerprint_data,
+    load_data,
+    partition_players,
+    read_partition,
+    save_partition,
+    select_fold,
+)
 
 
 class TestScraper:
@@ -1150,6 +1163,13 @@ class TestPlayerLookup:
         assert lookup.get_name_from_id(54321, source='mlb') == 'John Doe'
         assert lookup.get_name_from_id(98765, source='fangraphs') == 'John Doe'
 
+    def test_get_names_from_ids(self, lookup):
+        names = lookup.get_names_from_ids([54321, 12345, 999])
+        assert names[:2].tolist() == ['John Doe', 'Edwin Díaz']
+        assert pd.isna(names[2])
+        names = lookup.get_names_from_ids([67890, 27589], source='fangraphs')
+        assert names.tolist() == ['Edwin Díaz', 'Jackmerius Tacktheratrix']
+
     def test_get_id(self, lookup):
         assert lookup.get_id_from_name('Edwin Díaz') == 12345
         assert lookup.get_id_from_name('Edwin Díaz', source='mlb') == 12345
@@ -1170,3 +1190,207 @@ class TestPlayerLookup:
         expected = pd.DataFrame(mock_data)
         expected = expected.loc[expected.Name == name, ['Name', 'MLBAMID']].reset_index(drop=True)
         assert lookup.get_id_from_name(name).equals(expected)
+
+
+def test_fingerprint_data():
+    data = pd.DataFrame({'PlayerId': [1, 2], 'K%': [0.2, 0.3]})
+    assert fingerprint_data(data) == fingerprint_data(data.copy())
+    assert fingerprint_data(data) != fingerprint_data(data.assign(**{'K%': [0.2, 0.31]}))
+    assert fingerprint_data(data) != fingerprint_data(data.astype({'PlayerId': float}))
+
+
+class TestPartitionPlayers:
+    @pytest.fixture
+    def data(self):
+        rng = np.random.default_rng(0)
+        seasons_played = rng.integers(1, 5, 2_000)
+        return pd.DataFrame(
+            {
+                'PlayerId': np.repeat(np.arange(2_000) * 7, seasons_played),
+                'Season': np.concatenate([2024 - np.arange(n) for n in seasons_played]),
+            }
+        )
+
+    def test_group_aware(self, data):
+        folds = partition_players(data, train_frac=0.7, seed=1)
+        assert folds.index.name == 'PlayerId'
+        assert folds.index.is_unique and len(folds) == 2_000
+        assert (folds == 'train').sum() == 1_400
+        train, test = select_fold(data, folds, 'train'), select_fold(data, folds, 'test')
+        assert len(train) + len(test) == len(data)
+        assert set(train.PlayerId).isdisjoint(test.PlayerId)
+        pd.testing.assert_series_equal(folds, partition_players(data, train_frac=0.7, seed=1))
+        assert not folds.equals(partition_players(data, train_frac=0.7, seed=2))
+
+    def test_stratified(self, data):
+        folds = partition_players(data, train_frac=0.7, seed=1, stratify=True)
+        played = data.groupby('PlayerId').size()
+        share = (folds == 'train').groupby(played.reindex(folds.index)).mean()
+        np.testing.assert_allclose(share, 0.7, atol=0.002)
+
+    def test_notebook_split(self):
+        data = load_data()
+        folds = partition_players(data, seed=53, key='Name')
+        train = select_fold(data, folds, 'train')
+        expected = pd.read_csv(DATA_DIR.joinpath('train.csv'))
+        assert set(train[train.Season != 2024].Name) == set(expected.Name)
+
+    def test_save_read(self, data, tmp_path):
+        folds = partition_players(data, seed=1, stratify=True)
+        save_partition(folds, tmp_path.joinpath('folds.csv'))
+        pd.testing.assert_series_equal(
+            read_partition(tmp_path.joinpath('folds.csv')), folds, check_dtype=False
+        )
+
+
+class TestPlayerIndex:
+    @pytest.fixture
+    def data(self):
+        return pd.DataFrame(
+            {
+                'PlayerId': [2, 1, 2, 1, 3],
+                'MLBAMID': [20, 10, 20, 10, 30],
+                'Name': ['B', 'A', 'B', 'A', 'C'],
+                'Season': [2022, 2023, 2021, 2021, 2022],
+                'K%': [0.2, 0.3, 0.1, 0.25, 0.15],
+            }
+        )
+
+    def test_offsets(self, data):
+        index = PlayerIndex(data)
+        assert index.ids.tolist() == [1, 2, 3]
+        assert index.offsets.tolist() == [0, 2, 4, 5]
+        assert len(index) == 3
+        assert 2 in index
+
+    def test_history(self, data):
+        index = PlayerIndex(data)
+        history = index.history(2)
+        assert history.Season.tolist() == [2021, 2022]
+        assert history['K%'].tolist() == [0.1, 0.2]
+        assert index.arrays(1, ['Season'])['Season'].tolist() == [2021, 2023]
+        assert index.find('C') == [3]
+        assert index.find('Z') == []
+
+    def test_reduce(self, data):
+        index = PlayerIndex(data)
+        assert np.allclose(index.mean('K%'), [0.275, 0.15, 0.15])
+        assert index.reduce('Season', np.maximum).tolist() == [2023, 2022, 2022]
+
+    def test_from_predictions(self, data):
+        lookup = PlayerLookup()
+        X_df = data.drop(columns=['K%', 'Name'])
+        with patch.object(lookup, 'get_names_from_ids', return_value=data.Name.to_numpy()):
+            index = PlayerIndex.from_predictions(X_df, data['K%'], data['K%'] + 0.01, lookup)
+        assert index.find('A') == [1]
+        assert np.allclose(index.arrays(3)['xK%'], [0.16])
+
+
+class TestAggregatePitches:
+    @pytest.fixture
+    def pitches(self):
+        # (game_pk, at_bat_number, pitcher, inning_topbot, pitch descriptions, event)
+        plate_appearances = [
+            (1, 1, 1, 'Top', ['called_strike', 'foul', 'swinging_strike'], 'strikeout'),
+            (1, 2, 1, 'Top', ['ball', 'ball', 'ball', 'ball'], 'walk'),
+            (1, 3, 1, 'Top', ['called_strike'] * 2 + ['foul', 'called_strike'], 'strikeout'),
+            (1, 4, 2, 'Bot', ['swinging_strike', 'hit_into_play'], 'field_out'),
+            (2, 1, 1, 'Bot', ['hit_into_play'], 'single'),
+        ]
+        rows = []
+        for game_pk, at_bat, pitcher, half, descriptions, event in plate_appearances:
+            balls = strikes = 0
+            for i, description in enumerate(descriptions):
+                rows.append(
+                    {
+                        'pitcher': pitcher,
+                        'player_name': {1: 'Doe, John', 2: 'Smith, Al'}[pitcher],
+                        'game_year': 2024,
+                        'game_pk': game_pk,
+                        'at_bat_number': at_bat,
+                        'pitch_number': i + 1,
+                        'balls': balls,
+                        'strikes': strikes,
+                        'description': description,
+                        'events': event if i == len(descriptions) - 1 else None,
+                        'home_team': 'NYY',
+                        'away_team': 'BOS',
+                        'inning_topbot': half,
+                        'age_pit': 30,
+                    }
+                )
+                if description == 'ball':
+                    balls += 1
+                elif strikes < 2:
+                    strikes += 1
+        return pd.DataFrame(rows)
+
+    def test_counts(self, pitches, tmp_path):
+        pitches.to_csv(tmp_path.joinpath('pitches.csv'), index=False)
+        data = aggregate_pitches(tmp_path.joinpath('pitches.csv'))
+
+        expected_columns = pd.read_csv(DATA_DIR.joinpath('supplemental-stats.csv'), nrows=1)
+        assert data.columns.tolist() == expected_columns.columns.tolist()
+        assert data.Name.tolist() == ['Al Smith', 'John Doe', 'John Doe', 'John Doe']
+        assert data.Tm.tolist() == ['BOS', 'TOT', 'BOS', 'NYY']
+        assert data.Rk.tolist() == [1, 2, 3, 4]
+
+        total = data.iloc[1]
+        assert (total.PA, total.Pit, total.Str, total.IP) == (4, 12, 8, 0.2)
+        assert total['L/Str'] == pytest.approx(0.5)
+        assert total['1st%'] == pytest.approx(0.75)
+        assert (total['30c'], total['30s'], total['02c'], total['02s'], total['02h']) == (
+            1,
+            0,
+            2,
+            2,
+            0,
+        )
+        assert (total['L/SO'], total['S/SO'], total['3pK'], total['4pW']) == (1, 1, 1, 1)
+        assert total.Age == 30
+
+    def test_statcast_teams_load(self, pitches, tmp_path):
+        # Statcast codes (SD, KC) are mapped to the k.csv ones so the rows merge
+        pitches = pitches.assign(home_team='SD', away_team='KC')
+        # A ball for Al Smith, so his I/Bll is defined
+        pitches.loc[(pitches.pitcher == 2) & (pitches.pitch_number == 1), 'description'] = 'ball'
+        pitches.to_csv(tmp_path.joinpath('pitches.csv'), index=False)
+        supplemental = aggregate_pitches(tmp_path.joinpath('pitches.csv'))
+        assert supplemental.Tm.tolist() == ['KCR', 'TOT', 'KCR', 'SDP']
+        supplemental.to_csv(tmp_path.joinpath('supplemental-stats.csv'), index=False)
+
+        # k.csv has the combined row ('- - -') of a multi-team season only
+        rows = supplemental[~supplemental.duplicated(['Name', 'Season'], keep='first')]
+        provided = pd.DataFrame(
+            {
+                'MLBAMID': [2, 1],
+                'PlayerId': [20, 10],
+                'Name': rows.Name.to_numpy(),
+                'Team': rows.Tm.replace('TOT', '- - -').to_numpy(),
+                'Age': 30,
+                'Season': 2024,
+                'TBF': rows.PA.to_numpy(),
+                'K%': ((rows['L/SO'] + rows['S/SO']) / rows.PA).to_numpy(),
+            }
+        )
+        provided.to_csv(tmp_path.joinpath('k.csv'), index=False)
+        merged = load_data(tmp_path.joinpath('k.csv'), tmp_path.joinpath('supplemental-stats.csv'))
+        assert merged.Team.tolist() == ['KCR', '- - -']
+        assert merged.Pit.tolist() == [2, 12]
+
+    def test_descending_order(self, pitches, tmp_path):
+        # Statcast CSV exports list the newest pitch first
+        pitches.iloc[::-1].to_csv(tmp_path.joinpath('descending.csv'), index=False)
+        pitches.to_csv(tmp_path.joinpath('ascending.csv'), index=False)
+        descending = aggregate_pitches(tmp_path.joinpath('descending.csv'), chunksize=3)
+        pd.testing.assert_frame_equal(
+            descending, aggregate_pitches(tmp_path.joinpath('ascending.csv')), check_dtype=False
+        )
+        assert (descending.iloc[1]['L/SO'], descending.iloc[1]['S/SO']) == (1, 1)
+
+    def test_chunk_boundaries(self, pitches, tmp_path):
+        path = tmp_path.joinpath('pitches.csv')
+        pitches.to_csv(path, index=False)
+        pd.testing.assert_frame_equal(
+            aggregate_pitches([path], chunksize=3), aggregate_pitches(path), check_dtype=False
+        )
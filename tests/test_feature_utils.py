@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from bullpen import feature_utils
+from bullpen.cv_utils import pred_X_y
+from bullpen.data_utils import DATA_DIR
+from bullpen.model_utils import make_processing_pipeline, train_model
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame(
+        {
+            'PlayerId': [1, 1, 1, 1, 1, 2, 2, 2],
+            'Team': ['NYY', 'NYY', '- - -', 'NYY', 'BOS', 'ATL', 'ATL', 'ATL'],
+            'Season': [2020, 2021, 2022, 2023, 2023, 2020, 2021, 2023],
+            'TBF': [100, 300, 400, 100, 300, 200, 200, 200],
+            'K%': [0.1, 0.2, 0.3, 0.2, 0.4, 0.25, 0.15, 0.3],
+        }
+    )
+
+
+def test_player_seasons_multi_team(data):
+    seasons = feature_utils.player_seasons(data, ['K%'])
+    assert seasons.PlayerId.tolist() == [1, 1, 1, 1, 2, 2, 2]
+    assert seasons.Season.tolist() == [2020, 2021, 2022, 2023, 2020, 2021, 2023]
+    # 2023 stints without a combined row: TBF-weighted
+    assert seasons['K%'].iloc[3] == pytest.approx(0.35)
+    assert seasons.TBF.iloc[3] == 400
+
+
+def test_compute(data):
+    store = feature_utils.FeatureStore(columns=['K%'], lags=[1, 2], windows=[2], alphas=[0.5])
+    features = store.compute(data)
+    assert features.columns.tolist() == store.feature_names
+
+    player = features.loc[1]
+    np.testing.assert_allclose(player['K%_lag1'], [np.nan, 0.1, 0.2, 0.3])
+    np.testing.assert_allclose(player['K%_lag2'], [np.nan, np.nan, 0.1, 0.2])
+    np.testing.assert_allclose(player['K%_delta'], [np.nan, np.nan, 0.1, 0.1])
+    roll = [np.nan, 0.1, (0.1 * 100 + 0.2 * 300) / 400, (0.2 * 300 + 0.3 * 400) / 700]
+    np.testing.assert_allclose(player['K%_roll2'], roll)
+    ewm = (0.3 * 400 + 0.5 * 0.2 * 300 + 0.25 * 0.1 * 100) / (400 + 0.5 * 300 + 0.25 * 100)
+    assert player['K%_ewm0.5'].iloc[3] == pytest.approx(ewm)
+    np.testing.assert_allclose(player['n_prior'], [0, 1, 2, 3])
+
+    # Player 2 skipped 2022
+    np.testing.assert_allclose(features.loc[2, 'gap'], [np.nan, 1, 2])
+    np.testing.assert_allclose(features.loc[2, 'K%_lag1'], [np.nan, 0.25, 0.15])
+
+
+def test_ewm_mean_long_history_ahead():
+    # A 16-season player ahead of a short one must not leak scale into the next player
+    values = np.concatenate([np.linspace(0.1, 0.4, 16), [0.1, 0.3, 0.2]])
+    positions = np.concatenate([np.arange(16), np.arange(3)])
+    ewm = feature_utils.ewm_mean(values, positions, alpha=0.9)
+    expected = (0.3 + 0.1 * 0.1) / (1 + 0.1)
+    np.testing.assert_allclose(ewm[16:], [np.nan, 0.1, expected])
+
+    previous = pd.Series(values[:16]).shift()
+    expected = previous.ewm(alpha=0.9, adjust=True).mean()
+    np.testing.assert_allclose(ewm[:16], expected)
+
+
+def test_compute_matches_groupby():
+    data = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+    features = feature_utils.FeatureStore(columns=['K%', 'Con']).compute(data)
+    expected = data.sort_values(['PlayerId', 'Season']).groupby('PlayerId')[['K%', 'Con']].shift(1)
+    np.testing.assert_allclose(features[['K%_lag1', 'Con_lag1']], expected)
+
+
+def test_build_persists_and_augments(data, tmp_path):
+    store = feature_utils.FeatureStore(columns=['K%'], store_dir=tmp_path)
+    with pytest.raises(ValueError):
+        store.augment(data)
+
+    store.build(data)
+    path = store.path(data)
+    assert path.exists()
+    assert list(tmp_path.iterdir()) == [path]
+    # Same data: reused from disk; changed data: new fingerprint
+    assert (
+        feature_utils.FeatureStore(columns=['K%'], store_dir=tmp_path)
+        .build(data)
+        .table_.equals(store.table_)
+    )
+    assert store.path(data.assign(**{'K%': data['K%'] + 0.01})) != path
+
+    augmented = store.augment(data)
+    assert augmented.columns.tolist() == data.columns.tolist() + store.feature_names
+    assert not augmented[store.feature_names].isna().any().any()
+    assert augmented['K%_lag1'].iloc[1] == pytest.approx(0.1)
+
+
+def test_fill_values_use_prior_seasons(data, tmp_path):
+    store = feature_utils.FeatureStore(columns=['K%'], store_dir=tmp_path).build(data)
+    # A new player's first 2022 season is filled from the 2020-2021 rows only
+    new = pd.DataFrame({'PlayerId': [3, 3], 'Season': [2020, 2022]})
+    augmented = store.augment(new)
+    prior = store.table_[store.table_.index.get_level_values('Season') < 2022]
+    assert augmented['K%_lag1'].iloc[1] == pytest.approx(prior['K%_lag1'].mean())
+    assert augmented['K%_lag1'].iloc[0] == 0.0
+    assert augmented['gap'].tolist() == [0.0, 0.0]
+
+    # Changing later seasons does not change the fills of earlier ones
+    later = data.assign(**{'K%': data['K%'].where(data.Season < 2022, 0.9)})
+    relabeled = feature_utils.FeatureStore(columns=['K%'], store_dir=tmp_path).build(later)
+    pd.testing.assert_frame_equal(relabeled.augment(new), augmented)
+
+
+def test_train_model_with_features(tmp_path):
+    train = pd.read_csv(DATA_DIR.joinpath('train.csv'))
+    store = feature_utils.FeatureStore(store_dir=tmp_path).build(train)
+    X_df, y_df = pred_X_y(train)
+    numeric = ['Str%', 'S/Str'] + store.feature_names
+    processor = make_processing_pipeline(numeric_features=numeric)
+    _, results = train_model(
+        processor, LinearRegression(), X_df, y_df, results={}, name='lr', features=store
+    )
+    _, baseline = train_model(
+        make_processing_pipeline(numeric_features=['Str%', 'S/Str']),
+        LinearRegression(),
+        X_df,
+        y_df,
+        results={},
+        name='lr',
+    )
+    # Prior-season K% adds signal on top of same-season rates
+    assert results['lr'][0] > baseline['lr'][0]
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from bullpen import inseason_utils
+from bullpen.inseason_utils import COUNT_COLUMNS, RollingWindow
+
+
+@pytest.fixture
+def games():
+    rng = np.random.default_rng(0)
+    n = 600
+    data = pd.DataFrame(
+        {
+            'Date': pd.Timestamp('2024-04-01') + pd.to_timedelta(rng.integers(0, 60, n), 'D'),
+            'PlayerId': rng.integers(0, 40, n),
+            'Team': 'NYY',
+        }
+    )
+    data['Name'] = 'Pitcher ' + data.PlayerId.astype(str)
+    counts = rng.integers(1, 30, (n, len(COUNT_COLUMNS)))
+    data[COUNT_COLUMNS] = counts
+    return data.sort_values('Date', kind='stable').reset_index(drop=True)
+
+
+def brute_force(games, asof, days=None, batters=None):
+    games = games[games.Date <= asof]
+    if days is not None:
+        window = games[games.Date > asof - pd.Timedelta(days, 'D')]
+        return window.groupby('PlayerId')[COUNT_COLUMNS].sum()
+
+    sums = {}
+    for player_id, history in games.groupby('PlayerId'):
+        # Most recent games while the older ones are not needed to cover `batters`
+        history = history.iloc[::-1]
+        covered = history.PA.cumsum().shift(fill_value=0)
+        sums[player_id] = history[covered < batters][COUNT_COLUMNS].sum()
+    return pd.DataFrame(sums).T.rename_axis('PlayerId')
+
+
+@pytest.mark.parametrize('window', [{'days': 14}, {'batters': 60}])
+def test_rolling_window_matches_recomputation(games, window):
+    rolling = RollingWindow(**window)
+    for date, day in games.groupby('Date'):
+        rolling.update(day)
+        if date.day % 10 == 0:
+            expected = brute_force(games, date, **window)
+            expected = expected[expected.PA > 0]
+            actual = rolling.sums()[COUNT_COLUMNS]
+            pd.testing.assert_frame_equal(
+                actual.sort_index(), expected.sort_index().astype(float), check_names=False
+            )
+
+    # Games that left every window are dropped from the store
+    assert rolling.n_games < len(games) / 2
+
+    with pytest.raises(ValueError):
+        rolling.update(games.iloc[:1])
+
+
+def test_days_window_expires(games):
+    rolling = RollingWindow(days=7).update(games[games.Date < '2024-04-10'])
+    assert len(rolling.sums()) > 0
+    rolling.update(games.iloc[:0], asof='2024-05-31')
+    assert len(rolling.sums()) == 0
+
+
+def test_score(games):
+    rolling = RollingWindow(days=30).update(games)
+    scored = rolling.score()
+    sums = rolling.sums()
+    expected = (
+        -0.61
+        + sums.called / sums.Str * 1.1538
+        + sums.swinging / sums.Str * 1.4696
+        + sums.foul / sums.Str * 0.9417
+    )
+    np.testing.assert_allclose(scored['xK%'], expected)
+    assert (scored.Date == pd.Timestamp('2024-05-30')).all()
+    assert scored.Name.str.startswith('Pitcher').all()
+
+
+def test_score_model_rates_only(games):
+    rolling = RollingWindow(days=30).update(games)
+    features = rolling.features()
+    rates = LinearRegression().fit(features[['L/Str', 'S/Str']], features['K%'])
+    scored = rolling.score(rates)
+    np.testing.assert_allclose(scored['xK%'], rates.predict(features[['L/Str', 'S/Str']]))
+
+    # Window totals are not the season totals a model is trained on
+    totals = LinearRegression().fit(features[['L/Str', 'L/SO']], features['K%'])
+    with pytest.raises(ValueError, match='L/SO'):
+        rolling.score(totals)
+
+
+def test_read_game_logs(games, tmp_path):
+    games.to_csv(tmp_path.joinpath('games.csv'), index=False)
+    read = inseason_utils.read_game_logs(str(tmp_path.joinpath('games.csv')), since='2024-05-01')
+    assert read.Date.min() > pd.Timestamp('2024-05-01')
+    assert read.Date.is_monotonic_increasing
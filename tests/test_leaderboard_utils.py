@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error
+
+from bullpen import cv_utils, leaderboard_utils
+from bullpen.data_utils import DATA_DIR
+from bullpen.model_utils import ArticleModel, make_processing_pipeline
+from bullpen.pipeline_utils import LASSO_FEATURES
+
+
+@pytest.fixture(scope='module')
+def splits():
+    train_df = pd.read_csv(DATA_DIR.joinpath('train.csv'))
+    return cv_utils.make_timeseries_splits(sorted(train_df.Season.unique()), train_df)
+
+
+def test_run_leaderboard(splits):
+    families = ['baseline-last', 'article', 'linear']
+    leaderboard, results = leaderboard_utils.run_leaderboard(splits, families, n_jobs=2)
+    assert sorted(leaderboard.index) == sorted(families)
+    assert leaderboard.val_mse.is_monotonic_increasing
+    assert len(results) == len(families) * len(splits['train'])
+    assert (results[['fit_seconds', 'predict_us_per_row']] > 0).all().all()
+
+    # Scored on validation players seen in training, same as fitting directly
+    train, val = splits['train'][1], splits['val'][1]
+    X_df, y_df = cv_utils.pred_X_y(train)
+    X_val, y_val = cv_utils.pred_X_y(val[val.PlayerId.isin(train.PlayerId)])
+    processor = make_processing_pipeline(numeric_features=LASSO_FEATURES)
+    linear = processor.fit(X_df)
+    preds = LinearRegression().fit(linear.transform(X_df), y_df).predict(linear.transform(X_val))
+    scored = results.set_index(['family', 'split'])
+    assert scored.loc[('linear', 1), 'val_mse'] == pytest.approx(mean_squared_error(y_val, preds))
+    assert scored.loc[('article', 1), 'val_mse'] == pytest.approx(
+        mean_squared_error(y_val, ArticleModel().fit(X_val, None).predict(X_val))
+    )
+    assert scored.loc[('baseline-last', 1), 'val_rows'] == len(y_val)
+
+    by_score, _ = leaderboard_utils.run_leaderboard(
+        splits, ['article', 'linear'], n_jobs=2, sort_by='val_score'
+    )
+    assert np.all(np.diff(by_score.val_score) <= 0)
+
+
+def test_register_family():
+    with pytest.raises(ValueError):
+        leaderboard_utils.register_family('ridge', LinearRegression(), processor='unknown')
@@ -1,5 +1,246 @@
-from bullpen import model_utils
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+
+from bullpen import data_utils, model_utils
+from bullpen.data_utils import DATA_DIR
 
 
 def test_model_utils():
     assert model_utils.MODEL_DIR.exists()
+
+
+def test_fold_linear_pipeline_shipped_model():
+    reg = joblib.load(model_utils.MODEL_DIR.joinpath('linear.joblib'))
+    test_df = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+
+    scorer = model_utils.fold_linear_pipeline(reg)
+    assert np.allclose(scorer.predict(test_df), reg.predict(test_df), rtol=0, atol=1e-12)
+
+
+def test_fold_linear_pipeline_with_teams():
+    train_df = pd.read_csv(DATA_DIR.joinpath('train.csv'))
+    test_df = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+    test_df.loc[test_df.index[:3], 'Team'] = 'NEW'  # unseen team -> all-zero one-hot
+    features = ['Pit/PA', 'Str%', 'F/Str', 'I/Str', 'Con', '30%', 'L/SO']
+    processor = model_utils.make_processing_pipeline(
+        categorical_features=['Team'], numeric_features=features
+    )
+    reg = Pipeline(steps=[('processor', processor), ('regressor', LinearRegression())])
+    reg.fit(train_df, train_df['K%'])
+
+    scorer = model_utils.fold_linear_pipeline(reg)
+    assert len(scorer.intercepts) == train_df.Team.nunique() + 1
+    assert np.allclose(scorer.predict(test_df), reg.predict(test_df), rtol=0, atol=1e-12)
+
+
+def test_model_registry(tmp_path):
+    train_df = pd.read_csv(DATA_DIR.joinpath('train.csv'))
+    features = ['Pit/PA', 'Str%', 'F/Str', 'I/Str', 'Con', '30%', 'L/SO']
+    reg = Pipeline(
+        steps=[
+            ('processor', model_utils.make_processing_pipeline(numeric_features=features)),
+            ('regressor', LinearRegression()),
+        ]
+    )
+    reg.fit(train_df[features], train_df['K%'])
+
+    registry = model_utils.ModelRegistry(tmp_path, max_cached=1)
+    entry = registry.register('linear', reg, train_data=train_df, metrics={'mse': 0.1})
+    assert entry['features'] == features
+    assert entry['fingerprint'] == data_utils.fingerprint_data(train_df)
+    assert entry['size_bytes'] > 0
+    assert 'linear' in registry
+
+    loaded = registry['linear']
+    assert registry['linear'] is loaded  # cached
+    assert 'linear' in registry.load_times_
+    assert np.allclose(loaded.predict(train_df[features]), reg.predict(train_df[features]))
+
+    registry.register('other', reg)
+    registry['other']
+    assert registry['linear'] is not loaded  # evicted (max_cached=1)
+
+
+def test_model_registry_metadata_cached(tmp_path, monkeypatch):
+    registry = model_utils.ModelRegistry(tmp_path)
+    registry.register('baseline', model_utils.Baseline('mean'))
+    reads = []
+    read_index = registry._read_index
+    monkeypatch.setattr(registry, '_read_index', lambda: reads.append(1) or read_index())
+
+    assert 'baseline' in registry and 'other' not in registry
+    registry['baseline']
+    assert len(reads) == 1
+
+    # Registering invalidates the cached metadata
+    registry.register('other', model_utils.Baseline('last'))
+    assert 'other' in registry
+    assert len(reads) == 3
+
+    # Files written behind the registry's back need a refresh
+    joblib.dump(model_utils.Baseline('last'), tmp_path.joinpath('external.joblib'))
+    assert 'external' not in registry
+    registry.refresh()
+    assert 'external' in registry
+
+
+def test_model_registry_discovers_shipped_models():
+    registry = model_utils.ModelRegistry()
+    assert {'linear', 'xgboost'} <= set(registry.metadata)
+
+
+def test_find_delta_topk():
+    reg = joblib.load(model_utils.MODEL_DIR.joinpath('linear.joblib'))
+    test_df = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+    X_df, y_df = test_df.drop(columns='K%'), test_df['K%']
+    preds = reg.predict(test_df)
+
+    top = model_utils.find_delta_topk(X_df, y_df, preds, k=5)
+    assert len(top) == 5
+    assert top.abs_delta.is_monotonic_decreasing
+    name, mlb_id, fangraphs_id = model_utils.find_delta_extrema(X_df, y_df, preds)
+    assert (top.Name.iloc[0], top.MLBAMID.iloc[0], top.PlayerId.iloc[0]) == (
+        name,
+        mlb_id,
+        fangraphs_id,
+    )
+
+    by_season = model_utils.find_delta_topk(X_df, y_df, preds, k=3, by='Season')
+    assert by_season.groupby('Season').size().eq(3).all()
+    for season, group in by_season.groupby('Season'):
+        season_delta = np.abs(y_df - preds)[X_df.Season == season]
+        assert group.abs_delta.iloc[0] == season_delta.max()
+
+    smallest = model_utils.find_delta_topk(X_df, y_df, preds, k=1, largest=False)
+    assert smallest.abs_delta.item() == np.abs(y_df - preds).min()
+
+
+def test_find_delta_topk_missing_group():
+    reg = joblib.load(model_utils.MODEL_DIR.joinpath('linear.joblib'))
+    test_df = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+    X_df, y_df = test_df.drop(columns='K%'), test_df['K%']
+    preds = reg.predict(test_df)
+    X_df.loc[:9, 'Team'] = None
+
+    by_team = model_utils.find_delta_topk(X_df, y_df, preds, k=2, by='Team')
+    assert by_team.groupby('Team', dropna=False).size().eq(2).all()
+    missing = by_team[by_team.Team.isna()]
+    assert missing['rank'].tolist() == [1, 2]
+    assert missing.abs_delta.iloc[0] == np.abs(y_df - preds)[:10].max()
+    assert by_team.Team.nunique(dropna=False) == X_df.Team.nunique(dropna=False)
+
+
+def test_make_processing_pipeline_lean():
+    train_df = pd.read_csv(DATA_DIR.joinpath('train.csv'))
+    numeric = ['Pit/PA', 'Str%', 'F/Str', 'I/Str', 'Con', '30%', 'L/SO', 'TBF']
+
+    default = model_utils.make_processing_pipeline(['Team'], numeric).fit_transform(train_df)
+    lean = model_utils.make_processing_pipeline(['Team'], numeric, lean=True).fit_transform(
+        train_df
+    )
+    assert sparse.issparse(lean)
+    assert lean.dtype == np.float32
+    default = default.toarray() if sparse.issparse(default) else default
+    assert np.allclose(lean.toarray(), default, atol=1e-5)
+
+    report = model_utils.processing_memory_report(train_df, ['Team'], numeric)
+    assert report.loc['lean', 'nbytes'] < report.loc['default', 'nbytes']
+
+    reg = Pipeline(
+        steps=[
+            ('processor', model_utils.make_processing_pipeline(['Team'], numeric, lean=True)),
+            ('regressor', LinearRegression()),
+        ]
+    )
+    reg.fit(train_df, train_df['K%'])
+    scorer = model_utils.fold_linear_pipeline(reg)
+    assert np.allclose(scorer.predict(train_df), reg.predict(train_df), atol=1e-6)
+
+
+def test_refit_article_model():
+    data = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+    features = ['L/Str', 'S/Str', 'F/Str']
+    model = model_utils.RefitArticleModel(window=2, weight='TBF').fit(data, data['K%'])
+    assert model.coefs_.index.tolist() == [2021, 2022, 2023, 2024]
+
+    for i, season in enumerate(model.coefs_.index):
+        rows = data[data.Season.isin(model.coefs_.index[max(i - 1, 0) : i + 1])]
+        sqrt_w = np.sqrt(rows.TBF.to_numpy())[:, None]
+        A = np.hstack([np.ones((len(rows), 1)), rows[features].to_numpy()])
+        expected = np.linalg.lstsq(A * sqrt_w, rows['K%'].to_numpy() * sqrt_w[:, 0], rcond=None)[0]
+        assert np.allclose(model.coefs_.loc[season], expected)
+
+    # Unseen (later) seasons use the latest fitted coefficients
+    future = data.assign(Season=2025)
+    assert np.allclose(model.predict(future), model.predict(data.assign(Season=2024)))
+
+
+def test_refit_article_model_unsolvable_groups():
+    data = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+    data = data[data.Season.isin([2023, 2024])].reset_index(drop=True)
+    # Two 2022 rows are too few to fit four coefficients
+    small = data[data.Season == 2023].head(2).assign(Season=2022)
+    # A season of identical rows has a rank-deficient design
+    repeated = pd.concat([data.head(1)] * 10).assign(Season=2025)
+    missing = data.head(1).assign(**{'S/Str': np.nan})
+    combined = pd.concat([small, data, missing, repeated], ignore_index=True)
+
+    model = model_utils.RefitArticleModel().fit(combined, combined['K%'])
+    assert model.coefs_.index.tolist() == [2022, 2023, 2024, 2025]
+    assert model.coefs_.loc[[2022, 2025]].isna().all(axis=None)
+
+    # The row with a missing feature is dropped before the group sums
+    expected = model_utils.RefitArticleModel().fit(data, data['K%'])
+    pd.testing.assert_frame_equal(model.coefs_.loc[[2023, 2024]], expected.coefs_)
+
+    # Unsolved groups fall back to the latest earlier solved one (or the first)
+    assert np.allclose(
+        model.predict(data.assign(Season=2025)), model.predict(data.assign(Season=2024))
+    )
+    assert np.allclose(
+        model.predict(data.assign(Season=2022)), model.predict(data.assign(Season=2023))
+    )
+
+
+def test_bootstrap_ensemble():
+    train_df = pd.read_csv(DATA_DIR.joinpath('train.csv'))
+    test_df = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+    features = ['Pit/PA', 'Str%', 'F/Str', 'I/Str', 'Con', '30%', 'L/SO']
+    ensemble = model_utils.BootstrapEnsemble(
+        model_utils.make_processing_pipeline(numeric_features=features),
+        LinearRegression(),
+        n_members=8,
+        n_jobs=2,
+        seed=0,
+    )
+
+    samples = ensemble.bootstrap_samples(train_df)
+    assert len(samples) == 8
+    seasons = train_df.groupby('PlayerId').Season
+    cohort_sizes = seasons.min().value_counts()
+    for rows in samples:
+        # Whole players are drawn with replacement within each debut cohort, keeping its size
+        draws = (train_df.iloc[rows].PlayerId.value_counts() / seasons.size()).dropna()
+        assert (draws == draws.round()).all()
+        assert draws.groupby(seasons.min()).sum().to_dict() == cohort_sizes.to_dict()
+        assert (draws > 1).any()
+
+    ensemble.fit(train_df, train_df['K%'])
+    member_preds = ensemble.predict_members(test_df)
+    assert member_preds.shape == (8, len(test_df))
+    assert member_preds.dtype == np.float32
+
+    interval = ensemble.predict_interval(test_df, member_preds=member_preds)
+    assert interval.columns.tolist() == ['q0.05', 'q0.5', 'q0.95']
+    assert (interval['q0.05'] <= interval['q0.95']).all()
+    single = Pipeline(
+        steps=[
+            ('processor', model_utils.make_processing_pipeline(numeric_features=features)),
+            ('regressor', LinearRegression()),
+        ]
+    ).fit(train_df, train_df['K%'])
+    assert np.abs(ensemble.predict(test_df) - single.predict(test_df)).mean() < 0.005
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bullpen.data_utils import DATA_DIR
+from bullpen.panel_utils import Panel
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame(
+        {
+            'PlayerId': [1, 1, 1, 1, 1, 2, 2, 2],
+            'Team': ['NYY', 'NYY', '- - -', 'NYY', 'BOS', 'ATL', 'ATL', 'ATL'],
+            'Season': [2020, 2021, 2022, 2023, 2023, 2020, 2021, 2023],
+            'TBF': [100, 300, 400, 100, 300, 200, 200, 200],
+            'K%': [0.1, 0.2, 0.3, 0.2, 0.4, 0.25, 0.15, 0.3],
+        }
+    )
+
+
+@pytest.fixture
+def panel(data):
+    return Panel.from_long(data, columns=['K%'])
+
+
+def test_from_long(panel):
+    assert repr(panel) == 'Panel(players=2, seasons=4, features=2, rows=7)'
+    assert panel.features == ['TBF', 'K%']
+    assert panel.values.dtype == np.float32
+    np.testing.assert_array_equal(panel.seasons, [2020, 2021, 2022, 2023])
+    np.testing.assert_array_equal(panel.mask, [[1, 1, 1, 1], [1, 1, 0, 1]])
+    # 2023 stints without a combined row: TBF-weighted
+    np.testing.assert_allclose(panel['K%'][0], [0.1, 0.2, 0.3, 0.35])
+    assert np.isnan(panel['K%'][1, 2])
+
+
+def test_lag_diff_mean(panel):
+    k = panel.select(['K%'])
+    np.testing.assert_allclose(k.lag()['K%_lag1'][1], [np.nan, 0.25, 0.15, np.nan])
+    np.testing.assert_allclose(k.lag(2)['K%_lag2'][0], [np.nan, np.nan, 0.1, 0.2])
+    np.testing.assert_allclose(k.diff()['K%_diff1'][0], [np.nan, 0.1, 0.1, 0.05], rtol=1e-6)
+    np.testing.assert_allclose(k.lag(5).values, np.nan)
+
+    prior = panel.rolling_mean(2, prior=True, weight='TBF')['K%_prior2']
+    expected = [np.nan, 0.1, (0.1 * 100 + 0.2 * 300) / 400, (0.2 * 300 + 0.3 * 400) / 700]
+    np.testing.assert_allclose(prior[0], expected, rtol=1e-6)
+    # Skipped seasons drop out of the window
+    np.testing.assert_allclose(panel.rolling_mean(2)['K%_roll2'][1], [0.25, 0.2, 0.15, 0.3])
+    np.testing.assert_allclose(panel.mean()[:, 1], [0.2375, 0.7 / 3], rtol=1e-6)
+
+
+def test_to_long_round_trip():
+    data = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+    columns = ['K%', 'Con', 'S/Str']
+    panel = Panel.from_long(data, columns=columns)
+    long = panel.join(panel.select(columns).lag()).to_long()
+
+    expected = data.sort_values(['PlayerId', 'Season']).reset_index(drop=True)
+    assert len(long) == len(expected)
+    np.testing.assert_array_equal(long.PlayerId, expected.PlayerId)
+    np.testing.assert_array_equal(long.Season, expected.Season)
+    np.testing.assert_allclose(long[columns], expected[columns], rtol=1e-6)
+
+    # Lag by calendar season: NaN after a skipped season
+    previous = expected.groupby('PlayerId').Season.shift(1)
+    lagged = expected.groupby('PlayerId')['K%'].shift(1).where(previous == expected.Season - 1)
+    np.testing.assert_allclose(long['K%_lag1'], lagged, rtol=1e-6)
+
+
+def test_join_mismatch(panel, data):
+    other = Panel.from_long(data[data.PlayerId == 1], columns=['K%'])
+    with pytest.raises(ValueError):
+        panel.join(other)
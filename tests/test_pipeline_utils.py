@@ -0,0 +1,119 @@
+import json
+
+import pandas as pd
+import pytest
+
+from bullpen import pipeline_utils
+from bullpen.data_utils import DATA_DIR
+from bullpen.pipeline_utils import PipelineRunner, Stage
+
+
+def upper_stage(inputs, outputs):
+    with open(inputs['source'], 'r') as fp:
+        text = fp.read()
+    with open(outputs['upper'], 'w') as fp:
+        fp.write(text.upper())
+
+
+def length_stage(inputs, outputs):
+    with open(inputs['upper'], 'r') as fp:
+        text = fp.read()
+    with open(outputs['length'], 'w') as fp:
+        json.dump(len(text), fp)
+
+
+def make_runner(tmp_path):
+    source = tmp_path.joinpath('source.txt')
+    other = tmp_path.joinpath('other.txt')
+    return PipelineRunner(
+        [
+            Stage('upper', upper_stage, {'source': source}, {'upper': tmp_path.joinpath('u.txt')}),
+            Stage('other', upper_stage, {'source': other}, {'upper': tmp_path.joinpath('o.txt')}),
+            Stage(
+                'length',
+                length_stage,
+                {'upper': tmp_path.joinpath('u.txt')},
+                {'length': tmp_path.joinpath('n.json')},
+            ),
+        ],
+        tmp_path.joinpath('work'),
+    )
+
+
+def test_runner_caches_by_content(tmp_path):
+    tmp_path.joinpath('source.txt').write_text('abc')
+    tmp_path.joinpath('other.txt').write_text('xyz')
+    runner = make_runner(tmp_path)
+    assert runner.deps == {'upper': [], 'other': [], 'length': ['upper']}
+
+    assert runner.run(jobs=2) == {'upper': 'ran', 'other': 'ran', 'length': 'ran'}
+    assert tmp_path.joinpath('n.json').read_text() == '3'
+    assert set(runner.run().values()) == {'cached'}
+
+    # Only stages downstream of the changed input re-run
+    tmp_path.joinpath('source.txt').write_text('abcd')
+    assert runner.run() == {'upper': 'ran', 'other': 'cached', 'length': 'ran'}
+    assert tmp_path.joinpath('n.json').read_text() == '4'
+
+    # A re-run with identical outputs does not invalidate downstream stages
+    tmp_path.joinpath('source.txt').write_text('ABCD')
+    assert runner.run() == {'upper': 'ran', 'other': 'cached', 'length': 'cached'}
+
+    # Outputs edited behind the runner's back are rebuilt
+    tmp_path.joinpath('n.json').write_text('0')
+    assert runner.status()['length'] == 'stale'
+    assert runner.run(['length'])['length'] == 'ran'
+
+
+def test_key_tracks_stage_code(tmp_path):
+    tmp_path.joinpath('source.txt').write_text('abc')
+    stage = Stage('upper', upper_stage, {'source': tmp_path.joinpath('source.txt')})
+    key = stage.key()
+
+    def edited_stage(inputs, outputs):
+        with open(outputs['upper'], 'w') as fp:
+            fp.write('edited')
+
+    # Same name as before the edit: only the code differs
+    edited_stage.__qualname__ = upper_stage.__qualname__
+    stage.func = edited_stage
+    assert stage.key() != key
+    stage.func = upper_stage
+    assert stage.key() == key
+
+
+def test_runner_targets(tmp_path):
+    tmp_path.joinpath('source.txt').write_text('abc')
+    runner = make_runner(tmp_path)
+    assert runner.run(['length']) == {'upper': 'ran', 'length': 'ran'}
+    assert runner.status() == {'upper': 'fresh', 'other': 'stale', 'length': 'fresh'}
+    with pytest.raises(ValueError):
+        runner.run(['fit'])
+
+
+def test_make_pipeline_stages(tmp_path):
+    runner = pipeline_utils.make_pipeline(tmp_path)
+    assert runner.deps == {
+        'merge': [],
+        'split': ['merge'],
+        'train-linear': ['merge', 'split'],
+        'train-xgboost': ['merge', 'split'],
+        'evaluate': ['merge', 'split', 'train-linear', 'train-xgboost'],
+        'predict': ['merge', 'split', 'train-linear'],
+    }
+    runner = pipeline_utils.make_pipeline(tmp_path, scrape=True)
+    assert runner.deps['merge'] == ['scrape']
+
+
+def test_split_stage(tmp_path):
+    runner = pipeline_utils.make_pipeline(tmp_path)
+    runner.run(['split'])
+    inputs = {'merged': tmp_path.joinpath('merged.csv'), 'folds': tmp_path.joinpath('folds.csv')}
+    train = pipeline_utils.read_fold(inputs, 'train', holdout_season=2024)
+    test = pipeline_utils.read_fold(inputs, 'test')
+    assert set(train.Name).isdisjoint(test.Name)
+    assert 2024 not in set(train.Season)
+    assert 2024 in set(test.Season)
+    # Same partition as notebooks/02-data-partitioning.ipynb
+    assert set(train.Name) == set(pd.read_csv(DATA_DIR.joinpath('train.csv')).Name)
+    assert len(test) == len(pd.read_csv(DATA_DIR.joinpath('test.csv')))
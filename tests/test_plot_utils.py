@@ -1,6 +1,94 @@
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
 from bullpen import plot_utils
+from bullpen.data_utils import DATA_DIR
 
 
 def test_cv_utils():
     assert hasattr(plot_utils, 'plot_pred_vs_target')
     pass
+
+
+def test_plot_pred_vs_target_scalable(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 5_000
+    X_df = pd.DataFrame(
+        {
+            'MLBAMID': rng.integers(0, 10, n),
+            'PlayerId': rng.integers(0, 10, n),
+            'Team': 'SDP',
+            'Season': 2023,
+        }
+    )
+    preds = rng.uniform(0.1, 0.4, n)
+    y_df = pd.Series(preds + rng.normal(0, 0.02, n))
+
+    fig = plot_utils.plot_pred_vs_target(
+        X_df, y_df, preds, 'points', mode='scalable', max_points=n, show=False
+    )
+    assert fig.data[0].type == 'scattergl'
+    assert len(fig.data[0].x) == n
+
+    savepath = tmp_path.joinpath('binned.html')
+    fig = plot_utils.plot_pred_vs_target(
+        X_df,
+        y_df,
+        preds,
+        'binned',
+        mode='scalable',
+        max_points=100,
+        bins=20,
+        savepath=savepath,
+        show=False,
+    )
+    assert fig.data[0].type == 'heatmap'
+    assert np.nansum(fig.data[0].z) == n
+    assert savepath.stat().st_size < 50_000
+
+    # Non-finite pairs are left out of the bins and the fit
+    preds[:10] = np.nan
+    y_df[10:20] = np.inf
+    fig = plot_utils.plot_pred_vs_target(
+        X_df, y_df, preds, 'binned', mode='scalable', max_points=100, bins=20, show=False
+    )
+    assert np.nansum(fig.data[0].z) == n - 20
+    assert np.isfinite(fig.data[1].y).all()
+
+    preds[:] = np.nan
+    with pytest.raises(ValueError, match='got 0'):
+        plot_utils.plot_pred_vs_target(
+            X_df, y_df, preds, 'binned', mode='scalable', max_points=100, show=False
+        )
+
+
+def test_batch_plot_players(tmp_path):
+    test_df = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+    players = test_df.MLBAMID.unique()[:4]
+    test_df = test_df[test_df.MLBAMID.isin(players)].reset_index(drop=True)
+
+    report = plot_utils.batch_plot_players(
+        test_df, test_df['K%'], test_df['K%'].to_numpy(), tmp_path, n_jobs=2
+    )
+    assert report['players'] == 4
+    assert all(path.endswith('.png') for path in report['paths'])
+    assert len(list(tmp_path.glob('*.png'))) == 4
+
+    report = plot_utils.batch_plot_players(
+        test_df, test_df['K%'], test_df['K%'].to_numpy(), tmp_path, fmt='html', n_jobs=1
+    )
+    assert len(list(tmp_path.glob('*.html'))) == 4
+
+
+def test_plot_player(tmp_path):
+    matplotlib.use('Agg')
+    test_df = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+    name = test_df.Name.iloc[0]
+    savepath = tmp_path.joinpath('player.png')
+
+    plot_utils.plot_player(name, test_df, test_df['K%'], test_df['K%'], savepath=savepath)
+    assert savepath.exists()
+    plt.close('all')
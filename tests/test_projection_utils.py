@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import scipy.stats
+
+from bullpen import projection_utils
+
+
+def test_project_strikeouts_binomial():
+    data = pd.DataFrame(
+        {
+            'PlayerId': [1, 2, 3],
+            'Name': ['A', 'B', 'C'],
+            'TBF': [600, 250.4, 0],
+            'xK%': [0.25, 0.3, 0.2],
+        }
+    )
+    projection = projection_utils.project_strikeouts(
+        data, n_sims=20_000, percentiles=(10, 50, 90), max_elements=7_000, seed=0
+    )
+    assert projection.columns.tolist() == [
+        'PlayerId',
+        'Name',
+        'TBF',
+        'xK%',
+        'K_mean',
+        'K_std',
+        'K_p10',
+        'K_p50',
+        'K_p90',
+    ]
+    assert projection.TBF.tolist() == [600, 250, 0]
+    np.testing.assert_allclose(projection.K_mean, [150, 75, 0], rtol=0.01)
+    np.testing.assert_allclose(
+        projection.K_std, np.sqrt([600 * 0.25 * 0.75, 250 * 0.3 * 0.7, 0]), rtol=0.05, atol=1e-9
+    )
+    expected = scipy.stats.binom.ppf([0.1, 0.5, 0.9], 600, 0.25)
+    assert np.abs(projection.loc[0, ['K_p10', 'K_p50', 'K_p90']].to_numpy() - expected).max() <= 1
+    assert (projection.loc[2, ['K_p10', 'K_p50', 'K_p90']] == 0).all()
+
+
+def test_beta_binomial_is_wider():
+    data = pd.DataFrame({'TBF': [600] * 50, 'xK%': np.linspace(0.15, 0.35, 50)})
+    binomial = projection_utils.project_strikeouts(data, n_sims=2_000, seed=1)
+    beta = projection_utils.project_strikeouts(data, n_sims=2_000, dispersion=100, seed=1)
+    np.testing.assert_allclose(beta.K_mean, binomial.K_mean, rtol=0.03)
+    assert (beta.K_std > binomial.K_std).all()
+
+
+def test_histogram_percentiles():
+    rng = np.random.default_rng(0)
+    draws = rng.integers(0, 20, (4, 101))
+    hist = np.stack([np.bincount(row, minlength=20) for row in draws])
+    expected = np.percentile(draws, [5, 50, 95], axis=1, method='inverted_cdf').T
+    np.testing.assert_array_equal(
+        projection_utils.histogram_percentiles(hist, [5, 50, 95]), expected
+    )
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bullpen.data_utils import DATA_DIR, load_data
+from bullpen.schema_utils import MERGED_SCHEMA, Column, Schema, SchemaError
+
+
+@pytest.fixture(scope='module')
+def merged():
+    return load_data(validate=False)
+
+
+def test_merged_data_is_valid(merged):
+    assert MERGED_SCHEMA.validate(merged).empty
+    assert MERGED_SCHEMA.check(merged) is merged
+
+
+def test_faults_are_reported(merged):
+    bad = merged.reset_index(drop=True)
+    bad.loc[0, 'K%'] = 66.0
+    bad.loc[1, 'S/Str'] = np.nan
+    bad = pd.concat([bad, bad.iloc[[2]]], ignore_index=True)
+    total = bad[bad.Team == '- - -'].iloc[0]
+    team_row = bad[(bad.PlayerId == total.PlayerId) & (bad.Season == total.Season)].iloc[[0]]
+    bad = pd.concat([bad, team_row.assign(Team='NYY', TBF=team_row.PA + 50)], ignore_index=True)
+
+    report = MERGED_SCHEMA.validate(bad).set_index('check')
+    assert report.loc['range', 'column'] == 'K%'
+    assert report.loc['range', 'example'] == 0
+    assert report.loc['null', 'column'] == 'S/Str'
+    assert report.loc['unique', 'failures'] == 1
+    assert report.loc['total_alone', 'failures'] == 1
+    assert report.loc['total_batters', 'failures'] == 1
+    with pytest.raises(SchemaError, match=r'range\(K%\): 1 rows'):
+        MERGED_SCHEMA.check(bad)
+
+
+def test_dtype_and_missing():
+    schema = Schema({'a': Column('int', 0), 'b': Column('str'), 'c': Column()})
+    report = schema.validate(pd.DataFrame({'a': [0.5, 1.0], 'b': ['x', None]}))
+    assert report.check.tolist() == ['missing', 'dtype', 'null']
+    assert report.column.tolist() == ['c', 'a', 'b']
+    assert report.example[:2].isna().all()
+    assert report.detail[1] == 'dtype float64, expected int'
+    with pytest.raises(SchemaError, match='dtype float64, expected int'):
+        schema.check(pd.DataFrame({'a': [0.5, 1.0], 'b': ['x', 'y'], 'c': [1.0, 2.0]}))
+
+
+def test_mixed_report_message():
+    # Column failures (with a detail) next to row failures (without one)
+    schema = Schema({'a': Column('int', 0), 'b': Column('float', 0.0, 1.0), 'c': Column()})
+    data = pd.DataFrame({'a': [0.5, 1.0], 'b': [0.5, 2.0]})
+    with pytest.raises(SchemaError) as e:
+        schema.check(data)
+    message = str(e.value)
+    assert 'missing(c): column is missing' in message
+    assert 'dtype(a): dtype float64, expected int' in message
+    assert 'range(b): 1 rows, e.g. row 1' in message
+
+
+def test_load_data_validates(tmp_path):
+    provided = pd.read_csv(DATA_DIR.joinpath('k.csv'))
+    provided.loc[0, 'K%'] = 1.5
+    provided.to_csv(tmp_path.joinpath('k.csv'), index=False)
+    paths = {
+        'provided_path': str(tmp_path.joinpath('k.csv')),
+        'supplemental_path': str(DATA_DIR.joinpath('supplemental-stats.csv')),
+    }
+    with pytest.raises(SchemaError, match='K%'):
+        load_data(**paths)
+    assert len(load_data(**paths, validate=False)) == len(provided)
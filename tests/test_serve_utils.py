@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from bullpen.data_utils import DATA_DIR
+from bullpen.model_utils import MODEL_DIR
+from bullpen.serve_utils import (
+    BatcherUnavailable,
+    MicroBatcher,
+    PredictionServer,
+    load_test,
+)
+
+
+@pytest.fixture
+def server():
+    model = joblib.load(MODEL_DIR.joinpath('linear.joblib'))
+    server = PredictionServer(model, ('127.0.0.1', 0), model_name='linear')
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(url, body, content_type):
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': content_type})
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def test_predict_csv_and_json(server):
+    test_df = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+    expected = server.model.predict(test_df)
+
+    from_csv = post(f'{server.url}/predict', test_df.to_csv(index=False).encode(), 'text/csv')
+    assert np.allclose(from_csv['xK%'], expected)
+    assert from_csv['rows'] == len(test_df)
+    assert from_csv['latency']['total_ms'] > 0
+
+    body = json.dumps({'rows': json.loads(test_df.head(5).to_json(orient='records'))})
+    from_json = post(f'{server.url}/predict', body.encode(), 'application/json')
+    assert np.allclose(from_json['xK%'], expected[:5])
+
+
+def test_columns_aligned(server):
+    test_df = pd.read_csv(DATA_DIR.joinpath('test.csv')).head(5)
+    expected = server.model.predict(test_df)
+
+    shuffled = test_df[server.features[::-1] + ['Name']]
+    body = shuffled.to_csv(index=False).encode()
+    assert np.allclose(post(f'{server.url}/predict', body, 'text/csv')['xK%'], expected)
+
+
+def test_errors(server):
+    test_df = pd.read_csv(DATA_DIR.joinpath('test.csv')).head(5)
+
+    # Client errors: malformed body, missing feature
+    for body in (b'not json', test_df.drop(columns='Con').to_json(orient='records').encode()):
+        with pytest.raises(urllib.error.HTTPError) as e:
+            post(f'{server.url}/predict', body, 'application/json')
+        assert e.value.code == 400
+    assert 'Con' in json.load(e.value)['error']
+
+    # Rows that fail in the model
+    body = test_df.assign(Con='n/a').to_json(orient='records').encode()
+    with pytest.raises(urllib.error.HTTPError) as e:
+        post(f'{server.url}/predict', body, 'application/json')
+    assert e.value.code == 500
+
+
+def test_batch_failure_isolated():
+    def predict(data):
+        if data.x.isna().any():
+            raise ValueError('Input contains NaN.')
+        return data.x * 2
+
+    batcher = MicroBatcher(predict, max_wait=0.5)
+    frames = [pd.DataFrame({'x': [1.0, 2.0]}), pd.DataFrame({'x': [np.nan]})]
+    frames += [pd.DataFrame({'x': [3.0]})]
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(batcher.submit, frame) for frame in frames]
+        first, third = futures[0].result(), futures[2].result()
+        with pytest.raises(ValueError, match='NaN'):
+            futures[1].result()
+    batcher.close()
+
+    assert np.allclose(first[0], [2.0, 4.0])
+    assert np.allclose(third[0], [6.0])
+    assert first[1]['batch_requests'] == third[1]['batch_requests'] == 1
+
+
+def test_batcher_row_count_and_timeout():
+    batcher = MicroBatcher(lambda data: np.zeros(len(data) + 1))
+    with pytest.raises(ValueError, match='for 2 rows'):
+        batcher.submit(pd.DataFrame({'x': [1.0, 2.0]}))
+    batcher.close()
+
+    slow = MicroBatcher(lambda data: time.sleep(0.5) or data.x, timeout=0.05)
+    with pytest.raises(BatcherUnavailable, match='No predictions'):
+        slow.submit(pd.DataFrame({'x': [1.0]}))
+    slow.close()
+    # A stopped batcher fails fast instead of hanging
+    with pytest.raises(BatcherUnavailable, match='not running'):
+        slow.submit(pd.DataFrame({'x': [1.0]}))
+
+
+def test_unavailable_batcher(server):
+    server.batcher.close()
+    body = pd.read_csv(DATA_DIR.joinpath('test.csv')).head(2).to_csv(index=False).encode()
+    with pytest.raises(urllib.error.HTTPError) as e:
+        post(f'{server.url}/predict', body, 'text/csv')
+    assert e.value.code == 503
+
+
+def test_load_test(server):
+    test_df = pd.read_csv(DATA_DIR.joinpath('test.csv'))
+    summary = load_test(server.url, test_df, n_requests=20, rows_per_request=10, concurrency=4)
+    assert summary['rows'] == 200
+    assert summary['p50_ms'] <= summary['p99_ms']
+    assert server.stats()['requests'] == 20
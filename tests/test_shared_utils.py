@@ -0,0 +1,20 @@
+import pickle
+
+import numpy as np
+
+from bullpen.shared_utils import SharedArrays
+
+
+def test_shared_arrays_pickle_attaches_by_name():
+    arr = np.arange(12, dtype=np.float64).reshape(4, 3)
+    with SharedArrays({'X': arr}, columns={'X': ['a', 'b', 'c']}) as shared:
+        payload = pickle.dumps(shared)
+        assert len(payload) < 1_000
+
+        attached = pickle.loads(payload)
+        view = attached['X']
+        assert np.array_equal(view, arr)
+        assert not view.flags.writeable
+        assert attached.columns == {'X': ['a', 'b', 'c']}
+        assert shared.nbytes == arr.nbytes
+        del view
@@ -0,0 +1,75 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from bullpen import synth_utils
+from bullpen.data_utils import (
+    DATA_DIR,
+    PROVIDED_NAME_FIXES,
+    SUPPLEMENTAL_NAME_FIXES,
+    load_data,
+)
+
+
+def test_generate_data_schema():
+    provided, supplemental, ids = synth_utils.generate_data(n_players=300, seed=0)
+
+    assert list(provided.columns) == list(pd.read_csv(DATA_DIR.joinpath('k.csv'), nrows=1).columns)
+    expected = pd.read_csv(DATA_DIR.joinpath('supplemental-stats.csv'), nrows=1).columns
+    assert list(supplemental.columns) == list(expected)
+    assert len(ids) == 300
+    assert provided.TBF.min() >= 115
+    assert not provided.duplicated(['PlayerId', 'Season']).any()
+
+
+def test_generate_data_consistent_rates():
+    provided, supplemental, _ = synth_utils.generate_data(n_players=300, seed=1)
+
+    split = supplemental[['L/Str', 'S/Str', 'F/Str', 'I/Str']].sum(axis=1)
+    has_strikes = supplemental.Str > 0
+    assert np.allclose(split[has_strikes], 1, atol=3e-3)
+    assert np.allclose(
+        supplemental['AS/Str'][has_strikes], 1 - supplemental['L/Str'][has_strikes], atol=2e-3
+    )
+    assert (supplemental.Pit >= supplemental.Str).all()
+
+    # TOT rows are the sum of the team rows that follow them
+    tot = supplemental[supplemental.Tm == 'TOT']
+    teams = supplemental[supplemental.Tm != 'TOT']
+    team_pa = teams.groupby(['Name', 'Season']).PA.sum()
+    assert (
+        tot.set_index(['Name', 'Season']).PA == team_pa.loc[tot.set_index(['Name', 'Season']).index]
+    ).all()
+
+    merged = provided.merge(
+        supplemental.replace({'Tm': {'TOT': '- - -'}}),
+        left_on=['Name', 'Season', 'Team'],
+        right_on=['Name', 'Season', 'Tm'],
+    )
+    assert len(merged) == len(provided)
+    assert np.allclose(merged['K%'], (merged['L/SO'] + merged['S/SO']) / merged.TBF)
+
+
+def test_generate_data_seeded():
+    first = synth_utils.generate_data(n_players=50, seed=3)
+    second = synth_utils.generate_data(n_players=50, seed=3)
+    assert first[0].equals(second[0])
+    assert first[1].equals(second[1])
+
+
+def test_names_avoid_merge_renames():
+    names = set(synth_utils._names(len(synth_utils.NAME_POOL) + 10))
+    assert 'Luis Ortiz' not in names
+    assert names.isdisjoint(PROVIDED_NAME_FIXES)
+    assert names.isdisjoint(SUPPLEMENTAL_NAME_FIXES)
+
+
+def test_write_data_loads(tmp_path):
+    # Enough players to use every name in the pool (load_data validates the merge)
+    paths = synth_utils.write_data(tmp_path, n_players=1_300, seed=0)
+    merged = load_data(paths['k.csv'], paths['supplemental-stats.csv'])
+    assert len(merged) == len(pd.read_csv(paths['k.csv']))
+    assert merged['L/Str'].notna().all()
+    with open(paths['player_ids.json']) as fp:
+        assert set(json.load(fp)[0]) == {'MLBAMID', 'PlayerId', 'Name'}
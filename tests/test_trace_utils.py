@@ -0,0 +1,83 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from bullpen import trace_utils
+from bullpen.data_utils import DATA_DIR, load_data
+
+
+def test_disabled_span_is_shared_noop():
+    tracer = trace_utils.Tracer()
+    with tracer.span('fit') as span:
+        span.rows = 10
+    assert tracer.span('fit') is tracer.span('predict')
+    assert tracer.spans == []
+
+
+def test_span_records_and_exports(tmp_path):
+    tracer = trace_utils.Tracer(enabled=True)
+    with tracer.span('fit', model='linear') as span:
+        time.sleep(0.01)
+        span.rows = 100
+    with tracer.span('fit', rows=50):
+        pass
+
+    @tracer.traced('predict', rows=len)
+    def predict(n):
+        return list(range(n))
+
+    predict(5)
+
+    assert [span.name for span in tracer.spans] == ['fit', 'fit', 'predict']
+    assert tracer.spans[0].wall >= 0.01
+    assert tracer.spans[0].attrs == {'model': 'linear'}
+
+    summary = tracer.summary()
+    assert summary.loc['fit', 'calls'] == 2
+    assert summary.loc['fit', 'rows'] == 150
+    assert summary.loc['predict', 'rows'] == 5
+
+    trace = tracer.to_chrome_trace(tmp_path.joinpath('trace.json'))
+    assert {event['ph'] for event in trace['traceEvents']} == {'X'}
+    assert len(tracer.to_json(tmp_path.joinpath('spans.json'))) == 3
+
+
+def test_load_data_spans():
+    trace_utils.enable()
+    try:
+        trace_utils.TRACER.reset()
+        merged = load_data()
+        summary = trace_utils.TRACER.summary()
+    finally:
+        trace_utils.disable()
+        trace_utils.TRACER.reset()
+    assert set(summary.index) >= {'load', 'merge'}
+    assert summary.loc['merge', 'rows'] == len(pd.read_csv(DATA_DIR.joinpath('k.csv')))
+    assert len(merged)
+
+
+def _traced_square(n):
+    with trace_utils.span('square', rows=n):
+        return n * n
+
+
+def test_worker_spans_merged():
+    trace_utils.enable()
+    try:
+        trace_utils.TRACER.reset()
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            outputs = pool.map(trace_utils.in_worker(_traced_square), range(1, 5))
+            results = [trace_utils.merge_worker(output) for output in outputs]
+        spans = list(trace_utils.TRACER.spans)
+    finally:
+        trace_utils.disable()
+        trace_utils.TRACER.reset()
+    assert results == [1, 4, 9, 16]
+    assert sorted(span.rows for span in spans) == [1, 2, 3, 4]
+    assert all(span.name == 'square' and span.pid != os.getpid() for span in spans)
+
+    # Disabled in the parent: nothing recorded in the workers either
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(trace_utils.in_worker(_traced_square), 3).result() == (9, [])
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from sklearn.pipeline import Pipeline
+
+from bullpen import synth_utils, update_utils
+from bullpen.cv_utils import pred_X_y
+from bullpen.data_utils import load_data
+from bullpen.feature_utils import FeatureStore
+from bullpen.model_utils import (
+    Baseline,
+    IncrementalLinearModel,
+    make_processing_pipeline,
+)
+
+FEATURES = ['L/Str', 'S/Str', 'F/Str', 'Con']
+
+
+@pytest.fixture
+def seasons(tmp_path):
+    provided, supplemental, _ = synth_utils.generate_data(n_players=300, seed=3)
+    paths = {'provided': tmp_path.joinpath('k.csv'), 'supp': tmp_path.joinpath('supp.csv')}
+    provided[provided.Season < 2024].to_csv(paths['provided'], index=False)
+    supplemental[supplemental.Season < 2024].to_csv(paths['supp'], index=False)
+    old = load_data(paths['provided'], paths['supp'])
+
+    # The 2024 season lands in k.csv; its supplemental rows are "scraped"
+    provided.to_csv(paths['provided'], index=False)
+    scraped = supplemental[supplemental.Season == 2024]
+    full = {'provided': provided, 'supplemental': supplemental}
+    return paths, old, scraped, full, tmp_path
+
+
+def test_incremental_linear_model():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((200, 3)), columns=['a', 'b', 'c'])
+    y = 0.5 + X @ np.array([1.0, -2.0, 0.5]) + rng.normal(0, 0.01, 200)
+    model = (
+        IncrementalLinearModel(['a', 'b', 'c']).fit(X[:120], y[:120]).partial_fit(X[120:], y[120:])
+    )
+    full = IncrementalLinearModel(['a', 'b', 'c']).fit(X, y)
+    np.testing.assert_allclose(model.coef_, full.coef_)
+    np.testing.assert_allclose(model.predict(X), full.predict(X))
+    assert model.n_rows_ == 200
+
+
+@pytest.mark.parametrize('method', ['last', 'mean'])
+def test_baseline_partial_fit(method):
+    X = pd.DataFrame({'PlayerId': [1, 1, 2, 1, 3]})
+    y = pd.Series([0.1, 0.2, 0.3, 0.4, 0.5], name='K%')
+    model = Baseline(method).fit(X[:3], y[:3]).partial_fit(X[3:], y[3:])
+    full = Baseline(method).fit(X, y)
+    pd.testing.assert_series_equal(model.group_aggregates_, full.group_aggregates_)
+    assert model.group_counts_.to_dict() == {1: 3, 2: 1, 3: 1}
+
+
+def test_update_season(seasons):
+    paths, old, scraped, full, tmp_path = seasons
+    store = FeatureStore(columns=['K%'], store_dir=tmp_path.joinpath('features')).build(old)
+
+    X_old, y_old = pred_X_y(old)
+    xgboost = Pipeline(
+        steps=[
+            ('processor', make_processing_pipeline(numeric_features=FEATURES)),
+            ('regressor', xgb.XGBRegressor(n_estimators=10, max_depth=3)),
+        ]
+    ).fit(X_old, y_old)
+    models = {
+        'baseline': Baseline('mean').fit(X_old, y_old),
+        'linear': IncrementalLinearModel(FEATURES).fit(X_old, y_old),
+        'xgboost': xgboost,
+    }
+
+    merged, updated, report = update_utils.update_season(
+        2024,
+        old,
+        provided_path=paths['provided'],
+        supplemental_path=paths['supp'],
+        scraped=scraped,
+        store=store,
+        models=models,
+        n_estimators=5,
+    )
+
+    expected = load_data(paths['provided'], paths['supp'])
+    columns = ['PlayerId', 'Team', 'Season', 'K%', 'S/Str']
+    pd.testing.assert_frame_equal(
+        merged[columns].reset_index(drop=True), expected[columns].reset_index(drop=True)
+    )
+    assert len(pd.read_csv(paths['supp'])) == len(full['supplemental'])
+
+    # Only the history of players who pitched in 2024 is recomputed
+    assert report['rows_merged'] == (full['provided'].Season == 2024).sum()
+    assert 0 < report['feature_rows_computed'] < report['feature_rows_total']
+    pd.testing.assert_frame_equal(store.table_, FeatureStore(columns=['K%']).compute(expected))
+
+    X_all, y_all = pred_X_y(expected)
+    full_linear = IncrementalLinearModel(FEATURES).fit(X_all, y_all)
+    np.testing.assert_allclose(updated['linear'].coef_, full_linear.coef_)
+    np.testing.assert_allclose(
+        updated['baseline'].predict(X_all), Baseline('mean').fit(X_all, y_all).predict(X_all)
+    )
+    booster = updated['xgboost'].named_steps['regressor'].get_booster()
+    assert booster.num_boosted_rounds() == 15
+    assert report['xgboost_update'] == 'warm_start'
+
+
+def test_update_season_loads_previous(seasons):
+    # Without merged data the previous seasons are merged from the csvs, whose k.csv
+    # already holds 2024 while the supplemental csv does not
+    paths, old, scraped, _, _ = seasons
+    merged, _, report = update_utils.update_season(
+        2024, provided_path=paths['provided'], supplemental_path=paths['supp'], scraped=scraped
+    )
+    expected = load_data(paths['provided'], paths['supp'])
+    pd.testing.assert_frame_equal(merged.reset_index(drop=True), expected.reset_index(drop=True))
+    assert report['rows_total'] - report['rows_merged'] == len(old)